@@ -0,0 +1,48 @@
+"""
+Import time of the package layers, each measured in a fresh interpreter.
+Also lists which heavy dependencies each import pulls in.
+
+Run from the repository root: `python src/benchmarks/bench_import.py`
+For a per-module breakdown: `python -X importtime -c "import mazegame.core"`
+"""
+
+import statistics
+import subprocess
+import sys
+
+MODULES = ["mazegame.core", "mazegame", "mazegame.grader", "mazegame.game"]
+HEAVY_MODULES = ["pygame", "numpy", "scipy"]
+RUNS = 5
+
+MEASURE = """
+import sys, time
+sys.path.append("./src")
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(elapsed, *(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure(module: str) -> tuple[float, list[str]]:
+    """
+    :return: Median import time in seconds, and heavy dependencies that got imported
+    """
+    times: list[float] = []
+    heavy: list[str] = []
+    for _ in range(RUNS):
+        output = subprocess.run(
+            [sys.executable, "-c", MEASURE.format(module=module, heavy=HEAVY_MODULES)],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.split()
+        times.append(float(output[0]))
+        heavy = output[1:]
+    return statistics.median(times), heavy
+
+
+if __name__ == "__main__":
+    for module in MODULES:
+        elapsed, heavy = measure(module)
+        print(f"{module:<16} {elapsed * 1000:>8.1f} ms  {', '.join(heavy) or '-'}")
@@ -0,0 +1,72 @@
+"""
+Distance to the exit on large generated maps, bit-packed frontier search versus a plain Python breadth-first search.
+
+Run from the repository root: `python src/benchmarks/bench_reachability.py`
+"""
+
+import sys
+
+sys.path.append("./src")  # noqa
+
+from collections import deque
+import time
+import numpy as np
+from mazegame.array_map import ArrayMap, TileKind
+from mazegame.reachability import get_distances, get_mask, get_walkable
+from mazegame.map import Exit
+
+SIZES = [512, 1024, 4096]
+PLAIN_MAX_SIZE = 1024
+BLOCK_CHANCE = 0.3
+
+
+def get_map(size: int) -> ArrayMap:
+    rng = np.random.default_rng(size)
+    kinds = np.where(
+        rng.random((size, size)) < BLOCK_CHANCE, TileKind.BLOCK, TileKind.NONE
+    )
+    kinds[size // 2, size // 2] = TileKind.EXIT
+    return ArrayMap(kinds)
+
+
+def get_distances_plain(walkable: np.ndarray, sources: np.ndarray) -> np.ndarray:
+    height, width = walkable.shape
+    is_walkable = walkable.tolist()
+    distances = [[-1] * width for _ in range(height)]
+    queue: deque[tuple[int, int]] = deque()
+    for y, x in zip(*np.nonzero(sources & walkable)):
+        distances[y][x] = 0
+        queue.append((int(x), int(y)))
+    while queue:
+        x, y = queue.popleft()
+        distance = distances[y][x] + 1
+        for next_x, next_y in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if (
+                0 <= next_x < width
+                and 0 <= next_y < height
+                and is_walkable[next_y][next_x]
+                and distances[next_y][next_x] < 0
+            ):
+                distances[next_y][next_x] = distance
+                queue.append((next_x, next_y))
+    return np.array(distances, dtype=np.int32)
+
+
+def bench(size: int) -> None:
+    map = get_map(size)
+    walkable = get_walkable(map)
+    exits = get_mask(map, Exit)
+    start = time.perf_counter()
+    distances = get_distances(walkable, exits)
+    elapsed = time.perf_counter() - start
+    line = f"{size:>5}x{size:<5} packed {elapsed:>7.3f}s"
+    if size <= PLAIN_MAX_SIZE:
+        start = time.perf_counter()
+        assert (get_distances_plain(walkable, exits) == distances).all()
+        line += f"   plain {time.perf_counter() - start:>7.3f}s"
+    print(line)
+
+
+if __name__ == "__main__":
+    for size in SIZES:
+        bench(size)
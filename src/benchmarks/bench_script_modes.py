@@ -0,0 +1,45 @@
+"""
+Moves per second for threaded scripts (`move(...)`) versus generator scripts (`yield ...`).
+
+Run from the repository root: `python src/benchmarks/bench_script_modes.py`
+"""
+
+import sys
+
+sys.path.append("./src")  # noqa
+
+import time
+from mazegame import *
+from mazegame.map import Map, Player
+from mazegame.api.run import simulate
+
+MOVES = 20_000
+
+
+def get_map() -> Map:
+    return Map([[Player(), None]])
+
+
+def threaded_script():
+    for _ in range(MOVES // 2):
+        move(RIGHT)
+        move(LEFT)
+
+
+def generator_script():
+    for _ in range(MOVES // 2):
+        yield RIGHT
+        yield LEFT
+
+
+def bench(name: str, script) -> None:
+    start = time.perf_counter()
+    game = simulate(script, get_map(), max_ticks=MOVES)
+    elapsed = time.perf_counter() - start
+    assert game.tick_count == MOVES
+    print(f"{name:<10} {MOVES / elapsed:>12,.0f} moves/sec ({elapsed:.3f}s)")
+
+
+if __name__ == "__main__":
+    bench("threaded", threaded_script)
+    bench("generator", generator_script)
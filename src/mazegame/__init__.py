@@ -1,2 +1,55 @@
+import importlib
+from typing import Any
+
 from . import _hide_pygame_prompt
-from .api import *
+from .api.const import *
+from .api.run import (
+    run,
+    move,
+    get_tile,
+    get_color,
+    distance_to_exit,
+    walk_to_exit,
+    wait,
+    halt,
+    preview,
+    simulate,
+    replay,
+)
+from .api import __all__ as _api_all, __getattr__ as _get_map
+from .api.maps import __all__ as _maps_all
+from .direction import Direction
+
+_MODULES = {
+    "api": ".api",
+    "color": ".color",
+    "const": ".api.const",
+    "control": ".control",
+    "direction": ".direction",
+    "game": ".game",
+    "game_obj": ".api.game_obj",
+    "images": ".images",
+    "map": ".map",
+    "map_maker": ".map_maker",
+    "maps": ".api.maps",
+    **{name.lower(): f".api.maps.{name.lower()}" for name in _maps_all},
+}
+"""Modules that used to be reachable from the package, by name"""
+_HEAVY_MODULES = {"game", "control", "images", *(name.lower() for name in _maps_all)}
+"""Left out of `from mazegame import *`, the game and images load pygame and numpy,
+and the maps are already there through their factories"""
+
+__all__ = [
+    *_api_all,
+    "Direction",
+    *(name for name in _MODULES if name not in _HEAVY_MODULES),
+]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Maps and modules are only imported on first access
+    """
+    if name in _MODULES:
+        return importlib.import_module(_MODULES[name], __name__)
+    return _get_map(name)
@@ -1,3 +1,45 @@
+from typing import Any
+
 from .const import *
-from .maps import *
-from .run import run, move, get_tile, get_color, wait, halt, preview
+from .const import __all__ as _const_all
+from .run import (
+    run,
+    move,
+    get_tile,
+    get_color,
+    distance_to_exit,
+    walk_to_exit,
+    wait,
+    halt,
+    preview,
+    simulate,
+    replay,
+)
+from .maps import __all__ as _maps_all
+
+__all__ = [
+    *_const_all,
+    "run",
+    "move",
+    "get_tile",
+    "get_color",
+    "distance_to_exit",
+    "walk_to_exit",
+    "wait",
+    "halt",
+    "preview",
+    "simulate",
+    "replay",
+    *_maps_all,
+]
+
+
+def __getattr__(name: str) -> Any:
+    """
+    Maps are only imported on first access
+    """
+    if name not in _maps_all:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from . import maps
+
+    return getattr(maps, name)
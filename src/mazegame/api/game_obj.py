@@ -1,12 +1,24 @@
-from ..game import Game
+from contextvars import ContextVar
+from ..engine import Engine
 
 
-game: Game | None = None
+_game: ContextVar[Engine | None] = ContextVar("game", default=None)
+"""Game of the current context. Each thread (or copied context) sees its own game."""
 
 
-def get_game() -> Game:
+def get_game() -> Engine:
+    """
+    :raises SystemExit: The game is over, like `Control.move` this ends a script that keeps looking at it
+    """
+    game = _game.get()
     if game is None:
         raise ValueError(
             "You tried to run script directly! The game was never set up! Try 'run(script)' instead."
         )
+    if game.control.is_dead:
+        raise SystemExit()
     return game
+
+
+def set_game(game: Engine) -> None:
+    _game.set(game)
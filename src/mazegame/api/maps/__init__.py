@@ -1,18 +1,62 @@
-from .hard1 import HARD1
-from .hard2 import HARD2
-from .nightmare1 import NIGHTMARE1
-from .nightmare2 import NIGHTMARE2
-from .normal1 import NORMAL1
-from .normal2 import NORMAL2
-from .normal3 import NORMAL3
-from .normal4 import NORMAL4
-from .tutorial1 import TUTORIAL1
-from .tutorial2 import TUTORIAL2
-from .tutorial3 import TUTORIAL3
-from .tutorial4 import TUTORIAL4
-from .tutorial5 import TUTORIAL5
-from .practice1 import PRACTICE1
-from .practice2 import PRACTICE2
-from .practice3 import PRACTICE3
-from .practice4 import PRACTICE4
-from .practice5 import PRACTICE5
+import importlib
+from typing import TYPE_CHECKING
+
+from ...map import SeededMapType
+
+if TYPE_CHECKING:
+    from .hard1 import HARD1
+    from .hard2 import HARD2
+    from .nightmare1 import NIGHTMARE1
+    from .nightmare2 import NIGHTMARE2
+    from .normal1 import NORMAL1
+    from .normal2 import NORMAL2
+    from .normal3 import NORMAL3
+    from .normal4 import NORMAL4
+    from .tutorial1 import TUTORIAL1
+    from .tutorial2 import TUTORIAL2
+    from .tutorial3 import TUTORIAL3
+    from .tutorial4 import TUTORIAL4
+    from .tutorial5 import TUTORIAL5
+    from .practice1 import PRACTICE1
+    from .practice2 import PRACTICE2
+    from .practice3 import PRACTICE3
+    from .practice4 import PRACTICE4
+    from .practice5 import PRACTICE5
+
+__all__ = [
+    "HARD1",
+    "HARD2",
+    "NIGHTMARE1",
+    "NIGHTMARE2",
+    "NORMAL1",
+    "NORMAL2",
+    "NORMAL3",
+    "NORMAL4",
+    "TUTORIAL1",
+    "TUTORIAL2",
+    "TUTORIAL3",
+    "TUTORIAL4",
+    "TUTORIAL5",
+    "PRACTICE1",
+    "PRACTICE2",
+    "PRACTICE3",
+    "PRACTICE4",
+    "PRACTICE5",
+]
+
+
+def __getattr__(name: str) -> SeededMapType:
+    """
+    Import a map's module on first access (`maps.TUTORIAL1` imports `maps.tutorial1`)
+    """
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    map_factory: SeededMapType = getattr(
+        importlib.import_module(f".{name.lower()}", __name__), name
+    )
+    globals()[name] = map_factory
+    return map_factory
+
+
+def __dir__() -> list[str]:
+    return sorted(__all__)
@@ -1,9 +1,9 @@
 from ...direction import Direction
 from ...color import Color
-from ...map import CustomMapType, Door, Enemy, Exit, Key, Map, Block, Player
+from ...map import SeededMapType, Door, Enemy, Exit, Key, Map, Block, Player
 
 
-def _get_map():
+def _get_map(seed: int | None = None):
     ENEMY = Enemy(
         [Direction.UP] * 10 + [Direction.DOWN] * 10, chance_to_move=0.5, boss=True
     )
@@ -28,7 +28,7 @@ def _get_map():
     return ([HARD1_1], "Don't forget that the enemy has a chance to not move.")
 
 
-HARD1: CustomMapType = _get_map
+HARD1: SeededMapType = _get_map
 
 
 # def script():
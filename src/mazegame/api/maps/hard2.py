@@ -1,19 +1,20 @@
 import random
 from ...map_maker import map_maker
 from ...color import Color
-from ...map import CustomMapType, Map, ColoredFloor, Door, Lock
+from ...map import SeededMapType, Map, ColoredFloor, Door, Lock
 
 
-def _get_map():
-    door_color = Color.get_unique_colors(1)[0]
+def _get_map(seed: int | None = None):
+    rng = random.Random(seed)
+    door_color = Color.get_unique_colors(1, rng=rng)[0]
 
-    red_count = random.randrange(3, 9 + 1, 2)
-    colors = Color.get_unique_colors(9 - red_count, [Color.RED])
+    red_count = rng.randrange(3, 9 + 1, 2)
+    colors = Color.get_unique_colors(9 - red_count, [Color.RED], rng=rng)
     floors = [
         *(ColoredFloor(Color.RED) for _ in range(red_count)),
         *(ColoredFloor(color) for color in colors),
     ]
-    random.shuffle(floors)
+    rng.shuffle(floors)
     HARD2_ODD = Map(
         map_maker(
             f"""
@@ -36,13 +37,13 @@ XXXXXXXXXXX
         )
     )
 
-    red_count = random.randrange(4, 8 + 1, 2)
-    colors = Color.get_unique_colors(9 - red_count, [Color.RED])
+    red_count = rng.randrange(4, 8 + 1, 2)
+    colors = Color.get_unique_colors(9 - red_count, [Color.RED], rng=rng)
     floors = [
         *(ColoredFloor(Color.RED) for _ in range(red_count)),
         *(ColoredFloor(color) for color in colors),
     ]
-    random.shuffle(floors)
+    rng.shuffle(floors)
     HARD2_EVEN = Map(
         map_maker(
             f"""
@@ -72,4 +73,4 @@ Use 'a % n' to get the remainder of a / n""",
     )
 
 
-HARD2: CustomMapType = _get_map
+HARD2: SeededMapType = _get_map
@@ -1,9 +1,9 @@
 from ...direction import Direction
 from ...color import Color
-from ...map import CustomMapType, Door, Enemy, Exit, Key, Map, Block, Player
+from ...map import SeededMapType, Door, Enemy, Exit, Key, Map, Block, Player
 
 
-def _get_map():
+def _get_map(seed: int | None = None):
 
     NIGHTMARE1_1 = Map([[Player(), Key(Color.RED), Door(Color.BLUE), Exit()]])
 
@@ -15,7 +15,7 @@ def _get_map():
     )
 
 
-NIGHTMARE1: CustomMapType = _get_map
+NIGHTMARE1: SeededMapType = _get_map
 
 
 # Scroll down for solution
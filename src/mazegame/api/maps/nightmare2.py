@@ -1,9 +1,9 @@
 from ...direction import Direction
 from ...color import Color
-from ...map import CustomMapType, Door, Enemy, Exit, Key, Map, Block, Player, Spike
+from ...map import SeededMapType, Door, Enemy, Exit, Key, Map, Block, Player, Spike
 
 
-def _get_map():
+def _get_map(seed: int | None = None):
 
     NIGHTMARE2_1 = Map([[Player(), Spike(), Exit()]])
 
@@ -15,7 +15,7 @@ def _get_map():
     )
 
 
-NIGHTMARE2: CustomMapType = _get_map
+NIGHTMARE2: SeededMapType = _get_map
 
 
 # Scroll down for solution
@@ -1,8 +1,8 @@
 from ...color import Color
-from ...map import CustomMapType, Door, Exit, Key, Map, Block, Player, Spike
+from ...map import SeededMapType, Door, Exit, Key, Map, Block, Player, Spike
 
 
-def _get_map():
+def _get_map(seed: int | None = None):
     KEY1 = Key(Color.LIGHT_BLUE)
     KEY2 = Key(Color.GREEN)
     DOOR1 = Door(Color.LIGHT_BLUE)
@@ -22,7 +22,7 @@ def _get_map():
     return ([NORMAL1_1], "Beware of the spike!")
 
 
-NORMAL1: CustomMapType = _get_map
+NORMAL1: SeededMapType = _get_map
 # def script():
 #     move(RIGHT)
 #     move(DOWN)
@@ -1,8 +1,8 @@
 import random
-from ...map import CustomMapType, Exit, Map, Block, Player, Spike
+from ...map import SeededMapType, Exit, Map, Block, Player, Spike
 
 
-def _get_map():
+def _get_map(seed: int | None = None):
     maps = [
         [
             [Block(), Spike(), Block()],
@@ -18,7 +18,7 @@ def _get_map():
     return ([Map(map) for map in maps], "The spike can spawn on any tile next to you.")
 
 
-NORMAL2: CustomMapType = _get_map
+NORMAL2: SeededMapType = _get_map
 
 # def script():
 #     if get_tile(UP) == EXIT:
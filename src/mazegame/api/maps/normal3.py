@@ -3,7 +3,7 @@ import random
 from ...color import Color
 from ...map import (
     ColoredFloor,
-    CustomMapType,
+    SeededMapType,
     Door,
     DoorFrame,
     Exit,
@@ -15,8 +15,9 @@ from ...map import (
 )
 
 
-def _get_map():
-    color1, color2, color3, color4 = Color.get_unique_colors(4)
+def _get_map(seed: int | None = None):
+    rng = random.Random(seed)
+    color1, color2, color3, color4 = Color.get_unique_colors(4, rng=rng)
     NORMAL3_1 = Map(
         [
             [
@@ -94,7 +95,7 @@ If 2 colored floors have different colors, the exit will be on the right.""",
     )
 
 
-NORMAL3: CustomMapType = _get_map
+NORMAL3: SeededMapType = _get_map
 
 # def script():
 #     move(UP)
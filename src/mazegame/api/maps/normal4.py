@@ -1,10 +1,12 @@
+import random
 from ...direction import Direction
 from ...color import Color
-from ...map import CustomMapType, Door, Enemy, Exit, Key, Map, Block, Player, Lock
+from ...map import SeededMapType, Door, Enemy, Exit, Key, Map, Block, Player, Lock
 
 
-def _get_map():
-    color1, color2 = Color.get_unique_colors(2)
+def _get_map(seed: int | None = None):
+    rng = random.Random(seed)
+    color1, color2 = Color.get_unique_colors(2, rng=rng)
     KEY1 = Key(color1)
     LOCK2 = Lock(color2)
     DOOR1 = Door(color1)
@@ -39,7 +41,7 @@ def _get_map():
     )
 
 
-NORMAL4: CustomMapType = _get_map
+NORMAL4: SeededMapType = _get_map
 
 # def script():
 #     for _ in range(5):
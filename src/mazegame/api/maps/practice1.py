@@ -1,10 +1,12 @@
+import random
 from ...map_maker import map_maker
 from ...color import Color
-from ...map import CustomMapType, Door, Key, Map
+from ...map import SeededMapType, Door, Key, Map
 
 
-def _get_map():
-    color1, color2 = Color.get_unique_colors(2)
+def _get_map(seed: int | None = None):
+    rng = random.Random(seed)
+    color1, color2 = Color.get_unique_colors(2, rng=rng)
     PRACTICE1_1 = Map(
         map_maker(
             f"""
@@ -31,7 +33,7 @@ XXXXXXXXX
     return ([PRACTICE1_1], "There are 2 players.")
 
 
-PRACTICE1: CustomMapType = _get_map
+PRACTICE1: SeededMapType = _get_map
 
 # def script():
 #     move(RIGHT)
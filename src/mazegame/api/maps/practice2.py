@@ -1,10 +1,12 @@
+import random
 from ...map_maker import map_maker
 from ...color import Color
-from ...map import CustomMapType, Door, Key, Map, Lock
+from ...map import SeededMapType, Door, Key, Map, Lock
 
 
-def _get_map():
-    colors = Color.get_unique_colors(4)
+def _get_map(seed: int | None = None):
+    rng = random.Random(seed)
+    colors = Color.get_unique_colors(4, rng=rng)
     PRACTICE2_1 = Map(
         map_maker(
             f"""
@@ -31,7 +33,7 @@ XXXXXXXX
     return ([PRACTICE2_1], "It's ok to lock some doors, as long as you can get in.")
 
 
-PRACTICE2: CustomMapType = _get_map
+PRACTICE2: SeededMapType = _get_map
 
 # Solution 1 (12 moves)
 # def script():
@@ -1,10 +1,12 @@
+import random
 from ...map_maker import map_maker
 from ...color import Color
-from ...map import CustomMapType, Door, Key, Map, Lock
+from ...map import SeededMapType, Door, Key, Map, Lock
 
 
-def _get_map():
-    colors = Color.get_unique_colors(4)
+def _get_map(seed: int | None = None):
+    rng = random.Random(seed)
+    colors = Color.get_unique_colors(4, rng=rng)
     PRACTICE3 = Map(
         map_maker(
             f"""
@@ -36,7 +38,7 @@ XXXXXXXXX
     return ([PRACTICE3], "There are 2 players.")
 
 
-PRACTICE3: CustomMapType = _get_map
+PRACTICE3: SeededMapType = _get_map
 
 # def script():
 #     move(UP)
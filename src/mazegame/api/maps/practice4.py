@@ -1,10 +1,12 @@
+import random
 from ...map_maker import map_maker
 from ...color import Color
-from ...map import CustomMapType, ColoredFloor, Map, Lock, Door
+from ...map import SeededMapType, ColoredFloor, Map, Lock, Door
 
 
-def _get_map():
-    color0, color1, color2, color3, color4 = Color.get_unique_colors(5)
+def _get_map(seed: int | None = None):
+    rng = random.Random(seed)
+    color0, color1, color2, color3, color4 = Color.get_unique_colors(5, rng=rng)
     PRACTICE4_1 = Map(
         map_maker(
             f"""
@@ -147,7 +149,7 @@ Then if the second and fourth colored floor have the same color, go up. Otherwis
     )
 
 
-PRACTICE4: CustomMapType = _get_map
+PRACTICE4: SeededMapType = _get_map
 
 # def script():
 #     move(UP)
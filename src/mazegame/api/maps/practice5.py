@@ -1,10 +1,12 @@
+import random
 from ...map_maker import map_maker
 from ...color import Color
-from ...map import CustomMapType, Door, Map, Lock, ColoredBlock, ColoredFloor
+from ...map import SeededMapType, Door, Map, Lock, ColoredBlock, ColoredFloor
 
 
-def _get_map():
-    color1, color2, color3, color4, color5 = Color.get_unique_colors(5)
+def _get_map(seed: int | None = None):
+    rng = random.Random(seed)
+    color1, color2, color3, color4, color5 = Color.get_unique_colors(5, rng=rng)
     PRACTICE5_2 = Map(
         map_maker(
             f"""
@@ -148,7 +150,7 @@ XXXXXX
     )
 
 
-PRACTICE5: CustomMapType = _get_map
+PRACTICE5: SeededMapType = _get_map
 
 # def script():
 #     move(UP)
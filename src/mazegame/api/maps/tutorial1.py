@@ -1,7 +1,7 @@
-from ...map import Block, CustomMapType, Exit, Map, Player
+from ...map import Block, Exit, Map, Player, SeededMapType
 
 
-def _get_map():
+def _get_map(seed: int | None = None):
     # fmt: off
     TUTORIAL1_1 = Map(
         [
@@ -16,7 +16,7 @@ def _get_map():
     return ([TUTORIAL1_1], "Use 'move(UP)' to reach the exit!")
 
 
-TUTORIAL1: CustomMapType = _get_map
+TUTORIAL1: SeededMapType = _get_map
 
 # def script():
 #     for _ in range(4):
@@ -1,7 +1,7 @@
 from ...color import Color
 from ...map import (
     ColoredBlock,
-    CustomMapType,
+    SeededMapType,
     Door,
     Exit,
     Key,
@@ -12,7 +12,7 @@ from ...map import (
 )
 
 
-def _get_map():
+def _get_map(seed: int | None = None):
     # fmt: off
     TUTORIAL2_1 = Map(
         [
@@ -58,7 +58,7 @@ def _get_map():
     )
 
 
-TUTORIAL2: CustomMapType = _get_map
+TUTORIAL2: SeededMapType = _get_map
 
 # def script():
 #     while get_color(RIGHT) != PURPLE:
@@ -1,8 +1,8 @@
 from ...direction import Direction
-from ...map import Block, CustomMapType, Enemy, Exit, Map, Player
+from ...map import Block, Enemy, Exit, Map, Player, SeededMapType
 
 
-def _get_map():
+def _get_map(seed: int | None = None):
     TUTORIAL3_1 = Map(
         [
             [Block(), Block(), Exit(), Block()],
@@ -22,7 +22,7 @@ def _get_map():
     return ([TUTORIAL3_1], "Wait for enemy to move out of the way before moving!")
 
 
-TUTORIAL3: CustomMapType = _get_map
+TUTORIAL3: SeededMapType = _get_map
 
 # def script():
 #     while get_tile(UP) == ENEMY:
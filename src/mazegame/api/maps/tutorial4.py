@@ -1,11 +1,13 @@
+import random
 from ...color import Color
 from ...direction import Direction
-from ...map import Block, CustomMapType, Door, Enemy, Exit, Key, Map, Player
+from ...map import Block, Door, Enemy, Exit, Key, Map, Player, SeededMapType
 
 
-def _get_map():
+def _get_map(seed: int | None = None):
+    rng = random.Random(seed)
 
-    color = Color.get_unique_colors(1)[0]
+    color = Color.get_unique_colors(1, rng=rng)[0]
 
     TUTORIAL4_1 = Map(
         [
@@ -18,7 +20,7 @@ def _get_map():
     return ([TUTORIAL4_1], "Touching the key will open all doors with the same color.")
 
 
-TUTORIAL4: CustomMapType = _get_map
+TUTORIAL4: SeededMapType = _get_map
 
 # def script():
 #     move(DOWN)
@@ -1,7 +1,7 @@
-from ...map import Block, CustomMapType, Exit, Map, Player, Spike
+from ...map import Block, Exit, Map, Player, SeededMapType, Spike
 
 
-def _get_map():
+def _get_map(seed: int | None = None):
     TUTORIAL5_1 = Map(
         [
             [Block(), Exit(), Block(), Block(), None],
@@ -16,7 +16,7 @@ def _get_map():
     )
 
 
-TUTORIAL5: CustomMapType = _get_map
+TUTORIAL5: SeededMapType = _get_map
 
 # def script():
 #     move(RIGHT)
@@ -1,15 +1,25 @@
+from contextvars import ContextVar, copy_context
+import inspect
 import os
 import random
 import threading
-from typing import Callable
+from typing import TYPE_CHECKING, Callable, Iterator, cast
 
-from ..preview import Preview
 from ..color import Color
+from ..control import GeneratorControl, ReplayControl
 from ..direction import Direction
-from ..game import Game
-from ..map import CustomMapType, HasColor, Map, Tile
-from .game_obj import get_game
-from . import game_obj
+from ..engine import Engine
+from ..map import CustomMapType, HasColor, Map, SeededMapType, Tile
+from ..move_log import MoveLog
+from .game_obj import get_game, set_game
+
+if TYPE_CHECKING:
+    from ..game import Game
+
+ScriptType = Callable[[], None] | Callable[[], Iterator[Direction]]
+
+_is_loading_script: ContextVar[bool] = ContextVar("is_loading_script", default=False)
+"""Set while a script file is imported for grading, so its `run(...)` call is skipped"""
 
 
 def move(direction: Direction) -> None:
@@ -57,61 +67,208 @@ def get_color(
     return tile.get_color()
 
 
-def run(script: Callable[[], None], map: CustomMapType) -> None:
+def distance_to_exit(
+    direction: Direction = Direction.HALT, player_index: int = 0
+) -> int | None:
+    """
+    Get the number of moves to the nearest exit from a tile in a direction compared to a player.
+    Enemies are not counted, and closed doors are walls until they open.
+
+    :param direction: Which direction to look for tile, use Halt to measure from the tile player is on, defaults to Direction.Halt
+    :param player_index: Which player to measure from, defaults to 0
+    :return: Number of moves, or None if the exit can't be reached from there
+    """
+    return get_game().distance_to_exit(direction, player_index)
+
+
+def walk_to_exit(player_index: int = 0) -> None:
+    """
+    Move the players one tile per turn toward the exit nearest to one of them, until that player can't get any closer.
+    Enemies are not avoided! Only works in scripts that call `move()`.
+
+    :param player_index: Which player to lead to the exit, defaults to 0
+    """
+    get_game().control.walk_to_exit(player_index)
+
+
+def run(
+    script: ScriptType,
+    map: SeededMapType | CustomMapType,
+    *,
+    seed: int | None = None,
+) -> None:
     """
     Run the game using given script
 
-    :param script: script that specify players' movements
+    :param script: script that specify players' movements, either by calling `move`
+        or by yielding directions (`yield UP`)
     :param map: Map
+    :param seed: Seed for the map, its variant and the game's random draws, defaults to a random one
+    """
+    if _is_loading_script.get():
+        return
+    from ..game import Game
+
+    _map = random.Random(seed).choice(_build_maps(map, seed)[0])
+    game = Game(_map, seed=seed)
+    game.is_par_shown = True
+    set_game(game)
+    _start_script(script)
+    game.run()
+
+
+def _build_maps(
+    map: SeededMapType | CustomMapType, seed: int | None
+) -> tuple[list[Map], str]:
+    """
+    Built-in map factories take the seed, a script's own factory may take no argument
+    """
+    if inspect.signature(map).parameters:
+        return cast(SeededMapType, map)(seed)
+    return cast(CustomMapType, map)()
+
+
+def simulate(
+    script: ScriptType,
+    map: list[Map] | Map,
+    *,
+    max_ticks: int | None = None,
+    turn_timeout: float | None = None,
+    seed: int | None = None,
+    keyframe_interval: int | None = None,
+) -> Engine:
     """
-    _map = random.choice(map()[0])
-    game_obj.game = Game(_map)
+    Run the script without a window or frame pacing, ticking as fast as the script moves.
+    The run ends when the game is won or lost, the script returns, or `max_ticks` is reached.
+
+    :param script: script that specify players' movements
+    :param map: Map, or list of map variants to pick from
+    :param max_ticks: Stop after this many ticks, defaults to no limit
+    :param turn_timeout: Seconds to wait for each move before raising `TimeoutError`, defaults to no limit
+    :param seed: Seed for the map variant and the game's random draws, defaults to a random one
+    :param keyframe_interval: Record a trace of the run (`Engine.trace`) with a keyframe every this many ticks,
+        defaults to no trace
+    :return: The engine in its end state (`state`, `tick_count`, `map`)
+    """
+    if isinstance(map, list):
+        map = random.Random(seed).choice(map)
+    engine = Engine(map, seed)
+    if keyframe_interval is not None:
+        engine.start_trace(keyframe_interval)
+    engine.max_ticks = max_ticks
+    engine.turn_timeout = turn_timeout
+    set_game(engine)
+    _start_script(script)
+    engine.run()
+    return engine
+
+
+def replay(
+    log: MoveLog,
+    map: Map,
+    *,
+    is_render: bool = False,
+    keyframe_interval: int | None = None,
+) -> Engine:
+    """
+    Re-simulate a recorded run from its move log, without running the script again
+
+    :param log: Log of the run, see `Engine.move_log`
+    :param map: Fresh copy of the map the run started on
+    :param is_render: Show the run in a window until it's closed, defaults to stopping headlessly after the last tick
+    :param keyframe_interval: Record a trace of the run (`Engine.trace`) with a keyframe every this many ticks,
+        defaults to no trace
+    :raises ValueError: The map isn't the one the log was recorded on
+    :return: The engine in its end state
+    """
+    if map.fingerprint() != log.fingerprint:
+        raise ValueError("The map is not the one the move log was recorded on.")
+    if is_render:
+        from ..game import Game
+
+        engine: Engine = Game(map, seed=log.seed)
+    else:
+        engine = Engine(map, log.seed)
+        engine.max_ticks = len(log)
+    engine.control = ReplayControl(map, engine, log)
+    if keyframe_interval is not None:
+        engine.start_trace(keyframe_interval)
+    engine.run()
+    return engine
+
+
+def _start_script(script: ScriptType) -> None:
+    """
+    Run the script on its own thread, handing control back to the game when it ends.
+    The thread gets a copy of the current context so it keeps seeing its own game.
+    Generator scripts are driven by the game itself on the game's thread instead.
+
+    :param script: script that specify players' movements
+    """
+    game = get_game()
+    if inspect.isgeneratorfunction(script):
+        game.control = GeneratorControl(game.map, game, script())
+        return
+    control = game.control
 
     def updated_script() -> None:
-        get_game().control.pre_run()
-        script()
-        get_game().control.post_run()
+        control.pre_run()
+        try:
+            script()
+        except Exception as error:
+            control.error = error
+            raise
+        finally:
+            control.post_run()
 
-    script_thread = threading.Thread(target=updated_script, daemon=True)
+    script_thread = threading.Thread(
+        target=copy_context().run, args=(updated_script,), daemon=True
+    )
     script_thread.start()
-    get_game().run()
 
 
-def preview(map: CustomMapType) -> None:
+def preview(map: SeededMapType | CustomMapType) -> None:
     """
     Preview the map with its description, enemy pathing, etc.
 
     :param map: Map
     """
-    Preview(*map()).run()
+    if _is_loading_script.get():
+        return
+    from ..preview import Preview
+
+    Preview(*_build_maps(map, None)).run()
 
 
 def _test_run(
-    script: Callable[[], None],
+    script: ScriptType,
     map: list[Map] | Map,
     *,
     exit_on_tick: int | None = None,
     mspt: int | None = 1,
-    is_render: bool = False
-) -> Game:
-    if not is_render:
+    is_render: bool = False,
+    seed: int | None = None,
+    is_par_shown: bool = False,
+) -> "Game":
+    from ..clock import VirtualClock
+    from ..game import Game
+    from ..session import is_session_active
+
+    # A session already picked the video driver for every game in it
+    is_headless = not is_render and not is_session_active()
+    if is_headless:
         os.environ["SDL_VIDEODRIVER"] = "dummy"
     if isinstance(map, list):
-        map = random.choice(map)
-    game = Game(map)
+        map = random.Random(seed).choice(map)
+    # Only a rendered run has someone watching, otherwise ticks run back to back
+    game = Game(map, None if is_render else VirtualClock(), seed)
     game._exit_on_tick = exit_on_tick
+    game.is_par_shown = is_par_shown
     if mspt is not None:
         game.MSPT = mspt  # type: ignore
-    game_obj.game = game
-
-    def updated_script() -> None:
-        get_game().control.pre_run()
-        script()
-        get_game().control.post_run()
-
-    script_thread = threading.Thread(target=updated_script, daemon=True)
-    script_thread.start()
+    set_game(game)
+    _start_script(script)
     game.run()
-    if not is_render:
+    if is_headless:
         del os.environ["SDL_VIDEODRIVER"]
     return game
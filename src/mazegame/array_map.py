@@ -0,0 +1,310 @@
+from enum import IntEnum
+import hashlib
+from typing import Callable, Iterator, Type
+
+import numpy as np
+
+from .color import Color
+from .map import (
+    Block,
+    ColoredBlock,
+    ColoredFloor,
+    Door,
+    DoorFrame,
+    Enemy,
+    Exit,
+    HasColor,
+    Key,
+    Lock,
+    Map,
+    Player,
+    Spike,
+    Tile,
+    TileVar,
+)
+
+
+class TileKind(IntEnum):
+    NONE = 0
+    BLOCK = 1
+    COLORED_BLOCK = 2
+    COLORED_FLOOR = 3
+    DOOR = 4
+    DOOR_FRAME = 5
+    KEY = 6
+    LOCK = 7
+    SPIKE = 8
+    EXIT = 9
+
+
+COLORS: list[Color] = list(Color)
+"""Color of each color code, offset by 1 (0 means no color)"""
+
+_KIND_TO_CLASS: dict[TileKind, Type[Tile]] = {
+    TileKind.BLOCK: Block,
+    TileKind.COLORED_BLOCK: ColoredBlock,
+    TileKind.COLORED_FLOOR: ColoredFloor,
+    TileKind.DOOR: Door,
+    TileKind.DOOR_FRAME: DoorFrame,
+    TileKind.KEY: Key,
+    TileKind.LOCK: Lock,
+    TileKind.SPIKE: Spike,
+    TileKind.EXIT: Exit,
+}
+_CLASS_TO_KIND: dict[Type[Tile], TileKind] = {
+    cls: kind for kind, cls in _KIND_TO_CLASS.items()
+}
+_ENTITY_CLASSES: tuple[Type[Tile], ...] = (Player, Enemy)
+
+
+def color_to_code(color: Color | None) -> int:
+    if color is None:
+        return 0
+    return COLORS.index(color) + 1
+
+
+def code_to_color(code: int) -> Color:
+    return COLORS[code - 1]
+
+
+class ArrayMap(Map):
+    """
+    Map that keeps its static layout in NumPy arrays (tile kind and color code per cell)
+    and only keeps players and enemies as tile objects, for very large headless maps.
+
+    Static tiles returned by `get_tile` are shared between every cell of the same kind and color.
+    There's no `map` grid of tile objects, so it can't be rendered by `Game` or `Preview`.
+    """
+
+    def __init__(
+        self,
+        kinds: np.ndarray,
+        colors: np.ndarray | None = None,
+        entities: dict[tuple[int, int], Tile] | None = None,
+    ) -> None:
+        """
+        :param kinds: (height, width) array of `TileKind`
+        :param colors: (height, width) array of color codes (see `color_to_code`), defaults to no color
+        :param entities: Players and enemies by (x, y) position, defaults to none
+        """
+        self.kinds = np.array(kinds, dtype=np.uint8)
+        if self.kinds.ndim != 2:
+            raise ValueError(f"Expected 2D array for kinds, got {self.kinds.ndim}D.")
+        self.height, self.width = self.kinds.shape
+        if colors is None:
+            self.colors = np.zeros_like(self.kinds)
+        else:
+            self.colors = np.array(colors, dtype=np.uint8)
+            if self.colors.shape != self.kinds.shape:
+                raise ValueError(
+                    f"Expected colors of shape {self.kinds.shape}, got {self.colors.shape}."
+                )
+        self.entities: dict[tuple[int, int], Tile] = {}
+        for pos, tile in (entities or {}).items():
+            if not isinstance(tile, _ENTITY_CLASSES):
+                raise ValueError(
+                    f"Only players and enemies can be entities, got {tile}."
+                )
+            self.entities[pos] = tile
+        self._static_tiles: dict[tuple[int, int], Tile] = {}
+        self._exit_distances: np.ndarray | None = None
+        self._changed_cells: set[tuple[int, int]] = set()
+        self._change_trackers: list[set[tuple[int, int]]] = []
+
+    @classmethod
+    def from_map(cls, map: Map) -> "ArrayMap":
+        """
+        Convert a regular map, tile objects of players and enemies are kept as is
+        """
+        kinds = np.zeros((map.height, map.width), dtype=np.uint8)
+        colors = np.zeros((map.height, map.width), dtype=np.uint8)
+        entities: dict[tuple[int, int], Tile] = {}
+        for (x, y), tile in map.iter_tiles():
+            if isinstance(tile, _ENTITY_CLASSES):
+                entities[x, y] = tile
+                tile = tile.tile_under
+                if tile is None:
+                    continue
+            if tile._auto_remove:
+                tile = tile.tile_under
+                assert tile is not None
+            kinds[y, x], colors[y, x] = cls._encode(tile)
+        return cls(kinds, colors, entities)
+
+    @staticmethod
+    def _encode(tile: Tile) -> tuple[TileKind, int]:
+        if type(tile) not in _CLASS_TO_KIND:
+            raise ValueError(f"{type(tile).__name__} can't be stored in ArrayMap.")
+        color = tile.get_color() if isinstance(tile, HasColor) else None
+        return _CLASS_TO_KIND[type(tile)], color_to_code(color)
+
+    def _get_static_tile(self, kind: int, color_code: int) -> Tile:
+        """
+        Get the shared tile object of a kind and color
+        """
+        tile = self._static_tiles.get((kind, color_code))
+        if tile is not None:
+            return tile
+        tile_class = _KIND_TO_CLASS[TileKind(kind)]
+        match kind:
+            case TileKind.DOOR | TileKind.DOOR_FRAME:
+                door = Door(code_to_color(color_code))
+                assert door.tile_under is not None
+                self._static_tiles[TileKind.DOOR, color_code] = door
+                self._static_tiles[TileKind.DOOR_FRAME, color_code] = door.tile_under
+                return self._static_tiles[kind, color_code]
+            case (
+                TileKind.COLORED_BLOCK
+                | TileKind.COLORED_FLOOR
+                | TileKind.KEY
+                | TileKind.LOCK
+            ):
+                tile = tile_class(code_to_color(color_code))  # type: ignore
+            case _:
+                tile = tile_class()  # type: ignore
+        self._static_tiles[kind, color_code] = tile
+        return tile
+
+    def get_tile(self, x: int, y: int) -> Tile | None:
+        if x < 0 or x >= self.width:
+            return None
+        if y < 0 or y >= self.height:
+            return None
+        entity = self.entities.get((x, y))
+        if entity is not None:
+            return entity
+        kind = int(self.kinds[y, x])
+        if kind == TileKind.NONE:
+            return None
+        tile = self._get_static_tile(kind, int(self.colors[y, x]))
+        tile.pos = (x, y)
+        return tile
+
+    def _mark_changed(self, positions: list[tuple[int, int]]) -> None:
+        self._changed_cells.update(positions)
+        for cells in self._change_trackers:
+            cells.update(positions)
+
+    def _mark_changed_mask(self, mask: np.ndarray) -> None:
+        ys, xs = np.nonzero(mask)
+        self._mark_changed(list(zip(xs.tolist(), ys.tolist())))
+
+    def set_tile(self, x: int, y: int, tile: Tile | None) -> None:
+        self._mark_changed([(x, y)])
+        if isinstance(tile, _ENTITY_CLASSES):
+            # The static tile under an entity is kept in its `tile_under`,
+            # and is written back when the entity leaves.
+            self.entities[x, y] = tile
+            return
+        self.entities.pop((x, y), None)
+        if tile is None:
+            self.kinds[y, x] = TileKind.NONE
+            self.colors[y, x] = 0
+            return
+        self.kinds[y, x], self.colors[y, x] = self._encode(tile)
+
+    def iter_tiles(self) -> Iterator[tuple[tuple[int, int], Tile]]:
+        for pos in sorted(self.entities, key=lambda pos: (pos[1], pos[0])):
+            yield pos, self.entities[pos]
+
+    def iter_cells(self) -> Iterator[tuple[tuple[int, int], Tile]]:
+        cells = self.kinds != TileKind.NONE
+        for x, y in self.entities:
+            cells[y, x] = True
+        ys, xs = np.nonzero(cells)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            tile = self.get_tile(x, y)
+            assert tile is not None
+            yield (x, y), tile
+
+    def fingerprint(self) -> bytes:
+        """
+        Hash of the layout: the kind and color arrays, and every entity.
+        Unlike `Map.fingerprint` it doesn't look at each cell, so it differs from the fingerprint of the same `Map`.
+
+        :return: 16 bytes, the same for every map built the same way
+        """
+        return self.defer_fingerprint()()
+
+    def defer_fingerprint(self) -> Callable[[], bytes]:
+        kinds = self.kinds.copy()
+        colors = self.colors.copy()
+        entities = [
+            (pos, tile.get_signature())
+            for pos, tile in sorted(
+                self.entities.items(), key=lambda item: (item[0][1], item[0][0])
+            )
+        ]
+
+        def fingerprint() -> bytes:
+            digest = hashlib.blake2b(digest_size=16)
+            digest.update(repr(kinds.shape).encode())
+            digest.update(kinds.tobytes())
+            digest.update(colors.tobytes())
+            digest.update(repr(entities).encode())
+            return digest.digest()
+
+        return fingerprint
+
+    def _free_cells(self) -> np.ndarray:
+        """
+        Mask of cells that aren't covered by an entity
+        """
+        free = np.ones(self.kinds.shape, dtype=bool)
+        for x, y in self.entities:
+            free[y, x] = False
+        return free
+
+    def open_doors(self, color: Color) -> None:
+        self._exit_distances = None
+        doors = (self.kinds == TileKind.DOOR) & (self.colors == color_to_code(color))
+        self.kinds[doors] = TileKind.DOOR_FRAME
+        self._mark_changed_mask(doors)
+
+    def close_doors(self, color: Color) -> None:
+        self._exit_distances = None
+        color_code = color_to_code(color)
+        frames = (self.kinds == TileKind.DOOR_FRAME) & (self.colors == color_code)
+        self.kinds[frames] = TileKind.DOOR
+        # Also covers the frames under entities
+        self._mark_changed_mask(frames)
+        door = self._get_static_tile(TileKind.DOOR, color_code)
+        for tile in self.entities.values():
+            if (
+                isinstance(tile.tile_under, DoorFrame)
+                and tile.tile_under.color == color
+            ):
+                # Put closed door under a tile that's currently occupying the doorframe when the lock happens.
+                tile.tile_under = door
+
+    def get_positions(
+        self, cls: Type[Tile], color: Color | None = None
+    ) -> list[tuple[int, int]]:
+        positions = [
+            pos
+            for pos, tile in self.entities.items()
+            if isinstance(tile, cls) and color is None
+        ]
+        kinds = [
+            kind
+            for kind, tile_class in _KIND_TO_CLASS.items()
+            if issubclass(tile_class, cls)
+        ]
+        if kinds:
+            mask = np.isin(self.kinds, kinds) & self._free_cells()
+            if color is not None:
+                mask &= self.colors == color_to_code(color)
+            ys, xs = np.nonzero(mask)
+            positions.extend(zip(xs.tolist(), ys.tolist()))
+        positions.sort(key=lambda pos: (pos[1], pos[0]))
+        return positions
+
+    def get_tiles(
+        self, cls: Type[TileVar], color: Color | None = None
+    ) -> list[TileVar]:
+        tiles: list[TileVar] = []
+        for x, y in self.get_positions(cls, color):
+            tile = self.get_tile(x, y)
+            assert isinstance(tile, cls)
+            tiles.append(tile)
+        return tiles
@@ -0,0 +1,57 @@
+import pygame
+
+from .map import Enemy, Map, Player, Tile, pos_to_pixel
+
+
+def is_entity(tile: Tile) -> bool:
+    """
+    Whether a tile can move by itself (player or enemy), and so isn't part of the background
+    """
+    return isinstance(tile, (Player, Enemy))
+
+
+def get_static_tile(tile: Tile | None) -> Tile | None:
+    """
+    Get the top-most tile that isn't an entity, looking under entities standing on it
+    """
+    while tile is not None and is_entity(tile):
+        tile = tile.tile_under
+    return tile
+
+
+class Background:
+    """
+    Floor and every tile that isn't an entity, pre-composited into one surface.
+    Cells are redrawn one by one when the map changes (doors opening, keys being picked up, etc.).
+    """
+
+    def __init__(self, map: Map, tile_size: int, floor_surface: pygame.Surface) -> None:
+        """
+        :param map: Map whose tiles are already initialized with `tile_size`
+        :param tile_size: Tile size in pixel
+        :param floor_surface: Floor sprite scaled to `tile_size`
+        """
+        self.map = map
+        self.tile_size = tile_size
+        self.floor_surface = floor_surface
+        self.surface = pygame.Surface((map.width * tile_size, map.height * tile_size))
+        for y in range(map.height):
+            for x in range(map.width):
+                self.redraw_cell((x, y))
+
+    def redraw_cell(self, pos: tuple[int, int]) -> pygame.Rect:
+        """
+        Redraw a cell from the current state of the map
+
+        :param pos: Cell position
+        :return: Area of the cell on the surface
+        """
+        rect = self.floor_surface.get_rect(topleft=pos_to_pixel(self.tile_size, pos))
+        self.surface.blit(self.floor_surface, rect)
+        tile = get_static_tile(self.map.get_tile(*pos))
+        if tile is None:
+            return rect
+        if tile.tile_under is not None:
+            self.surface.blit(tile.tile_under.surf, tile.tile_under.get_top_left(pos))
+        self.surface.blit(tile.surf, tile.get_top_left(pos))
+        return rect
@@ -0,0 +1,89 @@
+from argparse import ArgumentParser
+import json
+from pathlib import Path
+import sys
+
+import pygame
+
+from .images import ATLAS_IMAGE, ATLAS_INDEX, get_assets_dir
+
+SPRITE_DIR = Path(__file__).parents[2] / "assets" / "sprite"
+ATLAS_WIDTH = 256
+
+
+def pack(
+    sizes: dict[str, tuple[int, int]], width: int
+) -> tuple[dict[str, tuple[int, int, int, int]], int]:
+    """
+    Place rectangles on shelves from the tallest to the shortest
+
+    :param sizes: Size (width, height) of every sprite by name
+    :param width: Width of the atlas
+    :return: Position and size (x, y, width, height) by name, and the height of the atlas
+    """
+    index: dict[str, tuple[int, int, int, int]] = {}
+    x = y = shelf_height = 0
+    for name, (sprite_width, sprite_height) in sorted(
+        sizes.items(), key=lambda item: (-item[1][1], item[0])
+    ):
+        if sprite_width > width:
+            raise ValueError(
+                f"Sprite '{name}' is wider ({sprite_width}) than the atlas ({width})."
+            )
+        if x + sprite_width > width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        index[name] = (x, y, sprite_width, sprite_height)
+        x += sprite_width
+        shelf_height = max(shelf_height, sprite_height)
+    return index, y + shelf_height
+
+
+def build_atlas(
+    sprite_dir: Path, output_dir: Path, width: int = ATLAS_WIDTH
+) -> dict[str, tuple[int, int, int, int]]:
+    """
+    Pack every PNG in a directory into one atlas image and its index
+
+    :param sprite_dir: Directory of sprites, named after `Tile.to_image_name`
+    :param output_dir: Directory to write `ATLAS_IMAGE` and `ATLAS_INDEX` into
+    :param width: Width of the atlas, defaults to ATLAS_WIDTH
+    :return: The index
+    """
+    sprites = {path.stem: pygame.image.load(path) for path in sprite_dir.glob("*.png")}
+    index, height = pack(
+        {name: sprite.get_size() for name, sprite in sprites.items()}, width
+    )
+    atlas = pygame.Surface((width, height), pygame.SRCALPHA)
+    for name, rect in index.items():
+        atlas.blit(sprites[name], rect)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    pygame.image.save(atlas, output_dir / ATLAS_IMAGE)
+    lines = [
+        f"    {json.dumps(name)}: {json.dumps(rect)}"
+        for name, rect in sorted(index.items())
+    ]
+    (output_dir / ATLAS_INDEX).write_text("{\n" + ",\n".join(lines) + "\n}\n")
+    return index
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Rebuild the packaged atlas after changing sprites: `python -m mazegame.build_atlas`
+    """
+    parser = ArgumentParser(prog="python -m mazegame.build_atlas")
+    parser.add_argument("-s", "--sprites", type=Path, default=SPRITE_DIR)
+    parser.add_argument(
+        "-o", "--output", type=Path, default=Path(str(get_assets_dir()))
+    )
+    args = parser.parse_args(argv)
+    index = build_atlas(args.sprites, args.output)
+    print(
+        f"Packed {len(index)} sprites into '{args.output / ATLAS_IMAGE}'.",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+class VirtualClock:
+    """
+    Drop-in for `pygame.time.Clock` that never sleeps, every frame lasts exactly `frame_ms`
+    """
+
+    def __init__(self, frame_ms: float = 1000 / 120) -> None:
+        """
+        :param frame_ms: Time that passes every frame in millisecond, defaults to a frame at 120 FPS
+        """
+        self.frame_ms = frame_ms
+        self.time_ms = 0.0
+        """Virtual time since the clock was created in millisecond"""
+
+    def tick(self, framerate: float = 0) -> float:
+        """
+        Advance to the next frame right away
+
+        :param framerate: Ignored, only there to match `pygame.time.Clock.tick`
+        :return: Time since the previous frame in millisecond
+        """
+        self.time_ms += self.frame_ms
+        return self.frame_ms
@@ -1,25 +1,28 @@
 from enum import Enum
 import random
-from pygame import Color as _Color
 
 
 class Color(Enum):
-    RED = _Color(255, 50, 50)
-    ORANGE = _Color(255, 140, 0)
-    YELLOW = _Color(255, 230, 50)
-    GREEN = _Color(0, 200, 0)
-    LIGHT_BLUE = _Color(100, 180, 255)
-    BLUE = _Color(0, 100, 255)
-    PURPLE = _Color(180, 100, 220)
+    RED = (255, 50, 50)
+    ORANGE = (255, 140, 0)
+    YELLOW = (255, 230, 50)
+    GREEN = (0, 200, 0)
+    LIGHT_BLUE = (100, 180, 255)
+    BLUE = (0, 100, 255)
+    PURPLE = (180, 100, 220)
 
     @classmethod
     def get_unique_colors(
-        cls, count: int | None, exceptions: list["Color"] = []
+        cls,
+        count: int | None,
+        exceptions: list["Color"] = [],
+        rng: random.Random | None = None,
     ) -> list["Color"]:
         """
         Randomize {count} colors from all possible colors. All of them are unique
 
         :param count: How many colors to randomize, or as many as possible if set to `None`
+        :param rng: Random generator to draw from, defaults to the global one
         """
         all_colors = [x for x in list(cls) if x not in exceptions]
         if count is None:
@@ -28,7 +31,7 @@ class Color(Enum):
             raise ValueError(
                 f"Cannot select {count} unique colors from {len(all_colors)} available colors."
             )
-        selected_colors = random.sample(all_colors, count)
+        selected_colors = (random if rng is None else rng).sample(all_colors, count)
 
         return selected_colors
 
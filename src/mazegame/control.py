@@ -1,31 +1,41 @@
 import threading
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterator
 
 from .direction import Direction
 
 
-from .map import Map, Player
+from .map import Enemy, Map, Player
 
 if TYPE_CHECKING:
-    from .game import Game
+    from .engine import Engine
+    from .move_log import MoveLog
 
 
 class Control:
-    control_event = threading.Event()
-
-    def __init__(self, map: Map, game: "Game") -> None:
+    def __init__(self, map: Map, game: "Engine") -> None:
         self.is_dead = False
-        self.control_event.clear()
+        self.error: Exception | None = None
+        """Exception that ended the script, if any"""
+        self.control_event = threading.Event()
         self.game = game
         self.player_positions = map.get_positions(Player)
+        self.walking_player: int | None = None
+        """Player the game walks to the exit on its own, see `walk_to_exit`"""
+        self._walk_distance: int | None = None
 
     def kill(self) -> None:
         self.is_dead = True
         self.control_event.set()
 
     def move(self, direction: Direction) -> None:
+        """
+        Make a move and wait for the next turn (script side)
+
+        :raises SystemExit: The game is over. Unlike returning, this ends a script that moves in a loop
+            instead of leaving its thread spinning, and the thread exits quietly.
+        """
         if self.is_dead:
-            return
+            raise SystemExit()
         match direction:
             case Direction.LEFT | Direction.RIGHT | Direction.UP | Direction.DOWN:
                 self._move(*direction.value)
@@ -37,26 +47,156 @@ class Control:
     def _move(self, dx: int, dy: int) -> None:
         if self.is_dead:
             return
+        self._set_moves(dx, dy)
+        self._end_turn()
+
+    def _set_moves(self, dx: int, dy: int) -> None:
         self.game.next_moves = [
             (player_pos[0], player_pos[1], dx, dy)
             for player_pos in self.player_positions
         ]
         self.player_positions = []
-        self.control_event.clear()
-        self.game.game_event.set()
-        self.control_event.wait()
+
+    def walk_to_exit(self, player_index: int = 0) -> None:
+        """
+        Let the game move the players every tick, following a player down `Map.get_exit_distances`,
+        until that player can't get any closer (script side).
+        The script only wakes up again once the walk is over, not after every move.
+        """
+        if self.is_dead:
+            raise SystemExit()
+        self.walking_player = player_index
+        self._walk_distance = None
+        if self._walk_step():
+            self._end_turn()
+
+    def _walk_step(self) -> bool:
+        """
+        Set the next move of a walk to the exit
+
+        :return: Whether a move was set, False once the walk is over
+        """
+        assert self.walking_player is not None
+        distance = self.game.distance_to_exit(Direction.HALT, self.walking_player)
+        direction = self.game.get_direction_to_exit(self.walking_player)
+        # Stop when the last move didn't help, like when a lock closed a door on the way
+        if direction is None or (
+            self._walk_distance is not None
+            and distance is not None
+            and distance >= self._walk_distance
+        ):
+            self.walking_player = None
+            return False
+        self._walk_distance = distance
+        self._set_moves(*direction.value)
+        return True
 
     def _halt(self) -> None:
         if self.is_dead:
             return
+        self._end_turn()
+
+    def _end_turn(self) -> None:
+        """
+        Hand the turn to the game and wait for the next one (script side)
+        """
         self.control_event.clear()
         self.game.game_event.set()
         self.control_event.wait()
 
+    def wait_for_turn(self) -> None:
+        """
+        Let the script make its move and wait for it (game side)
+
+        :raises TimeoutError: The script took longer than `turn_timeout` to move
+        """
+        if self.walking_player is not None and self._walk_step():
+            return
+        self.game.game_event.clear()
+        self.control_event.set()
+        if not self.game.game_event.wait(self.game.turn_timeout):
+            raise TimeoutError(
+                f"Script did not move within {self.game.turn_timeout} seconds."
+            )
+
+    def is_enemy_moving(self, enemy: Enemy) -> bool:
+        """
+        Draw whether an enemy with a random chance to move moves this tick
+        """
+        return self.game.rng.random() < enemy.chance_to_move
+
     def pre_run(self) -> None:
         self.control_event.wait()
 
     def post_run(self) -> None:
+        if self.is_dead:
+            return
         self.control_event.clear()
+        self.game.is_control_alive = False
         self.game.game_event.set()
+
+
+class GeneratorControl(Control):
+    """
+    Control for scripts written as generators that yield directions.
+    The game pulls one direction per tick on its own thread, with no handshake.
+    """
+
+    def __init__(self, map: Map, game: "Engine", script: Iterator[Direction]) -> None:
+        super().__init__(map, game)
+        self.script = script
+
+    def kill(self) -> None:
+        super().kill()
+        self.script.close()  # type: ignore
+
+    def walk_to_exit(self, player_index: int = 0) -> None:
+        raise ValueError(
+            "walk_to_exit() only works in scripts that call move(). Generator scripts already run on the game's side, "
+            "yield the direction with the smallest distance_to_exit() instead."
+        )
+
+    def _end_turn(self) -> None:
+        pass
+
+    def wait_for_turn(self) -> None:
+        try:
+            direction = next(self.script)
+        except StopIteration:
+            self.post_run()
+            return
+        except Exception as error:
+            self.error = error
+            self.post_run()
+            raise
+        self.move(direction)
+
+    def pre_run(self) -> None:
+        pass
+
+    def post_run(self) -> None:
         self.game.is_control_alive = False
+
+
+class ReplayControl(GeneratorControl):
+    """
+    Control that plays back a `MoveLog`: the players' moves and the random enemies' draws.
+    Draws still advance the game's generator, so with the log's seed the rest of the run matches too.
+    Past the end of the log, the players halt and enemies draw from the generator again.
+    """
+
+    def __init__(self, map: Map, game: "Engine", log: "MoveLog") -> None:
+        super().__init__(map, game, self._iter_directions(log))
+        self.draws: list[bool] = []
+        """Draws of the current tick, in enemy order"""
+
+    def _iter_directions(self, log: "MoveLog") -> Iterator[Direction]:
+        for tick in range(len(log)):
+            direction, self.draws = log.get(tick)
+            yield direction
+
+    def is_enemy_moving(self, enemy: Enemy) -> bool:
+        is_moving = super().is_enemy_moving(enemy)
+        if not self.draws:
+            return is_moving
+        return self.draws.pop(0)
@@ -0,0 +1,58 @@
+# Game rules without rendering (maps, tiles, directions, colors and the engine).
+# Nothing here may import pygame, numpy or scipy at import time.
+
+from .color import Color
+from .control import Control, GeneratorControl, ReplayControl
+from .direction import Direction
+from .engine import Engine, GameState
+from .map import (
+    Block,
+    ColoredBlock,
+    ColoredFloor,
+    CustomMapType,
+    Door,
+    DoorFrame,
+    Enemy,
+    Exit,
+    HasColor,
+    Key,
+    Lock,
+    Map,
+    Player,
+    Spike,
+    Tile,
+    TouchableTile,
+)
+from .move_log import MoveLog
+from .solver import Solver, solve
+from .trace import Trace
+
+__all__ = [
+    "Color",
+    "Control",
+    "GeneratorControl",
+    "ReplayControl",
+    "Direction",
+    "Engine",
+    "GameState",
+    "Block",
+    "ColoredBlock",
+    "ColoredFloor",
+    "CustomMapType",
+    "Door",
+    "DoorFrame",
+    "Enemy",
+    "Exit",
+    "HasColor",
+    "Key",
+    "Lock",
+    "Map",
+    "Player",
+    "Spike",
+    "Tile",
+    "TouchableTile",
+    "MoveLog",
+    "Solver",
+    "solve",
+    "Trace",
+]
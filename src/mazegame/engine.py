@@ -0,0 +1,248 @@
+from enum import Enum, auto
+import random
+import threading
+
+from .direction import Direction
+from .map import Enemy, Map, Player, Tile, TouchableTile
+from .control import Control
+from .move_log import MoveLog, is_random_enemy
+from .trace import DEFAULT_KEYFRAME_INTERVAL, Trace, TraceRecorder
+
+
+class GameState(Enum):
+    GAMEPLAY = auto()
+    GAME_OVER = auto()
+    VICTORY = auto()
+
+
+class Engine:
+    """
+    Game rules without rendering or frame pacing.
+
+    `Game` draws on top of this. `Engine.run` on its own steps ticks back to back,
+    as fast as the script can answer.
+    """
+
+    def __init__(self, map: Map, seed: int | None = None) -> None:
+        """
+        :param map: Map to play
+        :param seed: Seed of the game's own random generator, defaults to a random one
+        """
+        self.seed = random.randrange(2**63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        """Every random draw of the game (enemy moves, tips) comes from here"""
+        self.game_event = threading.Event()
+        self.next_moves: list[tuple[int, int, int, int]] = []
+        """Moves set by Control (pos_x, pos_y, dx, dy)"""
+        self.is_control_alive = True
+        self.max_ticks: int | None = None
+        """Stop `run` after this many ticks, even if the script is still running"""
+        self.turn_timeout: float | None = None
+        """Seconds to wait for the script to move before giving up"""
+        self._exit_on_tick: int | None = None
+        self.state = GameState.GAMEPLAY
+        self.game_over_reason: str | None = None
+        self.game_over_tips: str | None = None
+        self.control = Control(map, self)
+        self.enemies = map.get_tiles(Enemy)
+        self.move_log = MoveLog(
+            map.defer_fingerprint(),
+            self.seed,
+            sum(is_random_enemy(enemy) for enemy in self.enemies),
+        )
+        """Every tick's move and enemy draws, enough to replay the run on the same map"""
+        self.trace_recorder: TraceRecorder | None = None
+        self.players = map.get_tiles(Player)
+        for i, player in enumerate(self.players):
+            player.index = i
+        self.game_event.set()
+        self.map = map
+        self.moving_tiles: list[Tile] = []
+        self.tick_count = 0
+        for pos, tile in self.map.iter_tiles():
+            self._init_tile(tile, pos)
+            if tile._auto_remove:
+                self.map.set_tile(*pos, tile.tile_under)
+                # It's a regular tile if it comes back, like a door closed by a lock
+                tile._auto_remove = False
+
+    def start_trace(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL) -> Trace:
+        """
+        Record what the map looks like on every tick from now on, call it before the first tick
+
+        :param keyframe_interval: Ticks between whole map keyframes
+        :return: The trace, filled as the game ticks
+        """
+        self.trace_recorder = TraceRecorder(self.map, keyframe_interval)
+        return self.trace_recorder.trace
+
+    @property
+    def trace(self) -> Trace | None:
+        """What the map looked like on every tick, if `start_trace` was called"""
+        return None if self.trace_recorder is None else self.trace_recorder.trace
+
+    def _init_tile(self, tile: Tile, pos: tuple[int, int]) -> None:
+        """
+        Prepare a tile before the first tick
+
+        :param tile: Tile on the map
+        :param pos: Position of the tile
+        """
+        tile.pos = pos
+        if tile.tile_under is not None:
+            tile.tile_under.pos = pos
+
+    def teardown(self) -> None:
+        self.control.kill()
+
+    def _get_tile(self, x: int, y: int) -> Tile | None:
+        return self.map.get_tile(x, y)
+
+    def get_tile(self, direction: Direction, player_index: int = 0) -> Tile | None:
+        player = self.players[player_index]
+        if direction == Direction.HALT:
+            return player.tile_under
+        return self._get_tile(
+            player.pos[0] + direction.value[0], player.pos[1] + direction.value[1]
+        )
+
+    def distance_to_exit(
+        self, direction: Direction, player_index: int = 0
+    ) -> int | None:
+        """
+        Number of moves from the cell in a direction compared to a player to the nearest exit,
+        read from `Map.get_exit_distances`
+
+        :param direction: Which cell to measure from, use Halt for the cell the player is on
+        :param player_index: Which player to measure from, defaults to 0
+        :return: Number of moves, or None if no exit can be reached from there
+        """
+        player = self.players[player_index]
+        x = player.pos[0] + direction.value[0]
+        y = player.pos[1] + direction.value[1]
+        if not (0 <= x < self.map.width and 0 <= y < self.map.height):
+            return None
+        distance = int(self.map.get_exit_distances()[y, x])
+        return None if distance < 0 else distance
+
+    def get_direction_to_exit(self, player_index: int = 0) -> Direction | None:
+        """
+        :param player_index: Which player to guide, defaults to 0
+        :return: Move that takes a player one step closer to the nearest exit, or None if it's on one or can't reach one
+        """
+        distance = self.distance_to_exit(Direction.HALT, player_index)
+        if not distance:
+            return None
+        for direction in (
+            Direction.LEFT,
+            Direction.RIGHT,
+            Direction.UP,
+            Direction.DOWN,
+        ):
+            if self.distance_to_exit(direction, player_index) == distance - 1:
+                return direction
+        return None
+
+    def run(self) -> None:
+        """
+        Step ticks back to back until the game is won or lost, the script ends,
+        or `max_ticks` is reached.
+        """
+        try:
+            while self.state == GameState.GAMEPLAY and self.is_control_alive:
+                if self.max_ticks is not None and self.tick_count >= self.max_ticks:
+                    break
+                if (
+                    self._exit_on_tick is not None
+                    and self.tick_count >= self._exit_on_tick
+                ):
+                    break
+                self.tick()
+        finally:
+            self.teardown()
+
+    def tick(self) -> None:
+        self.tick_count += 1
+        self.moving_tiles = []
+
+        move = (0, 0)
+        if self.is_control_alive:
+            self.control.wait_for_turn()
+            if self.next_moves:
+                move = self.next_moves[0][2:]
+            for pos_x, pos_y, dx, dy in self.next_moves:
+                if self.try_move_tile(pos_x, pos_y, dx, dy):
+                    self.control.player_positions.append((pos_x + dx, pos_y + dy))
+                else:
+                    self.control.player_positions.append((pos_x, pos_y))
+            self.next_moves = []
+
+        draws: list[bool] = []
+        for enemy in self.enemies:
+            if is_random_enemy(enemy):
+                is_moving = self.control.is_enemy_moving(enemy)
+                draws.append(is_moving)
+            else:
+                is_moving = enemy.chance_to_move >= 1
+            if not is_moving:
+                continue
+            if not enemy.path:
+                continue
+            if enemy.path[enemy.index] != Direction.HALT:
+                self.try_move_tile(
+                    enemy.pos[0],
+                    enemy.pos[1],
+                    enemy.path[enemy.index].value[0],
+                    enemy.path[enemy.index].value[1],
+                )
+            enemy.index = (enemy.index + 1) % len(enemy.path)
+        self.move_log.append(move, draws)
+        if self.trace_recorder is not None:
+            self.trace_recorder.record_tick()
+
+    def game_over(self, reason: str, tips: str) -> None:
+        self.state = GameState.GAME_OVER
+        self.game_over_reason = reason
+        self.game_over_tips = tips
+
+    def game_won(self) -> None:
+        self.state = GameState.VICTORY
+
+    def try_move_tile(self, x: int, y: int, dx: int, dy: int) -> bool:
+        """
+        Try to move a tile, can fail
+
+        :param x: Original Tile's x
+        :param y: Original Tile's y
+        :param dx: Target Tile's x
+        :param dy: Target TIle's y
+        :return: Whether it was successful
+        """
+        assert dx != 0 or dy != 0
+        if y + dy >= self.map.height:
+            return False
+        if x + dx >= self.map.width:
+            return False
+        if y + dy < 0:
+            return False
+        if x + dx < 0:
+            return False
+        target = self.map.get_tile(x + dx, y + dy)
+        if target is not None and not isinstance(target, TouchableTile):
+            return False
+        tile = self.map.get_tile(x, y)
+        if tile is None:
+            return False
+        tile.old_pos = tile.pos
+        tile.pos = (x + dx, y + dy)
+        self.map.set_tile(x + dx, y + dy, tile)
+        self.map.set_tile(x, y, tile.tile_under)
+        if tile.tile_under is not None:
+            tile.drop()
+        tile.tile_under = None
+        self.moving_tiles.append(tile)
+
+        if isinstance(target, TouchableTile):
+            tile.tile_under = target
+            target.interacted_with(tile, self)
+        return True
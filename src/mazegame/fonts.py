@@ -0,0 +1,60 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .images import get_assets_dir
+
+if TYPE_CHECKING:
+    import pygame
+
+FONT_FILE = "font.ttf"
+
+
+def get_font_path() -> Path | None:
+    """
+    Path of the bundled font
+
+    :return: The font in the packaged assets, or None to use pygame's own default font
+    """
+    path = Path(str(get_assets_dir() / FONT_FILE))
+    return path if path.is_file() else None
+
+
+class Fonts:
+    def __init__(self) -> None:
+        self.fonts: dict[tuple[Path | None, int, bool], "pygame.font.Font"] = {}
+        """Loaded fonts by (path, size, bold)"""
+        self.path: Path | None = None
+        self.is_path_resolved = False
+
+    def get(self, size: int, bold: bool = False) -> "pygame.font.Font":
+        """
+        Get the bundled font, loaded once per size, without scanning the system fonts
+
+        :param size: Font size in pixel
+        :param bold: Render in bold, defaults to False
+        """
+        import pygame
+
+        if not pygame.font.get_init():
+            # Fonts from a previous pygame session can't be used anymore
+            self.clear()
+            pygame.font.init()
+        if not self.is_path_resolved:
+            self.path = get_font_path()
+            self.is_path_resolved = True
+        key = (self.path, size, bold)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(self.path, size)
+            font.set_bold(bold)
+            self.fonts[key] = font
+        return font
+
+    def clear(self) -> None:
+        """
+        Forget every loaded font, call it before `pygame.quit`
+        """
+        self.fonts.clear()
+
+
+fonts = Fonts()
@@ -1,28 +1,26 @@
-from dataclasses import dataclass
-from enum import Enum, auto
-from pathlib import Path
-import random
+from dataclasses import dataclass, field
 import sys
 import threading
 from typing import Any
 import pygame
 import numpy as np
-from scipy.ndimage import gaussian_filter
 
+from .background import Background
+from .clock import VirtualClock
 from .color import Color
 from .direction import Direction
+from .engine import Engine, GameState
+from .fonts import fonts
 from .map import (
     HasColor,
-    Enemy,
     Map,
-    Player,
     SurfsType,
     Tile,
-    TouchableTile,
     images,
     pos_to_pixel,
 )
-from .control import Control
+from .session import quit_pygame
+from .solver import Solver
 
 
 def apply_blur(surface: pygame.Surface, radius: float) -> pygame.Surface:
@@ -33,15 +31,43 @@ def apply_blur(surface: pygame.Surface, radius: float) -> pygame.Surface:
     :param radius: How blurly it should be, defaults to 1
     :return: Blured surface
     """
+    from scipy.ndimage import gaussian_filter
+
     surf_array = pygame.surfarray.array3d(surface)
     blurred = gaussian_filter(surf_array, sigma=(radius, radius, 0))
     return pygame.surfarray.make_surface(blurred.astype(np.uint8))
 
 
-class GameState(Enum):
-    GAMEPLAY = auto()
-    GAME_OVER = auto()
-    VICTORY = auto()
+def precompute_blur(
+    surface: pygame.Surface, max_radius: float, levels: int, downscale: int = 2
+) -> list[pygame.Surface]:
+    """
+    Blur a surface at evenly spaced radii from 0 to max_radius.
+    Each level is blurred at a reduced resolution then scaled back up.
+
+    :param surface: Original surface
+    :param max_radius: How blurly the last level should be
+    :param levels: Number of levels, including the unblurred one
+    :param downscale: How many times smaller the blurred surfaces are, defaults to 2
+    :return: Surfaces from the sharpest to the blurriest
+    """
+    from scipy.ndimage import gaussian_filter
+
+    size = surface.get_size()
+    small_size = (max(size[0] // downscale, 1), max(size[1] // downscale, 1))
+    small_array = pygame.surfarray.array3d(
+        pygame.transform.smoothscale(surface, small_size)
+    )
+    surfaces = [surface.copy()]
+    for level in range(1, levels):
+        radius = max_radius * level / (levels - 1) / downscale
+        blurred = gaussian_filter(small_array, sigma=(radius, radius, 0))
+        surfaces.append(
+            pygame.transform.smoothscale(
+                pygame.surfarray.make_surface(blurred.astype(np.uint8)), size
+            )
+        )
+    return surfaces
 
 
 @dataclass
@@ -51,6 +77,8 @@ class GameOverData:
     heading_surface: pygame.Surface
     subheading_surface: pygame.Surface
     tips_surface: pygame.Surface
+    blurred_frames: list[pygame.Surface] = field(default_factory=list)
+    """`last_frame` from unblurred to fully blurred"""
 
 
 @dataclass
@@ -62,14 +90,12 @@ class VictoryData:
 
 @dataclass
 class GameFont:
-    PATH = Path(__file__).parent / "font.ttf"
     heading: pygame.font.Font
     subheading: pygame.font.Font
     tips: pygame.font.Font
 
 
-class Game:
-    clock = pygame.time.Clock()
+class Game(Engine):
     DEFAULT_WIDTH = 1280
     DEFAULT_HEIGHT = 720
     MAX_FPS = 120
@@ -77,33 +103,40 @@ class Game:
     """Millisecond per tick"""
     TITLE = "Maze Game"
     BG_COLOR = pygame.Color(40, 40, 40)
-    game_event = threading.Event()
-    next_moves: list[tuple[int, int, int, int]] = []
-    """Moves set by Control (pos_x, pos_y, dx, dy)"""
-    is_control_alive = True
-    _exit_on_tick: int | None = None
-
-    def __init__(self, map: Map) -> None:
+    GAME_OVER_TRANSITION_MS = 500
+    GAME_OVER_BLUR_RADIUS = 4
+    GAME_OVER_BLUR_LEVELS = 6
+    """Number of precomputed blur levels for the game over transition"""
+    GAME_OVER_BLUR_DOWNSCALE = 8
+    """How many times smaller the blur levels are computed, they're scaled back up when drawn"""
+    DIRTY_RECT_RENDER = True
+    """Only redraw the cells that changed or are animating instead of the whole map every frame"""
+    PAR_MAX_STATES = 5_000
+    """Give up on finding the par of the map past this many states, the search runs next to the game.
+    Every built-in map that can be won is solved in less than 1000."""
+
+    def __init__(
+        self,
+        map: Map,
+        clock: pygame.time.Clock | VirtualClock | None = None,
+        seed: int | None = None,
+    ) -> None:
+        """
+        :param map: Map to play
+        :param clock: Frame clock, defaults to pygame's clock that holds MAX_FPS
+        :param seed: Seed of the game's random generator, defaults to a random one
+        """
         self.surfs: SurfsType = {}
-        self.state = GameState.GAMEPLAY
+        self.clock = pygame.time.Clock() if clock is None else clock
         self.game_over_data: GameOverData | None = None
         self.victory_data: VictoryData | None = None
-        self.control = Control(map, self)
-        self.enemies = map.get_tiles(Enemy)
-        self.players = map.get_tiles(Player)
-        for i, player in enumerate(self.players):
-            player.index = i
         pygame.display.init()
         pygame.font.init()
         self.fonts = GameFont(
-            heading=pygame.font.SysFont("Times New Roman", 40, bold=True),
-            subheading=pygame.font.SysFont("Times New Roman", 20),
-            tips=pygame.font.SysFont("Times New Roman", 10),
-            # heading=pygame.font.Font(GameFont.PATH, 20),
-            # subheading=pygame.font.Font(GameFont.PATH, 20),
-            # tips=pygame.font.Font(GameFont.PATH, 20),
+            heading=fonts.get(40, bold=True),
+            subheading=fonts.get(20),
+            tips=fonts.get(10),
         )
-        self.game_event.set()
         self.map = map
         self.tile_size, self.screen_width, self.screen_height = self._get_tile_size()
         self.display_surface = pygame.display.set_mode(
@@ -112,34 +145,31 @@ class Game:
         pygame.display.set_caption(self.TITLE)
         self.delta_ms = 0.0
         self.tick_delta_ms = 0.0
+        self._is_slow_frame = False
+        """This frame did one-off work like precomputing the blur, its time isn't counted"""
         self.floor_surface = pygame.transform.scale(
             images.get_surface("None"), (self.tile_size, self.tile_size)
         )
-        self.moving_tiles: list[Tile] = []
-        self.tick_count = 0
-        """Time delta in milisecond"""
-        for y, row in enumerate(self.map.map):
-            for x, tile in enumerate(row):
-                if tile is None:
-                    continue
-
-                tile.init((x, y), self.tile_size, self.surfs)
-                if tile.tile_under is not None:
-                    tile.tile_under.init((x, y), self.tile_size, self.surfs)
-                    tile.tile_under.rect.topleft = tile.tile_under.get_top_left((x, y))
-                tile.rect.topleft = tile.get_top_left((x, y))
-                if tile._auto_remove:
-                    self.map.map[y][x] = tile.tile_under
-
-    def fill_floor(self) -> None:
-        for y in range(self.map.height):
-            for x in range(self.map.width):
-                self.display_surface.blit(
-                    self.floor_surface,
-                    self.floor_surface.get_rect(
-                        topleft=pos_to_pixel(self.tile_size, (x, y))
-                    ),
-                )
+        self.is_full_redraw = True
+        """Redraw the whole map on the next frame"""
+        self.is_animating = False
+        self._dirty_cells: set[tuple[int, int]] = set()
+        super().__init__(map, seed)
+        self.background = Background(self.map, self.tile_size, self.floor_surface)
+        self.map.pop_changed_cells()
+        self.is_par_shown = False
+        """Search for the fewest moves to win while the game plays and show them on victory, `run()` turns it on"""
+        self.par: int | None = None
+        """Fewest moves to win the map, once the search found it"""
+        self._par_thread: threading.Thread | None = None
+        self._par_stop_event = threading.Event()
+
+    def _init_tile(self, tile: Tile, pos: tuple[int, int]) -> None:
+        tile.init(pos, self.tile_size, self.surfs)
+        if tile.tile_under is not None:
+            tile.tile_under.init(pos, self.tile_size, self.surfs)
+            tile.tile_under.rect.topleft = tile.tile_under.get_top_left(pos)
+        tile.rect.topleft = tile.get_top_left(pos)
 
     def _get_tile_size(self) -> tuple[int, int, int]:
         """
@@ -155,98 +185,126 @@ class Game:
         return tile_size, screen_width, screen_height
 
     def teardown(self) -> None:
-        pygame.quit()
-        self.control.kill()
-
-    def _get_tile(self, x: int, y: int) -> Tile | None:
-        if x < 0 or x >= self.map.width:
-            return None
-        if y < 0 or y >= self.map.height:
-            return None
-        return self.map.map[y][x]
-
-    def get_tile(self, direction: Direction, player_index: int = 0) -> Tile | None:
-        player = self.players[player_index]
-        if direction == Direction.HALT:
-            return player.tile_under
-        return self._get_tile(
-            player.pos[0] + direction.value[0], player.pos[1] + direction.value[1]
-        )
+        self._par_stop_event.set()
+        quit_pygame()
+        super().teardown()
 
     def run(self) -> None:
         """
         Starts game loop
         """
+        if self.is_par_shown:
+            self._start_par_search()
         while True:
             if self.update():
                 break
 
+    def _start_par_search(self) -> None:
+        """
+        Solve the map on another thread while it's played, so the victory screen never waits for it
+        """
+        try:
+            # Read the map before the first tick, the search only works on its own states
+            solver = Solver(self.map)
+        except ValueError:
+            return
+        self._par_thread = threading.Thread(
+            target=self._find_par, args=(solver,), daemon=True
+        )
+        self._par_thread.start()
+
+    def _find_par(self, solver: Solver) -> None:
+        self.par = solver.get_par(self.PAR_MAX_STATES, self._par_stop_event)
+
     def tick(self) -> None:
-        self.tick_count += 1
         for tile in self.moving_tiles:
             tile.animate(1)
-        self.moving_tiles = []
-
-        if self.is_control_alive:
-            self.game_event.clear()
-            self.control.control_event.set()
-            self.game_event.wait()
-            for pos_x, pos_y, dx, dy in self.next_moves:
-                if self.try_move_tile(pos_x, pos_y, dx, dy):
-                    self.control.player_positions.append((pos_x + dx, pos_y + dy))
-                else:
-                    self.control.player_positions.append((pos_x, pos_y))
-            self.next_moves = []
-
-        for enemy in self.enemies:
-            if random.random() >= enemy.chance_to_move:
+        super().tick()
+
+    def _mark_moving_tiles_dirty(self) -> None:
+        for tile in self.moving_tiles:
+            self._dirty_cells.add(tile.old_pos)
+            self._dirty_cells.add(tile.pos)
+
+    def _draw_entities(self, cells: set[tuple[int, int]] | None = None) -> None:
+        """
+        Draw players and enemies on top of the background, moving ones last
+
+        :param cells: Only draw still entities on these cells, defaults to every cell
+        """
+        for tile in self.players + self.enemies:
+            if any(tile is _tile for _tile in self.moving_tiles):
                 continue
-            if not enemy.path:
+            if cells is not None and tile.pos not in cells:
                 continue
-            if enemy.path[enemy.index] != Direction.HALT:
-                self.try_move_tile(
-                    enemy.pos[0],
-                    enemy.pos[1],
-                    enemy.path[enemy.index].value[0],
-                    enemy.path[enemy.index].value[1],
-                )
-            enemy.index = (enemy.index + 1) % len(enemy.path)
-
-    def _update_gameplay(self) -> None:
-        # self.display_surface.fill(self.BG_COLOR)
-        self.fill_floor()
-
-        if self.tick_delta_ms > self.MSPT:
+            self.display_surface.blit(tile.surf, tile.rect)
+        for tile in self.moving_tiles:
+            self.display_surface.blit(tile.surf, tile.rect)
+
+    def _draw_map(self) -> None:
+        self.display_surface.blit(self.background.surface, (0, 0))
+        self._draw_entities()
+
+    def _draw_dirty_cells(self) -> list[pygame.Rect]:
+        """
+        Redraw only the dirty cells from the background, then the entities on top of them
+
+        :return: Screen areas that were redrawn
+        """
+        rects: list[pygame.Rect] = []
+        for pos in self._dirty_cells:
+            rect = pygame.Rect(
+                pos_to_pixel(self.tile_size, pos), (self.tile_size, self.tile_size)
+            )
+            self.display_surface.blit(self.background.surface, rect, rect)
+            rects.append(rect)
+        if rects:
+            self._draw_entities(self._dirty_cells)
+        return rects
+
+    def _update_gameplay(self) -> list[pygame.Rect] | None:
+        """
+        :return: Screen areas that were redrawn, or None if it's the whole screen
+        """
+        # A slow frame or a virtual clock can be due several ticks at once
+        while self.tick_delta_ms >= self.MSPT and self.state == GameState.GAMEPLAY:
+            if self._exit_on_tick is not None and self.tick_count >= self._exit_on_tick:
+                break
             self.tick_delta_ms -= self.MSPT
+            # Previous moving tiles snap to their destination in `tick`
+            self._mark_moving_tiles_dirty()
             self.tick()
+            self.is_animating = True
 
         t = min(self.tick_delta_ms / self.MSPT, 1)
         for tile in self.moving_tiles:
             tile.animate(t)
-        for row in self.map.map:
-            for tile in row:
-                if tile is None:
-                    continue
-                if any(tile is _tile for _tile in self.moving_tiles):
-                    continue
-                assert hasattr(tile, "surf")
-                assert hasattr(tile, "rect")
-                if tile.tile_under is not None:
-                    self.display_surface.blit(
-                        tile.tile_under.surf, tile.tile_under.rect
-                    )
-
-                self.display_surface.blit(tile.surf, tile.rect)
-
-        for tile in self.moving_tiles:
-            if tile.tile_under is not None:
-                self.display_surface.blit(tile.tile_under.surf, tile.tile_under.rect)
-            self.display_surface.blit(tile.surf, tile.rect)
+        if self.is_animating:
+            self._mark_moving_tiles_dirty()
+            self.is_animating = t < 1
+        for pos in self.map.pop_changed_cells():
+            self.background.redraw_cell(pos)
+            self._dirty_cells.add(pos)
+
+        rects: list[pygame.Rect] | None = None
+        if self.DIRTY_RECT_RENDER and not self.is_full_redraw:
+            rects = self._draw_dirty_cells()
+        else:
+            self._draw_map()
+        self.is_full_redraw = False
+        self._dirty_cells.clear()
 
         if self.state == GameState.GAME_OVER:
             assert self.game_over_data is not None
             self.game_over_data.last_frame = self.display_surface.copy()
-            self.tick_delta_ms = 0
+            self.game_over_data.blurred_frames = precompute_blur(
+                self.game_over_data.last_frame,
+                self.GAME_OVER_BLUR_RADIUS,
+                self.GAME_OVER_BLUR_LEVELS,
+                self.GAME_OVER_BLUR_DOWNSCALE,
+            )
+            self._is_slow_frame = True
+        return rects
 
     def _update_gameover(self) -> None:
         if self._exit_on_tick is not None:
@@ -254,12 +312,12 @@ class Game:
                 "_exit_on_tick is set but the game is over (lost) before that."
             )
         assert self.game_over_data is not None
-        assert self.game_over_data.last_frame is not None
-        TRANSITION_MS = 500
-        t = min(self.tick_delta_ms / TRANSITION_MS, 1)
+        assert self.game_over_data.blurred_frames
+        t = min(self.tick_delta_ms / self.GAME_OVER_TRANSITION_MS, 1)
         t_darken = 1 - (1 - t) ** 4
+        blurred_frames = self.game_over_data.blurred_frames
         self.display_surface.blit(
-            apply_blur(self.game_over_data.last_frame, t * 4), (0, 0)
+            blurred_frames[round(t * (len(blurred_frames) - 1))], (0, 0)
         )
         self.game_over_data.dark_overlay.fill((0, 0, 0, int(200 * t_darken)))
         self.display_surface.blit(self.game_over_data.dark_overlay, (0, 0))
@@ -311,7 +369,7 @@ class Game:
         )
 
     def game_over(self, reason: str, tips: str) -> None:
-        self.state = GameState.GAME_OVER
+        super().game_over(reason, tips)
         self.game_over_data = GameOverData(
             None,
             pygame.Surface(self.display_surface.get_size(), pygame.SRCALPHA),
@@ -322,15 +380,18 @@ class Game:
         self.tick_delta_ms = 0
 
     def game_won(self) -> None:
-        self.state = GameState.VICTORY
-        victory_msg = random.choice(
+        super().game_won()
+        victory_msg = self.rng.choice(
             ["Congrats!", "Wasn't expecting that.", "You actually lived!", "GG"]
         )
+        # Left out if the search hasn't finished yet
+        par = self.par
         self.victory_data = VictoryData(
             self.fonts.heading.render("Victory!", True, (100, 200, 100)),
             self.fonts.subheading.render(victory_msg, True, (200, 200, 200)),
             self.fonts.subheading.render(
-                f"You completed the map in {self.tick_count} move{"s" if self.tick_count != 1 else ""}.",
+                f"You completed the map in {self.tick_count} move{"s" if self.tick_count != 1 else ""}"
+                + ("." if par is None else f" (par {par})."),
                 True,
                 (200, 200, 200),
             ),
@@ -347,60 +408,32 @@ class Game:
             if event.type == pygame.QUIT:
                 self.teardown()
                 return True
+            if event.type == pygame.WINDOWEXPOSED:
+                self.is_full_redraw = True
 
+        rects: list[pygame.Rect] | None = None
         match self.state:
             case GameState.GAMEPLAY:
-                self._update_gameplay()
+                rects = self._update_gameplay()
             case GameState.GAME_OVER:
                 self._update_gameover()
             case GameState.VICTORY:
                 self._update_victory()
-        pygame.display.update()
+        if rects is None:
+            pygame.display.update()
+        elif rects:
+            pygame.display.update(rects)
         self.time_delta = self.clock.tick(self.MAX_FPS)
-        self.tick_delta_ms += self.time_delta
+        if self._is_slow_frame:
+            # Start the transition from the next frame, not from before the slow work
+            self.tick_delta_ms = 0
+            self._is_slow_frame = False
+        else:
+            self.tick_delta_ms += self.time_delta
         if self._exit_on_tick is not None and self.tick_count >= self._exit_on_tick:
             self.teardown()
             return True
         return False
 
-    def try_move_tile(self, x: int, y: int, dx: int, dy: int) -> bool:
-        """
-        Try to move a tile, can fail
-
-        :param x: Original Tile's x
-        :param y: Original Tile's y
-        :param dx: Target Tile's x
-        :param dy: Target TIle's y
-        :return: Whether it was successful
-        """
-        assert dx != 0 or dy != 0
-        if y + dy >= self.map.height:
-            return False
-        if x + dx >= self.map.width:
-            return False
-        if y + dy < 0:
-            return False
-        if x + dx < 0:
-            return False
-        target = self.map.map[y + dy][x + dx]
-        if target is not None and not isinstance(target, TouchableTile):
-            return False
-        tile = self.map.map[y][x]
-        if tile is None:
-            return False
-        tile.old_pos = tile.pos
-        tile.pos = (x + dx, y + dy)
-        self.map.map[y + dy][x + dx] = tile
-        self.map.map[y][x] = tile.tile_under
-        if tile.tile_under is not None:
-            tile.drop()
-        tile.tile_under = None
-        self.moving_tiles.append(tile)
-
-        if isinstance(target, TouchableTile):
-            tile.tile_under = target
-            target.interacted_with(tile, self)
-        return True
-
     def render_map(self) -> None:
         pass
@@ -0,0 +1,404 @@
+from argparse import ArgumentParser
+from collections import deque
+import csv
+from dataclasses import asdict, dataclass, fields
+import importlib.util
+import inspect
+import multiprocessing
+from multiprocessing.connection import Connection, wait
+import os
+from pathlib import Path
+import sys
+import time
+from typing import Iterable, cast
+
+from .engine import GameState
+from .images import get_cache_dir
+from .map import Map, SeededMapType
+from .api import maps
+from .api.run import ScriptType, _is_loading_script, simulate
+from .result_cache import CachedResult, ResultCache, get_run_key
+from .solver import get_map_par
+
+DEFAULT_MAX_TICKS = 1000
+DEFAULT_TURN_TIMEOUT = 5.0
+DEFAULT_RUN_TIMEOUT = 60.0
+DEFAULT_SEED = 0
+_UNCACHED_OUTCOMES = ("timeout", "error")
+"""Outcomes that can depend on the machine (slow scripts, missing imports) rather than the script"""
+
+
+@dataclass
+class GradeResult:
+    script: str
+    map: str
+    variant: int
+    seed: int
+    outcome: str
+    """victory, game_over, incomplete, timeout or error"""
+    reason: str
+    tick_count: int
+    par: int | None = None
+    """Fewest ticks to win the map variant, None if it can't be solved exactly"""
+
+
+def get_result_cache_dir() -> Path | None:
+    """
+    Directory of the grader's result cache, next to the sprite cache. None if caching is disabled.
+    """
+    cache_dir = get_cache_dir()
+    return None if cache_dir is None else cache_dir / "results"
+
+
+def get_map_names() -> list[str]:
+    """
+    Names of every registered map factory (TUTORIAL1 ... NIGHTMARE2)
+    """
+    return sorted(maps.__all__)
+
+
+def load_script(path: Path, function_name: str = "script") -> ScriptType:
+    """
+    Import a student's script file and return its script function.
+    The file's own `run(...)` / `preview(...)` calls are skipped while importing.
+
+    :param path: Path to the script file
+    :param function_name: Name of the script function, defaults to "script"
+    :return: script function
+    """
+    spec = importlib.util.spec_from_file_location(f"_graded_{path.stem}", path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot import script from '{path}'.")
+    module = importlib.util.module_from_spec(spec)
+    token = _is_loading_script.set(True)
+    try:
+        spec.loader.exec_module(module)
+    finally:
+        _is_loading_script.reset(token)
+    script = getattr(module, function_name, None)
+    if not callable(script):
+        raise AttributeError(f"'{path}' has no '{function_name}' function.")
+    return cast(ScriptType, script)
+
+
+def grade(
+    script_path: Path,
+    map_name: str,
+    variant: int,
+    *,
+    function_name: str = "script",
+    max_ticks: int | None = DEFAULT_MAX_TICKS,
+    turn_timeout: float | None = DEFAULT_TURN_TIMEOUT,
+    seed: int = DEFAULT_SEED,
+    cache: ResultCache | None = None,
+) -> GradeResult:
+    """
+    Run one script against one map variant headlessly.
+    A timed out script that never calls the API again can't be stopped, its thread keeps running until the process exits.
+    `turn_timeout` doesn't cover generator scripts either, they run on this thread: use `grade_all` to kill such runs.
+
+    :param script_path: Path to the script file
+    :param map_name: Name of the map factory in `mazegame.api.maps`
+    :param variant: Index of the map variant
+    :param function_name: Name of the script function, defaults to "script"
+    :param max_ticks: Stop after this many ticks, defaults to DEFAULT_MAX_TICKS
+    :param turn_timeout: Seconds to wait for each move, defaults to DEFAULT_TURN_TIMEOUT
+    :param seed: Seed for the map and the game's random draws, defaults to DEFAULT_SEED
+    :param cache: Return the result of an earlier run of the same script source, map and seed from here,
+        and store this one, defaults to always running
+    :return: Outcome of the run
+    """
+    result = GradeResult(str(script_path), map_name, variant, seed, "error", "", 0)
+    key: str | None = None
+    try:
+        map_factory: SeededMapType = getattr(maps, map_name)
+        map = map_factory(seed)[0][variant]
+        if cache is not None:
+            key = get_run_key(
+                script_path.read_bytes(),
+                map.fingerprint(),
+                seed,
+                function_name,
+                max_ticks,
+            )
+            cached = cache.get(key)
+            if cached is not None:
+                result.outcome = cached.outcome
+                result.reason = cached.reason
+                result.tick_count = cached.tick_count
+                result.par = cached.par
+                return result
+        # Only solved on a miss, a cached result has nothing left to compute
+        result.par = get_map_par(map)
+        script = load_script(script_path, function_name)
+        game = simulate(
+            script, map, max_ticks=max_ticks, turn_timeout=turn_timeout, seed=seed
+        )
+    except TimeoutError as error:
+        result.outcome = "timeout"
+        result.reason = str(error)
+        return result
+    except Exception as error:
+        result.reason = f"{type(error).__name__}: {error}"
+        return result
+
+    result.tick_count = game.tick_count
+    match game.state:
+        case GameState.VICTORY:
+            result.outcome = "victory"
+        case GameState.GAME_OVER:
+            result.outcome = "game_over"
+            result.reason = game.game_over_reason or ""
+        case GameState.GAMEPLAY:
+            result.outcome = "incomplete"
+            if game.control.error is not None:
+                result.outcome = "error"
+                error = game.control.error
+                result.reason = f"{type(error).__name__}: {error}"
+    if key is not None and result.outcome not in _UNCACHED_OUTCOMES:
+        assert cache is not None
+        cache.put(
+            key,
+            CachedResult(result.outcome, result.reason, result.tick_count, result.par),
+        )
+    return result
+
+
+def _init_worker() -> None:
+    """
+    Set up a worker process before it receives any run: the engine is already imported with this module,
+    the maps are imported here
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    for map_name in maps.__all__:
+        getattr(maps, map_name)
+
+
+def _work(connection: Connection) -> None:
+    """
+    Grade the runs sent by `grade_all` one by one until the connection is closed (worker side)
+
+    :param connection: Receives `grade` arguments as (args, kwargs), sends back None as each run starts,
+        then its `GradeResult`
+    """
+    _init_worker()
+    while True:
+        try:
+            args, kwargs = connection.recv()
+        except EOFError:
+            return
+        connection.send(None)
+        connection.send(grade(*args, **kwargs))
+
+
+class _Worker:
+    """
+    Worker process of `grade_all`, it grades one run at a time and can be killed in the middle of one
+    """
+
+    def __init__(self, context: multiprocessing.context.BaseContext) -> None:
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(  # type: ignore
+            target=_work, args=(child_connection,), daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+        self.run: tuple[Path, str, int] | None = None
+        """Run being graded, None if the worker is idle"""
+        self.run_timeout: float | None = None
+        self.deadline: float | None = None
+        """When the run times out, set once it starts so the worker's own start-up isn't counted"""
+        self.is_stale = False
+        """Whether the last run may have left something running, the worker should be replaced"""
+
+    def submit(
+        self, run: tuple[Path, str, int], kwargs: dict, run_timeout: float | None
+    ) -> None:
+        self.run = run
+        self.run_timeout = run_timeout
+        self.deadline = None
+        self.connection.send((run, kwargs))
+
+    def poll(self, seed: int) -> GradeResult | None:
+        """
+        :param seed: Seed of the run, for the result of a run that never finished
+        :return: Result of the run if it's over, None if it's still going
+        """
+        assert self.run is not None
+        script_path, map_name, variant = self.run
+        result = GradeResult(str(script_path), map_name, variant, seed, "error", "", 0)
+        try:
+            while self.connection.poll():
+                message = self.connection.recv()
+                if message is not None:
+                    result = message
+                    # The script's thread may still be running, don't let it slow down the next runs
+                    self.is_stale = result.outcome == "timeout"
+                    break
+                if self.run_timeout is not None:
+                    self.deadline = time.monotonic() + self.run_timeout
+            else:
+                if self.deadline is None or time.monotonic() < self.deadline:
+                    return None
+                result.outcome = "timeout"
+                result.reason = f"The run took longer than {self.run_timeout} seconds."
+                self.is_stale = True
+        except (EOFError, OSError):
+            result.reason = "The worker process exited during the run."
+            self.is_stale = True
+        self.run = None
+        return result
+
+    def stop(self) -> None:
+        self.connection.close()
+        self.process.kill()
+        self.process.join()
+
+
+def grade_all(
+    script_paths: Iterable[Path],
+    map_names: Iterable[str],
+    *,
+    workers: int | None = None,
+    function_name: str = "script",
+    max_ticks: int | None = DEFAULT_MAX_TICKS,
+    turn_timeout: float | None = DEFAULT_TURN_TIMEOUT,
+    run_timeout: float | None = DEFAULT_RUN_TIMEOUT,
+    seed: int = DEFAULT_SEED,
+    cache: ResultCache | None = None,
+) -> list[GradeResult]:
+    """
+    Grade every script against every variant of every map on pre-initialised worker processes.
+    A worker is replaced after a run that timed out, since the script may still be running in it.
+
+    :param script_paths: Script files
+    :param map_names: Names of map factories in `mazegame.api.maps`
+    :param workers: Number of worker processes, defaults to one per core
+    :param run_timeout: Seconds a whole run can take before its worker is killed, defaults to DEFAULT_RUN_TIMEOUT.
+        Unlike `turn_timeout`, it also stops generator scripts that loop without yielding.
+    :param seed: Seed of every run, the same seed gives the same results, defaults to DEFAULT_SEED
+    :param cache: Result cache shared by the workers, evicted once every run is done, defaults to no cache
+    :return: Results sorted by script, map and variant
+    """
+    runs = deque(
+        (script_path, map_name, variant)
+        for map_name in map_names
+        for variant in range(len(getattr(maps, map_name)(seed)[0]))
+        for script_path in script_paths
+    )
+    kwargs = dict(
+        function_name=function_name,
+        max_ticks=max_ticks,
+        turn_timeout=turn_timeout,
+        seed=seed,
+        cache=cache,
+    )
+    context = multiprocessing.get_context("forkserver")
+    pool = [
+        _Worker(context) for _ in range(min(workers or os.cpu_count() or 1, len(runs)))
+    ]
+    results: list[GradeResult] = []
+    try:
+        for worker in pool:
+            worker.submit(runs.popleft(), kwargs, run_timeout)
+        while busy := [worker for worker in pool if worker.run is not None]:
+            deadlines = [
+                worker.deadline for worker in busy if worker.deadline is not None
+            ]
+            wait(
+                [worker.connection for worker in busy],
+                max(0.0, min(deadlines) - time.monotonic()) if deadlines else None,
+            )
+            for worker in busy:
+                result = worker.poll(seed)
+                if result is None:
+                    continue
+                results.append(result)
+                if worker.is_stale:
+                    worker.stop()
+                    pool.remove(worker)
+                    if not runs:
+                        continue
+                    worker = _Worker(context)
+                    pool.append(worker)
+                if runs:
+                    worker.submit(runs.popleft(), kwargs, run_timeout)
+    finally:
+        for worker in pool:
+            worker.stop()
+    if cache is not None:
+        cache.evict()
+    results.sort(key=lambda result: (result.script, result.map, result.variant))
+    return results
+
+
+def write_results(results: list[GradeResult], path: Path) -> None:
+    """
+    Write results into a CSV file
+
+    :param results: Results from `grade_all`
+    :param path: Output path
+    """
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, [field.name for field in fields(GradeResult)])
+        writer.writeheader()
+        for result in results:
+            writer.writerow(asdict(result))
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Grade a directory of scripts: `python -m mazegame.grader scripts/ -o results.csv`
+    """
+    parser = ArgumentParser(prog="python -m mazegame.grader")
+    parser.add_argument("scripts", type=Path, help="Directory of script files")
+    parser.add_argument(
+        "-m", "--maps", nargs="+", default=None, help="Map names, defaults to all"
+    )
+    parser.add_argument("-o", "--output", type=Path, default=Path("results.csv"))
+    parser.add_argument("-w", "--workers", type=int, default=None)
+    parser.add_argument("-f", "--function", default="script")
+    parser.add_argument("--max-ticks", type=int, default=DEFAULT_MAX_TICKS)
+    parser.add_argument("--turn-timeout", type=float, default=DEFAULT_TURN_TIMEOUT)
+    parser.add_argument("--run-timeout", type=float, default=DEFAULT_RUN_TIMEOUT)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=get_result_cache_dir(),
+        help="Directory of the result cache, defaults to the user's cache directory",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Run every script even if unchanged"
+    )
+    args = parser.parse_args(argv)
+
+    map_names: list[str] = args.maps or get_map_names()
+    for map_name in map_names:
+        if not inspect.isfunction(getattr(maps, map_name, None)):
+            parser.error(f"Unknown map '{map_name}'.")
+    script_paths = sorted(args.scripts.glob("*.py"))
+    results = grade_all(
+        script_paths,
+        map_names,
+        workers=args.workers,
+        function_name=args.function,
+        max_ticks=args.max_ticks,
+        turn_timeout=args.turn_timeout,
+        run_timeout=args.run_timeout,
+        seed=args.seed,
+        cache=(
+            None
+            if args.no_cache or args.cache_dir is None
+            else ResultCache(args.cache_dir)
+        ),
+    )
+    write_results(results, args.output)
+    print(
+        f"Graded {len(results)} runs ({len(script_paths)} scripts x {len(map_names)} maps) into '{args.output}'.",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,267 @@
-import pygame
+from collections import OrderedDict
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable
 
 from .color import Color
 
+if TYPE_CHECKING:
+    from importlib.resources.abc import Traversable
+    import pygame
+
+ATLAS_IMAGE = "atlas.png"
+ATLAS_INDEX = "atlas.json"
+"""Position and size (x, y, width, height) of every sprite in the atlas by name"""
+
+
+def get_assets_dir() -> "Traversable":
+    """
+    Directory of the packaged assets, wherever the package is installed
+    """
+    from importlib import resources
+
+    return resources.files(__package__) / "assets"
+
+
+def get_cache_dir() -> Path | None:
+    """
+    Directory for the on-disk sprite cache: `$MAZEGAME_CACHE_DIR`, or `mazegame` in the user's cache directory.
+    Set `MAZEGAME_CACHE_DIR` to an empty string to disable it.
+    """
+    cache_dir = os.environ.get("MAZEGAME_CACHE_DIR")
+    if cache_dir is not None:
+        return Path(cache_dir) if cache_dir else None
+    xdg_cache_home = os.environ.get("XDG_CACHE_HOME")
+    if xdg_cache_home:
+        return Path(xdg_cache_home) / "mazegame"
+    return Path.home() / ".cache" / "mazegame"
+
+
+class DiskSurfaceCache:
+    """
+    Scaled sprites saved as raw RGBA pixels, named by sprite name, tile size and the hash of what they're made from.
+    Saving a sprite removes its files made from older content, then the least recently used sprites
+    until the files take at most `max_bytes`.
+    """
+
+    DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        :param directory: Directory of the sprites, created on the first write
+        :param max_bytes: Size cap of every sprite together, defaults to DEFAULT_MAX_BYTES
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _get_path(self, name: str, tile_size: int, content_hash: str) -> Path:
+        return self.directory / f"{name}_{tile_size}_{content_hash[:16]}.rgba"
+
+    def load(
+        self, name: str, tile_size: int, content_hash: str
+    ) -> "pygame.Surface | None":
+        """
+        :return: Cached surface, or None if it isn't cached
+        """
+        import pygame
+
+        path = self._get_path(name, tile_size, content_hash)
+        try:
+            pixels = path.read_bytes()
+            # Sprites are evicted by last use
+            os.utime(path)
+        except OSError:
+            return None
+        if len(pixels) != tile_size * tile_size * 4:
+            return None
+        surface = pygame.image.frombytes(pixels, (tile_size, tile_size), "RGBA")
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        return surface
+
+    def save(
+        self, name: str, tile_size: int, content_hash: str, surface: "pygame.Surface"
+    ) -> None:
+        """
+        Write a surface to the cache and evict what it replaces or pushes out,
+        silently giving up if the directory isn't writable
+        """
+        import pygame
+
+        path = self._get_path(name, tile_size, content_hash)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path.write_bytes(pygame.image.tobytes(surface, "RGBA"))
+            os.replace(temp_path, path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+            return
+        for stale_path in self.directory.glob(f"{name}_{tile_size}_*.rgba"):
+            if stale_path != path:
+                stale_path.unlink(missing_ok=True)
+        self.evict()
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used sprites until the cache fits in `max_bytes`
+
+        :return: Number of sprites removed
+        """
+        entries: list[tuple[float, int, Path]] = []
+        try:
+            for path in self.directory.glob("*.rgba"):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except OSError:
+            return 0
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+        return removed
+
+
+class ScaledSurfaceCache:
+    """
+    Sprites scaled to a tile size, the least recently used ones are evicted once the cache holds more than `max_bytes` of pixels
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.surfaces: OrderedDict[tuple[str, int], "pygame.Surface"] = OrderedDict()
+
+    @staticmethod
+    def _get_bytes(surface: "pygame.Surface") -> int:
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def get(self, key: tuple[str, int]) -> "pygame.Surface | None":
+        """
+        :param key: Sprite name and tile size
+        :return: Cached surface, or None
+        """
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+        return surface
+
+    def put(self, key: tuple[str, int], surface: "pygame.Surface") -> None:
+        """
+        :param key: Sprite name and tile size
+        :param surface: Scaled surface
+        """
+        if key in self.surfaces:
+            self.bytes -= self._get_bytes(self.surfaces.pop(key))
+        self.surfaces[key] = surface
+        self.bytes += self._get_bytes(surface)
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.bytes -= self._get_bytes(evicted)
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+        self.bytes = 0
+
 
 class Images:
+    MAX_SCALED_BYTES = 64 * 1024 * 1024
+    """Size cap of the scaled sprites shared by every `Game` and `Preview` in the process"""
+
     def __init__(self) -> None:
-        self.surfaces: dict[str, pygame.Surface] = {}
+        self.surfaces: dict[str, "pygame.Surface"] = {}
+        self.atlas: "pygame.Surface | None" = None
+        self.index: dict[str, tuple[int, int, int, int]] = {}
+        self.scaled_surfaces = ScaledSurfaceCache(self.MAX_SCALED_BYTES)
+        cache_dir = get_cache_dir()
+        self.disk_cache = DiskSurfaceCache(cache_dir) if cache_dir else None
+        self.atlas_hash: str | None = None
+
+    def load_atlas(self) -> None:
+        """
+        Decode the sprite atlas (built by `python -m mazegame.build_atlas`)
+        """
+        import pygame
 
-    def get_surface(self, name: str) -> pygame.Surface:
+        assets_dir = get_assets_dir()
+        self.index = json.loads((assets_dir / ATLAS_INDEX).read_text())
+        with (assets_dir / ATLAS_IMAGE).open("rb") as file:
+            self.atlas = pygame.image.load(file, ATLAS_IMAGE).convert_alpha()
+        self.surfaces.clear()
+        self.scaled_surfaces.clear()
+
+    def get_surface(self, name: str) -> "pygame.Surface":
         if name not in self.surfaces:
-            self.surfaces[name] = pygame.image.load(
-                f"assets/sprite/{name}.png"
-            ).convert_alpha()
+            if self.atlas is None:
+                self.load_atlas()
+            assert self.atlas is not None
+            if name not in self.index:
+                raise KeyError(
+                    f"Sprite '{name}' is not in the atlas, rebuild it with `python -m mazegame.build_atlas`."
+                )
+            self.surfaces[name] = self.atlas.subsurface(self.index[name])
         return self.surfaces[name]
+
+    def get_content_hash(
+        self, draw: Callable[[int], "pygame.Surface"] | None = None
+    ) -> str:
+        """
+        Hash of what a scaled sprite is made from, without decoding anything
+
+        :param draw: Draws the sprite, defaults to the sprite coming from the atlas
+        """
+        if draw is None:
+            if self.atlas_hash is None:
+                digest = hashlib.sha256()
+                assets_dir = get_assets_dir()
+                for name in (ATLAS_INDEX, ATLAS_IMAGE):
+                    digest.update((assets_dir / name).read_bytes())
+                self.atlas_hash = digest.hexdigest()
+            return self.atlas_hash
+        code = draw.__code__
+        source = repr((code.co_consts, [color.value for color in Color]))
+        return hashlib.sha256(code.co_code + source.encode()).hexdigest()
+
+    def get_scaled_surface(
+        self,
+        name: str,
+        tile_size: int,
+        draw: Callable[[int], "pygame.Surface"] | None = None,
+    ) -> "pygame.Surface":
+        """
+        Get a sprite scaled to fit a tile, cached across games
+
+        :param name: Sprite name
+        :param tile_size: Tile size in pixel
+        :param draw: Draws the sprite at a tile size, for sprites without an image, defaults to scaling the image
+        """
+        # Memory first, then the on-disk cache, then decode/draw and scale
+        surface = self.scaled_surfaces.get((name, tile_size))
+        if surface is not None:
+            return surface
+        content_hash = ""
+        if self.disk_cache is not None:
+            content_hash = self.get_content_hash(draw)
+            surface = self.disk_cache.load(name, tile_size, content_hash)
+            if surface is not None:
+                self.scaled_surfaces.put((name, tile_size), surface)
+                return surface
+        if draw is not None:
+            surface = draw(tile_size)
+        else:
+            import pygame
+
+            surface = pygame.transform.scale(
+                self.get_surface(name), (tile_size, tile_size)
+            )
+        if self.disk_cache is not None:
+            self.disk_cache.save(name, tile_size, content_hash, surface)
+        self.scaled_surfaces.put((name, tile_size), surface)
+        return surface
@@ -1,30 +1,32 @@
 from abc import ABC, abstractmethod
-import random
-from typing import TYPE_CHECKING, Any, Callable, Type, TypeVar
-
-
-import pygame
+import hashlib
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Type, TypeVar
 
 
 if TYPE_CHECKING:
-    from .game import Game
+    import numpy as np
+    import pygame
+
+    from .engine import Engine
 
 from .images import Images
 from .direction import Direction
 from .color import Color
 
-SurfsType = dict[type["Tile"] | tuple[type["Tile"], Any], pygame.Surface]
+SurfsType = dict[type["Tile"] | tuple[type["Tile"], Any], "pygame.Surface"]
 
 CustomMapType = Callable[[], tuple[list["Map"], str]]
-
-_BLOCK_EDGE_COLOR = pygame.Color(215, 220, 225)
-_BLOCK_COLOR = pygame.Color(195, 200, 205)
-_ENEMY_COLOR = pygame.Color(220, 20, 60)
-_SPIKE_COLOR = pygame.Color(128, 0, 128)
-_PLAYER_COLOR = pygame.Color(102, 255, 255)
-_EXIT_OUTER_COLOR = pygame.Color(0, 150, 0)
-_EXIT_INNER_COLOR = pygame.Color(102, 255, 102)
-_DOOR_COLOR = pygame.Color(139, 69, 19)
+SeededMapType = Callable[[int | None], tuple[list["Map"], str]]
+"""Map factory that takes a seed, every built-in map builds the same maps for the same seed"""
+
+_BLOCK_EDGE_COLOR = (215, 220, 225)
+_BLOCK_COLOR = (195, 200, 205)
+_ENEMY_COLOR = (220, 20, 60)
+_SPIKE_COLOR = (128, 0, 128)
+_PLAYER_COLOR = (102, 255, 255)
+_EXIT_OUTER_COLOR = (0, 150, 0)
+_EXIT_INNER_COLOR = (102, 255, 102)
+_DOOR_COLOR = (139, 69, 19)
 
 images = Images()
 
@@ -51,10 +53,10 @@ def pos_to_pixel(
     )
 
 
-class Tile(ABC, pygame.sprite.Sprite):
-    surf: pygame.Surface
+class Tile(ABC):
+    surf: "pygame.Surface"
     tile_size = 0
-    rect: pygame.Rect
+    rect: "pygame.Rect"
     pos: tuple[int, int] = (0, 0)
     old_pos: tuple[int, int] = (0, 0)
     tile_under: "Tile | None" = None
@@ -104,6 +106,17 @@ class Tile(ABC, pygame.sprite.Sprite):
     def __str__(self) -> str:
         return f"{self.__class__.__name__} at {self.pos}"
 
+    def get_signature(self) -> tuple:
+        """
+        Everything the rules care about in this tile and the tiles under it, for `Map.fingerprint`
+        """
+        return (
+            type(self).__name__,
+            self.get_color().value if isinstance(self, HasColor) else None,
+            self._auto_remove,
+            None if self.tile_under is None else self.tile_under.get_signature(),
+        )
+
     # def __repr__(self) -> str:
     #     return str(self)
 
@@ -116,7 +129,7 @@ class HasColor:
 
 class TouchableTile(Tile):
     @abstractmethod
-    def interacted_with(self, other_tile: Tile, game: "Game") -> None:
+    def interacted_with(self, other_tile: Tile, game: "Engine") -> None:
         pass
 
 
@@ -140,9 +153,7 @@ class Block(Tile):
             # self.surf.fill(
             #     _BLOCK_EDGE_COLOR, (tile_size * 0.9, 0, tile_size * 0.1, tile_size)
             # )
-            self.surf = pygame.transform.scale(
-                images.get_surface(self.to_image_name()), (tile_size, tile_size)
-            )
+            self.surf = images.get_scaled_surface(self.to_image_name(), tile_size)
             surfs[type(self)] = self.surf
         else:
             self.surf = surfs[type(self)]
@@ -150,7 +161,7 @@ class Block(Tile):
 
 
 class ColoredFloor(TouchableTile, HasColor):
-    surfs: dict[Color, pygame.Surface] = {}
+    surfs: dict[Color, "pygame.Surface"] = {}
 
     def __init__(self, color: Color) -> None:
         self.color = color
@@ -167,15 +178,13 @@ class ColoredFloor(TouchableTile, HasColor):
         if (type(self), self.color) not in surfs:
             # self.surf = pygame.Surface((tile_size, tile_size))
             # self.surf.fill(self.color.value)
-            self.surf = pygame.transform.scale(
-                images.get_surface(self.to_image_name()), (tile_size, tile_size)
-            )
+            self.surf = images.get_scaled_surface(self.to_image_name(), tile_size)
             surfs[type(self), self.color] = self.surf
         else:
             self.surf = surfs[type(self), self.color]
         self.rect = self.surf.get_rect()
 
-    def interacted_with(self, other_tile: Tile, game: "Game") -> None:
+    def interacted_with(self, other_tile: Tile, game: "Engine") -> None:
         pass
 
     def get_color(self) -> Color:
@@ -186,7 +195,7 @@ class ColoredFloor(TouchableTile, HasColor):
 
 
 class ColoredBlock(Tile, HasColor):
-    surfs: dict[Color, pygame.Surface] = {}
+    surfs: dict[Color, "pygame.Surface"] = {}
 
     def __init__(self, color: Color) -> None:
         self.color = color
@@ -211,9 +220,7 @@ class ColoredBlock(Tile, HasColor):
             # self.surf.fill(
             #     _BLOCK_EDGE_COLOR, (tile_size * 0.9, 0, tile_size * 0.1, tile_size)
             # )
-            self.surf = pygame.transform.scale(
-                images.get_surface(self.to_image_name()), (tile_size, tile_size)
-            )
+            self.surf = images.get_scaled_surface(self.to_image_name(), tile_size)
             surfs[type(self), self.color] = self.surf
         else:
             self.surf = surfs[type(self), self.color]
@@ -245,20 +252,18 @@ class Player(TouchableTile):
             #     (tile_size // 2, tile_size // 2),
             #     0.9 * tile_size // 2,
             # )
-            self.surf = pygame.transform.scale(
-                images.get_surface(self.to_image_name()), (tile_size, tile_size)
-            )
+            self.surf = images.get_scaled_surface(self.to_image_name(), tile_size)
             surfs[type(self)] = self.surf
         else:
             self.surf = surfs[type(self)]
         self.rect = self.surf.get_rect()
 
-    def interacted_with(self, other_tile: Tile, game: "Game") -> None:
+    def interacted_with(self, other_tile: Tile, game: "Engine") -> None:
         if not isinstance(other_tile, Enemy):
             return
         game.game_over(
             "Enemy ran into you.",
-            random.choice(
+            game.rng.choice(
                 [
                     "That plan did not go well",
                     "Consider not dying, that's not a great plan",
@@ -274,7 +279,7 @@ _HIDEN_KEY_DO_NO_INSTANCIATE = object()
 
 
 class Door(Tile, HasColor):
-    surfs: dict[Color, pygame.Surface] = {}
+    surfs: dict[Color, "pygame.Surface"] = {}
 
     def __init__(self, color: Color, *, open: bool = False) -> None:
         self.color = color
@@ -306,9 +311,7 @@ class Door(Tile, HasColor):
             #         tile_size * 0.6,
             #     ),
             # )
-            self.surf = pygame.transform.scale(
-                images.get_surface(self.to_image_name()), (tile_size, tile_size)
-            )
+            self.surf = images.get_scaled_surface(self.to_image_name(), tile_size)
             surfs[(type(self), self.color)] = self.surf
         else:
             self.surf = surfs[(type(self), self.color)]
@@ -322,7 +325,7 @@ class Door(Tile, HasColor):
 
 
 class DoorFrame(TouchableTile, HasColor):
-    surfs: dict[Color, pygame.Surface] = {}
+    surfs: dict[Color, "pygame.Surface"] = {}
 
     def __init__(self, door: Door, _hiden_key: object) -> None:
         if _hiden_key is not _HIDEN_KEY_DO_NO_INSTANCIATE:
@@ -361,15 +364,13 @@ class DoorFrame(TouchableTile, HasColor):
             #         tile_size * 0.6,
             #     ),
             # )
-            self.surf = pygame.transform.scale(
-                images.get_surface(self.to_image_name()), (tile_size, tile_size)
-            )
+            self.surf = images.get_scaled_surface(self.to_image_name(), tile_size)
             surfs[type(self), self.color] = self.surf
         else:
             self.surf = surfs[type(self), self.color]
         self.rect = self.surf.get_rect()
 
-    def interacted_with(self, other_tile: Tile, game: "Game") -> None:
+    def interacted_with(self, other_tile: Tile, game: "Engine") -> None:
         pass
 
     def get_color(self) -> Color:
@@ -380,20 +381,17 @@ class DoorFrame(TouchableTile, HasColor):
 
 
 class Key(TouchableTile, HasColor):
-    surfs: dict[Color, pygame.Surface] = {}
+    surfs: dict[Color, "pygame.Surface"] = {}
 
     def __init__(self, color: Color) -> None:
         self.color = color
         super().__init__()
 
-    def interacted_with(self, other_tile: Tile, game: "Game") -> None:
+    def interacted_with(self, other_tile: Tile, game: "Engine") -> None:
         if not isinstance(other_tile, Player):
             return
         other_tile.tile_under = None
-        for y, row in enumerate(game.map.map):
-            for x, tile in enumerate(row):
-                if isinstance(tile, Door) and tile.color == self.color:
-                    game.map.map[y][x] = tile.tile_under
+        game.map.open_doors(self.color)
 
     def init(
         self,
@@ -404,35 +402,45 @@ class Key(TouchableTile, HasColor):
         self.tile_size = tile_size
         self.pos = pos
         if (type(self), self.color) not in surfs:
-            self.surf = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
-            pygame.draw.circle(
-                self.surf,
-                self.color.value,
-                (tile_size // 2, int(0.64 * tile_size)),
-                int(0.06 * tile_size),
+            self.surf = images.get_scaled_surface(
+                self.to_image_name(), tile_size, self.draw
             )
-            points: list[tuple[int, int]] = [
-                (int(0.475 * tile_size), int(0.64 * tile_size)),
-                (int(0.475 * tile_size), int(0.3 * tile_size)),
-                (int(0.525 * tile_size), int(0.3 * tile_size)),
-                (int(0.525 * tile_size), int(0.35 * tile_size)),
-                (int(0.625 * tile_size), int(0.35 * tile_size)),
-                (int(0.625 * tile_size), int(0.4 * tile_size)),
-                (int(0.525 * tile_size), int(0.4 * tile_size)),
-                (int(0.525 * tile_size), int(0.425 * tile_size)),
-                (int(0.625 * tile_size), int(0.425 * tile_size)),
-                (int(0.625 * tile_size), int(0.475 * tile_size)),
-                (int(0.525 * tile_size), int(0.475 * tile_size)),
-                (int(0.525 * tile_size), int(0.64 * tile_size)),
-            ]
-
-            pygame.draw.polygon(self.surf, self.color.value, points)
-
             surfs[type(self), self.color] = self.surf
         else:
             self.surf = surfs[type(self), self.color]
         self.rect = self.surf.get_rect()
 
+    def draw(self, tile_size: int) -> "pygame.Surface":
+        """
+        Draw the sprite at a tile size (it has no image)
+        """
+        import pygame
+
+        surf = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
+        pygame.draw.circle(
+            surf,
+            self.color.value,
+            (tile_size // 2, int(0.64 * tile_size)),
+            int(0.06 * tile_size),
+        )
+        points: list[tuple[int, int]] = [
+            (int(0.475 * tile_size), int(0.64 * tile_size)),
+            (int(0.475 * tile_size), int(0.3 * tile_size)),
+            (int(0.525 * tile_size), int(0.3 * tile_size)),
+            (int(0.525 * tile_size), int(0.35 * tile_size)),
+            (int(0.625 * tile_size), int(0.35 * tile_size)),
+            (int(0.625 * tile_size), int(0.4 * tile_size)),
+            (int(0.525 * tile_size), int(0.4 * tile_size)),
+            (int(0.525 * tile_size), int(0.425 * tile_size)),
+            (int(0.625 * tile_size), int(0.425 * tile_size)),
+            (int(0.625 * tile_size), int(0.475 * tile_size)),
+            (int(0.525 * tile_size), int(0.475 * tile_size)),
+            (int(0.525 * tile_size), int(0.64 * tile_size)),
+        ]
+
+        pygame.draw.polygon(surf, self.color.value, points)
+        return surf
+
     def get_color(self) -> Color:
         return self.color
 
@@ -441,27 +449,17 @@ class Key(TouchableTile, HasColor):
 
 
 class Lock(TouchableTile, HasColor):
-    surfs: dict[Color, pygame.Surface] = {}
+    surfs: dict[Color, "pygame.Surface"] = {}
 
     def __init__(self, color: Color) -> None:
         self.color = color
         super().__init__()
 
-    def interacted_with(self, other_tile: Tile, game: "Game") -> None:
+    def interacted_with(self, other_tile: Tile, game: "Engine") -> None:
         if not isinstance(other_tile, Player):
             return
         other_tile.tile_under = None
-        for y, row in enumerate(game.map.map):
-            for x, tile in enumerate(row):
-                if isinstance(tile, DoorFrame) and tile.color == self.color:
-                    game.map.map[y][x] = tile.door
-                elif (
-                    tile is not None
-                    and isinstance(tile.tile_under, DoorFrame)
-                    and tile.tile_under.color == self.color
-                ):
-                    # Put closed door under a tile that's currently occupying the doorframe when the lock happens.
-                    tile.tile_under = tile.tile_under.door
+        game.map.close_doors(self.color)
 
     def init(
         self,
@@ -472,61 +470,71 @@ class Lock(TouchableTile, HasColor):
         self.tile_size = tile_size
         self.pos = pos
         if (type(self), self.color) not in surfs:
-            self.surf = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
-            pygame.draw.circle(
-                self.surf,
-                self.color.value,
-                ((tile_size // 2) - 1, int(0.4 * tile_size)),
-                int(0.1 * tile_size),
+            self.surf = images.get_scaled_surface(
+                self.to_image_name(), tile_size, self.draw
             )
-            pygame.draw.circle(
-                self.surf,
-                (0, 0, 0, 0),
-                (tile_size // 2, int(0.4 * tile_size)),
-                int(0.075 * tile_size),
-            )
-            self.surf.fill(
-                (0, 0, 0, 0),
-                (
-                    tile_size * 0.4,
-                    tile_size * 0.4,
-                    tile_size * 0.2,
-                    tile_size * 0.1,
-                ),
-            )
-            self.surf.fill(
-                self.color.value,
-                (
-                    tile_size * 0.4,
-                    tile_size * 0.4,
-                    tile_size * 0.025,
-                    tile_size * 0.1,
-                ),
-            )
-            self.surf.fill(
-                self.color.value,
-                (
-                    tile_size * 0.575,
-                    tile_size * 0.4,
-                    tile_size * 0.025,
-                    tile_size * 0.1,
-                ),
-            )
-            self.surf.fill(
-                self.color.value,
-                (
-                    tile_size * 0.35,
-                    tile_size * 0.5,
-                    tile_size * 0.3,
-                    tile_size * 0.15,
-                ),
-            )
-
             surfs[type(self), self.color] = self.surf
         else:
             self.surf = surfs[type(self), self.color]
         self.rect = self.surf.get_rect()
 
+    def draw(self, tile_size: int) -> "pygame.Surface":
+        """
+        Draw the sprite at a tile size (it has no image)
+        """
+        import pygame
+
+        surf = pygame.Surface((tile_size, tile_size), pygame.SRCALPHA)
+        pygame.draw.circle(
+            surf,
+            self.color.value,
+            ((tile_size // 2) - 1, int(0.4 * tile_size)),
+            int(0.1 * tile_size),
+        )
+        pygame.draw.circle(
+            surf,
+            (0, 0, 0, 0),
+            (tile_size // 2, int(0.4 * tile_size)),
+            int(0.075 * tile_size),
+        )
+        surf.fill(
+            (0, 0, 0, 0),
+            (
+                tile_size * 0.4,
+                tile_size * 0.4,
+                tile_size * 0.2,
+                tile_size * 0.1,
+            ),
+        )
+        surf.fill(
+            self.color.value,
+            (
+                tile_size * 0.4,
+                tile_size * 0.4,
+                tile_size * 0.025,
+                tile_size * 0.1,
+            ),
+        )
+        surf.fill(
+            self.color.value,
+            (
+                tile_size * 0.575,
+                tile_size * 0.4,
+                tile_size * 0.025,
+                tile_size * 0.1,
+            ),
+        )
+        surf.fill(
+            self.color.value,
+            (
+                tile_size * 0.35,
+                tile_size * 0.5,
+                tile_size * 0.3,
+                tile_size * 0.15,
+            ),
+        )
+        return surf
+
     def get_color(self) -> Color:
         return self.color
 
@@ -556,21 +564,19 @@ class Spike(TouchableTile):
             # ]
 
             # pygame.draw.polygon(self.surf, _SPIKE_COLOR, points)
-            self.surf = pygame.transform.scale(
-                images.get_surface(self.to_image_name()), (tile_size, tile_size)
-            )
+            self.surf = images.get_scaled_surface(self.to_image_name(), tile_size)
             surfs[type(self)] = self.surf
         else:
             self.surf = surfs[type(self)]
         self.rect = self.surf.get_rect()
 
-    def interacted_with(self, other_tile: Tile, game: "Game") -> None:
+    def interacted_with(self, other_tile: Tile, game: "Engine") -> None:
         if not isinstance(other_tile, Player):
             return
 
         game.game_over(
             "You ran into a spike.",
-            random.choice(
+            game.rng.choice(
                 [
                     "Did that spike not lsook dangerous.",
                     "It wasn't even moving.",
@@ -600,15 +606,13 @@ class Exit(TouchableTile):
             #     (tile_size // 2, tile_size // 2),
             #     0.9 * tile_size // 2,
             # )
-            self.surf = pygame.transform.scale(
-                images.get_surface(self.to_image_name()), (tile_size, tile_size)
-            )
+            self.surf = images.get_scaled_surface(self.to_image_name(), tile_size)
             surfs[type(self)] = self.surf
         else:
             self.surf = surfs[type(self)]
         self.rect = self.surf.get_rect()
 
-    def interacted_with(self, other_tile: Tile, game: "Game") -> None:
+    def interacted_with(self, other_tile: Tile, game: "Engine") -> None:
         if not isinstance(other_tile, Player):
             return
 
@@ -648,9 +652,7 @@ class Enemy(TouchableTile):
             #     (tile_size // 2, tile_size // 2),
             #     0.9 * tile_size // 2,
             # )
-            self.surf = pygame.transform.scale(
-                images.get_surface(self.to_image_name()), (tile_size, tile_size)
-            )
+            self.surf = images.get_scaled_surface(self.to_image_name(), tile_size)
             surfs[type(self), self.boss] = self.surf
         else:
             self.surf = surfs[type(self), self.boss]
@@ -661,13 +663,21 @@ class Enemy(TouchableTile):
             return super().to_image_name()
         return super().to_image_name() + "_Boss"
 
-    def interacted_with(self, other_tile: Tile, game: "Game") -> None:
+    def get_signature(self) -> tuple:
+        return super().get_signature() + (
+            tuple(direction.name for direction in self.path),
+            self.index,
+            self.chance_to_move,
+            self.boss,
+        )
+
+    def interacted_with(self, other_tile: Tile, game: "Engine") -> None:
         if not isinstance(other_tile, Player):
             return
 
         game.game_over(
             "You ran into an enemy.",
-            random.choice(
+            game.rng.choice(
                 [
                     "Stop touching people.",
                     "Invisibilty doesn't matter if you are running into them.",
@@ -704,6 +714,9 @@ TileVar = TypeVar("TileVar", bound=Tile)
 
 class Map:
     def __init__(self, map: list[list[Tile | None]]) -> None:
+        """
+        :param map: Grid of tiles, after this it should only be changed through `set_tile`
+        """
         self.map = map
         self.height = len(map)
         self.width = len(map[0]) if map else 0
@@ -712,29 +725,206 @@ class Map:
                 raise ValueError(
                     f"Expected MxN matrix for map argument ({self.height}x{self.width}). Row {i} has a length of ({len(row)}) instead of {self.width}."
                 )
+        self._index: dict[tuple[Type[Tile], Color | None], set[tuple[int, int]]] = {}
+        """Positions of tiles by (tile class, color)"""
+        self._index_keys: dict[tuple[int, int], tuple[Type[Tile], Color | None]] = {}
+        """Key each position is indexed under, scripts may change a tile's color after it's indexed"""
+        self._door_cells: dict[Color, set[tuple[int, int]]] = {}
+        """Positions that have ever held a door or doorframe by color"""
+        self._changed_cells: set[tuple[int, int]] = set()
+        self._change_trackers: list[set[tuple[int, int]]] = []
+        """Sets from `track_changes`, each collecting changed positions for its own reader"""
+        self._exit_distances: "np.ndarray | None" = None
+        """Cached `get_exit_distances`, cleared when doors open or close"""
+        for pos, tile in self.iter_tiles():
+            self._add_to_index(pos, tile)
+
+    @staticmethod
+    def _get_index_key(tile: Tile) -> tuple[Type[Tile], Color | None]:
+        return type(tile), tile.get_color() if isinstance(tile, HasColor) else None
+
+    def _add_to_index(self, pos: tuple[int, int], tile: Tile) -> None:
+        key = self._get_index_key(tile)
+        self._index.setdefault(key, set()).add(pos)
+        self._index_keys[pos] = key
+        for _tile in (tile, tile.tile_under):
+            if isinstance(_tile, (Door, DoorFrame)):
+                self._door_cells.setdefault(_tile.color, set()).add(pos)
+
+    def _remove_from_index(self, pos: tuple[int, int]) -> None:
+        key = self._index_keys.pop(pos)
+        positions = self._index[key]
+        positions.discard(pos)
+        if not positions:
+            del self._index[key]
+
+    def get_tile(self, x: int, y: int) -> Tile | None:
+        """
+        Get the tile at a position
 
-    def get_positions(self, cls: Type[Tile]) -> list[tuple[int, int]]:
+        :return: Tile, or None if it's floor or outside the map
         """
-        Find 1 or more positions of any tile type
+        if x < 0 or x >= self.width:
+            return None
+        if y < 0 or y >= self.height:
+            return None
+        return self.map[y][x]
+
+    def set_tile(self, x: int, y: int, tile: Tile | None) -> None:
+        old_tile = self.map[y][x]
+        if old_tile is not None:
+            self._remove_from_index((x, y))
+        self.map[y][x] = tile
+        if tile is not None:
+            self._add_to_index((x, y), tile)
+        self._changed_cells.add((x, y))
+        for cells in self._change_trackers:
+            cells.add((x, y))
+
+    def pop_changed_cells(self) -> set[tuple[int, int]]:
+        """
+        Get and forget the positions whose tile (or tile under) changed since the last call
 
-        :return: tile position(s)
+        :return: changed positions
+        """
+        changed_cells = self._changed_cells
+        self._changed_cells = set()
+        return changed_cells
+
+    def track_changes(self) -> set[tuple[int, int]]:
+        """
+        Get a set that collects every position whose tile (or tile under) changes from now on,
+        apart from `pop_changed_cells`. Its owner empties it whenever it's done with it.
+
+        :return: The set, updated in place
+        """
+        cells: set[tuple[int, int]] = set()
+        self._change_trackers.append(cells)
+        return cells
+
+    def iter_tiles(self) -> Iterator[tuple[tuple[int, int], Tile]]:
+        """
+        Iterate over every tile that needs to be set up before the game starts
+
+        :return: Iterator of (position, tile)
         """
-        positions: list[tuple[int, int]] = []
         for y, row in enumerate(self.map):
             for x, tile in enumerate(row):
-                if isinstance(tile, cls):
-                    positions.append((x, y))
+                if tile is not None:
+                    yield (x, y), tile
+
+    def iter_cells(self) -> Iterator[tuple[tuple[int, int], Tile]]:
+        """
+        Iterate over every cell that isn't floor, row by row
+
+        :return: Iterator of (position, tile)
+        """
+        return self.iter_tiles()
+
+    def fingerprint(self) -> bytes:
+        """
+        Hash of the layout: the size, and every tile with its color, enemy path and tiles under it
+
+        :return: 16 bytes, the same for every map built the same way
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr((self.width, self.height)).encode())
+        for pos, tile in self.iter_cells():
+            signature = self._get_cell_signature(tile)
+            if signature is not None:
+                digest.update(repr((pos, signature)).encode())
+        return digest.digest()
+
+    def defer_fingerprint(self) -> Callable[[], bytes]:
+        """
+        Fingerprint of the map as it is now, for when it's needed later. The map can change in between.
+        """
+        fingerprint = self.fingerprint()
+        return lambda: fingerprint
+
+    @staticmethod
+    def _get_cell_signature(tile: Tile | None) -> tuple | None:
+        """
+        Signature of a cell as the engine starts it, with tiles that are removed before the first tick already gone
+        """
+        if tile is not None and tile._auto_remove:
+            tile = tile.tile_under
+        return None if tile is None else tile.get_signature()
+
+    def get_exit_distances(self) -> "np.ndarray":
+        """
+        Moves from every cell to the nearest exit, computed once and again after doors open or close.
+        Players and enemies are ignored, spikes count as walls.
+
+        :return: (height, width) int32 array, -1 where no exit can be reached
+        """
+        if self._exit_distances is None:
+            # NumPy is only needed once a script asks for distances
+            from .reachability import get_exit_distances
+
+            self._exit_distances = get_exit_distances(self)
+        return self._exit_distances
+
+    def open_doors(self, color: Color) -> None:
+        """
+        Open every closed door of a color
+        """
+        self._exit_distances = None
+        for x, y in self._door_cells.get(color, ()):
+            tile = self.map[y][x]
+            if isinstance(tile, Door) and tile.color == color:
+                self.set_tile(x, y, tile.tile_under)
+
+    def close_doors(self, color: Color) -> None:
+        """
+        Close every opened door of a color
+        """
+        self._exit_distances = None
+        for x, y in self._door_cells.get(color, ()):
+            tile = self.map[y][x]
+            if isinstance(tile, DoorFrame) and tile.color == color:
+                self.set_tile(x, y, tile.door)
+            elif (
+                tile is not None
+                and isinstance(tile.tile_under, DoorFrame)
+                and tile.tile_under.color == color
+            ):
+                # Put closed door under a tile that's currently occupying the doorframe when the lock happens.
+                tile.tile_under = tile.tile_under.door
+                self._changed_cells.add((x, y))
+                for cells in self._change_trackers:
+                    cells.add((x, y))
+
+    def get_positions(
+        self, cls: Type[Tile], color: Color | None = None
+    ) -> list[tuple[int, int]]:
+        """
+        Find 1 or more positions of any tile type
+
+        :param color: Only find tiles of this color, defaults to any color
+        :return: tile position(s)
+        """
+        positions = [
+            pos
+            for (tile_class, tile_color), cells in self._index.items()
+            if issubclass(tile_class, cls) and (color is None or tile_color == color)
+            for pos in cells
+        ]
+        positions.sort(key=lambda pos: (pos[1], pos[0]))
         return positions
 
-    def get_tiles(self, cls: Type[TileVar]) -> list[TileVar]:
+    def get_tiles(
+        self, cls: Type[TileVar], color: Color | None = None
+    ) -> list[TileVar]:
         """
         Find 1 or more tiles
 
+        :param color: Only find tiles of this color, defaults to any color
         :return: tiles
         """
         tiles: list[TileVar] = []
-        for row in self.map:
-            for tile in row:
-                if isinstance(tile, cls):
-                    tiles.append(tile)
+        for x, y in self.get_positions(cls, color):
+            tile = self.map[y][x]
+            assert isinstance(tile, cls)
+            tiles.append(tile)
         return tiles
@@ -0,0 +1,126 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+import struct
+from typing import Callable
+
+from .direction import Direction
+from .map import Enemy
+
+MAGIC = b"MZML"
+VERSION = 1
+_HEADER = struct.Struct("<4sBB16sqH")
+"""magic, version, flags, map fingerprint, seed, number of random enemies"""
+_HAS_SEED = 1
+_DIRECTIONS = [
+    Direction.HALT,
+    Direction.LEFT,
+    Direction.RIGHT,
+    Direction.UP,
+    Direction.DOWN,
+]
+"""Directions by their byte in the log"""
+_MOVE_BYTES = {direction.value: i for i, direction in enumerate(_DIRECTIONS)}
+
+
+def is_random_enemy(enemy: Enemy) -> bool:
+    """
+    :return: Whether the enemy needs a random draw to know if it moves
+    """
+    return 0 < enemy.chance_to_move < 1
+
+
+@dataclass
+class MoveLog:
+    """
+    Everything a run depends on besides the map: the players' move and the random enemies' draws of every tick.
+    Each tick takes one byte for the move, plus one bit per random enemy.
+    """
+
+    _fingerprint: bytes | Callable[[], bytes]
+    """`fingerprint`, or what computes it the first time it's needed (see `Map.defer_fingerprint`)"""
+    seed: int | None
+    enemy_count: int
+    """Number of enemies with a random draw (`is_random_enemy`), in the engine's enemy order"""
+    ticks: bytearray = field(default_factory=bytearray)
+
+    @property
+    def fingerprint(self) -> bytes:
+        """`Map.fingerprint` of the map the run started on"""
+        if callable(self._fingerprint):
+            self._fingerprint = self._fingerprint()
+        return self._fingerprint
+
+    @property
+    def tick_size(self) -> int:
+        return 1 + (self.enemy_count + 7) // 8
+
+    def __len__(self) -> int:
+        return len(self.ticks) // self.tick_size
+
+    def append(self, move: tuple[int, int], draws: list[bool]) -> None:
+        """
+        Record a tick
+
+        :param move: (dx, dy) the players moved by, (0, 0) if they didn't
+        :param draws: Whether each random enemy drew a move
+        """
+        self.ticks.append(_MOVE_BYTES[move])
+        if not self.enemy_count:
+            return
+        bits = 0
+        for i, draw in enumerate(draws):
+            bits |= draw << i
+        self.ticks += bits.to_bytes(self.tick_size - 1, "little")
+
+    def get(self, tick: int) -> tuple[Direction, list[bool]]:
+        """
+        :param tick: Index of the tick, from 0
+        :return: Direction and the random enemies' draws of the tick
+        """
+        start = tick * self.tick_size
+        bits = int.from_bytes(self.ticks[start + 1 : start + self.tick_size], "little")
+        return _DIRECTIONS[self.ticks[start]], [
+            bool(bits >> i & 1) for i in range(self.enemy_count)
+        ]
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(
+            MAGIC,
+            VERSION,
+            _HAS_SEED if self.seed is not None else 0,
+            self.fingerprint,
+            self.seed or 0,
+            self.enemy_count,
+        )
+        return header + self.ticks
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "MoveLog":
+        """
+        :raises ValueError: It isn't a move log, or one from another version
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Move log is truncated.")
+        magic, version, flags, fingerprint, seed, enemy_count = _HEADER.unpack_from(
+            data
+        )
+        if magic != MAGIC:
+            raise ValueError("Not a move log.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported move log version {version}.")
+        log = cls(
+            fingerprint,
+            seed if flags & _HAS_SEED else None,
+            enemy_count,
+            bytearray(data[_HEADER.size :]),
+        )
+        if len(log.ticks) % log.tick_size:
+            raise ValueError("Move log is truncated.")
+        return log
+
+    def save(self, path: Path) -> None:
+        path.write_bytes(self.to_bytes())
+
+    @classmethod
+    def load(cls, path: Path) -> "MoveLog":
+        return cls.from_bytes(path.read_bytes())
@@ -1,15 +1,19 @@
 from math import floor
 from typing import cast
+import numpy as np
 import pygame
 
 from .map import images
 
+from .background import Background
 from .color import Color
 
 from .direction import Direction
+from .fonts import fonts
 from .game import Game
-from .map import Enemy, Map, SurfsType, pos_to_pixel
-
+from .map import Enemy, Map, Player, SurfsType
+from .reachability import get_exit_distances
+from .session import quit_pygame
 
 _TEXT_COLOR = pygame.Color(255, 255, 255)
 _TEXT_SHADOW_COLOR = pygame.Color(0, 0, 0)
@@ -25,6 +29,9 @@ _CIRCLE_PADDING_LEFT = 0.2
 _CIRCLE_PADDING_TOP = 0.1
 _TIMES_PADDING_LEFT = 0.1
 _TIMES_PADDING_TOP = 0.0
+_HEAT_NEAR_COLOR = (255, 60, 0)
+_HEAT_FAR_COLOR = (0, 60, 255)
+_HEAT_ALPHA = 120
 
 
 class ColorGenerator:
@@ -41,7 +48,7 @@ class ColorGenerator:
 
         if not self._colors:
             self.reset_color()
-        return color.value
+        return pygame.Color(color.value)
 
 
 def enemy_to_path_points(
@@ -131,25 +138,26 @@ class Preview:
         )
 
         self.desc_surface = pygame.Surface((Game.DEFAULT_WIDTH, self.MIN_DESC_HEIGHT))
+        self.frames: dict[tuple[int, bool], pygame.Surface] = {}
+        """Whole frame of each map variant by (index, is_show_path)"""
+        self.heat_frames: dict[tuple[int, bool], pygame.Surface] = {}
+        """Same as `frames` with distances to the exit drawn over, rendered when first shown"""
         self.map_index = 0
         self.is_show_path = True
+        self.is_show_heat = False
 
     def init_map(self) -> None:
         self.map = self.maps[self.map_index]
         self.surfs: SurfsType = {}
         self.tile_size, self.screen_width, self.screen_height = self._get_tile_size()
-        self.font = pygame.font.SysFont(
-            "Times New Roman", self.tile_size // 5, bold=True
-        )
+        self.font = fonts.get(self.tile_size // 5, bold=True)
         self.floor_surface = pygame.transform.scale(
             images.get_surface("None"), (self.tile_size, self.tile_size)
         )
-        self.desc_font_index = pygame.font.SysFont("Times New Roman", 30, bold=True)
-        self.desc_font_key = pygame.font.SysFont("Times New Roman", 10, bold=True)
-        self.desc_font = pygame.font.SysFont("Times New Roman", 20, bold=True)
-        self.font_shadow = pygame.font.SysFont(
-            "Times New Roman", self.tile_size // 4, bold=True
-        )
+        self.desc_font_index = fonts.get(30, bold=True)
+        self.desc_font_key = fonts.get(10, bold=True)
+        self.desc_font = fonts.get(20, bold=True)
+        self.font_shadow = fonts.get(self.tile_size // 4, bold=True)
         self.map_surface = pygame.Surface((self.screen_width, self.screen_height))
         self.surface_overlay = pygame.Surface(
             (self.screen_width, self.screen_height), pygame.SRCALPHA
@@ -165,7 +173,8 @@ class Preview:
                     tile.tile_under.rect.topleft = tile.tile_under.get_top_left((x, y))
                 tile.rect.topleft = tile.get_top_left((x, y))
                 if tile._auto_remove:
-                    self.map.map[y][x] = tile.tile_under
+                    self.map.set_tile(x, y, tile.tile_under)
+        self.background = Background(self.map, self.tile_size, self.floor_surface)
 
     def _get_tile_size(self) -> tuple[int, int, int]:
         """
@@ -181,7 +190,7 @@ class Preview:
         return tile_size, screen_width, screen_height
 
     def teardown(self) -> None:
-        pygame.quit()
+        quit_pygame()
 
     def draw_halt(
         self, pos: tuple[int, int], times: int, color: pygame.Color, index: int
@@ -366,14 +375,14 @@ class Preview:
                 ),
             )
 
-    def update_desc(self) -> None:
+    def update_desc(self, surface: pygame.Surface) -> None:
         self.desc_surface.fill(self.DESC_BG_COLOR)
         desc_rect = self.desc_surface.get_rect()
         text_index = self.desc_font_index.render(
             f"< {self.map_index + 1}/{len(self.maps)} >", True, _TEXT_COLOR
         )
         text_key = self.desc_font_key.render(
-            f"Press <space> to {'hide' if self.is_show_path else 'show' } paths. Press arrow keys to cycle through maps.",
+            f"Press <space> to {'hide' if self.is_show_path else 'show' } paths, <h> to {'hide' if self.is_show_heat else 'show' } distances to the exit. Press arrow keys to cycle through maps.",
             True,
             _TEXT_COLOR,
         )
@@ -405,7 +414,7 @@ class Preview:
                     centerx=desc_rect.centerx,
                 ),
             )
-        self.display_surface.blit(
+        surface.blit(
             self.desc_surface,
             (
                 0,
@@ -415,79 +424,117 @@ class Preview:
             ),
         )
 
-    def run(self) -> None:
-        while True:
-            self.display_surface.fill(self.BG_COLOR)
+    def render_frame(self) -> pygame.Surface:
+        """
+        Render the current map variant and its description into a whole frame
+        """
+        frame = pygame.Surface((Game.DEFAULT_WIDTH, Game.DEFAULT_HEIGHT)).convert()
+        frame.fill(self.BG_COLOR)
+        self.update_desc(frame)
+        if (self.map.width * self.tile_size) == Game.DEFAULT_WIDTH:
+            frame.blit(
+                self.map_surface,
+                (
+                    0,
+                    (
+                        Game.DEFAULT_HEIGHT
+                        - self.MIN_DESC_HEIGHT
+                        - (self.map.height * self.tile_size)
+                    )
+                    // 2,
+                ),
+            )
+        else:
+            frame.blit(
+                self.map_surface,
+                (
+                    (Game.DEFAULT_WIDTH - (self.map.width * self.tile_size)) // 2,
+                    0,
+                ),
+            )
+        return frame
+
+    def prerender(self) -> None:
+        """
+        Render every map variant once, with and without paths
+        """
+        for map_index in range(len(self.maps)):
+            self.map_index = map_index
+            self.init_map()
+            for is_show_path in (False, True):
+                self.is_show_path = is_show_path
+                self.update_map()
+                self.frames[map_index, is_show_path] = self.render_frame()
+        self.map_index = 0
+        self.is_show_path = True
+
+    def get_frame(self) -> pygame.Surface:
+        key = (self.map_index, self.is_show_path)
+        if not self.is_show_heat:
+            return self.frames[key]
+        if key not in self.heat_frames:
             self.init_map()
             self.update_map()
-            self.update_desc()
-            if (self.map.width * self.tile_size) == Game.DEFAULT_WIDTH:
-                self.display_surface.blit(
-                    self.map_surface,
-                    (
-                        0,
-                        (
-                            Game.DEFAULT_HEIGHT
-                            - self.MIN_DESC_HEIGHT
-                            - (self.map.height * self.tile_size)
-                        )
-                        // 2,
-                    ),
-                )
-            else:
-                self.display_surface.blit(
-                    self.map_surface,
-                    (
-                        (Game.DEFAULT_WIDTH - (self.map.width * self.tile_size)) // 2,
-                        0,
-                    ),
-                )
-            pygame.display.update()
-            while True:
-                is_re_render = False
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.teardown()
-                        return
-                    elif event.type == pygame.KEYDOWN:
-                        match event.key:
-                            case pygame.K_RIGHT:
-                                self.map_index = (self.map_index + 1) % len(self.maps)
-                                is_re_render = True
-                                break
-                            case pygame.K_LEFT:
-                                self.map_index = (self.map_index - 1) % len(self.maps)
-                                is_re_render = True
-                                break
-                            case pygame.K_SPACE:
-                                self.is_show_path = not self.is_show_path
-                                is_re_render = True
-                                break
-                if is_re_render:
-                    break
-
-    def fill_floor(self) -> None:
-        for y in range(self.map.height):
-            for x in range(self.map.width):
-                self.map_surface.blit(
-                    self.floor_surface,
-                    self.floor_surface.get_rect(
-                        topleft=pos_to_pixel(self.tile_size, (x, y))
-                    ),
-                )
+            self.heat_frames[key] = self.render_frame()
+        return self.heat_frames[key]
+
+    def show_frame(self) -> None:
+        self.display_surface.blit(self.get_frame(), (0, 0))
+        pygame.display.update()
+
+    def run(self) -> None:
+        self.prerender()
+        self.show_frame()
+        while True:
+            # Nothing moves in the preview, sleep until something happens
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                self.teardown()
+                return
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.show_frame()
+            elif event.type == pygame.KEYDOWN:
+                match event.key:
+                    case pygame.K_RIGHT:
+                        self.map_index = (self.map_index + 1) % len(self.maps)
+                    case pygame.K_LEFT:
+                        self.map_index = (self.map_index - 1) % len(self.maps)
+                    case pygame.K_SPACE:
+                        self.is_show_path = not self.is_show_path
+                    case pygame.K_h:
+                        self.is_show_heat = not self.is_show_heat
+                    case _:
+                        continue
+                self.show_frame()
+
+    def draw_heat(self) -> None:
+        """
+        Tint every cell from near to far from the exit, cells that can't reach it are left as is
+        """
+        distances = get_exit_distances(self.map).T
+        reachable = distances >= 0
+        if not reachable.any():
+            return
+        t = (distances / max(distances.max(), 1))[..., np.newaxis]
+        colors = (1 - t) * _HEAT_NEAR_COLOR + t * _HEAT_FAR_COLOR
+        # Black is the color key, keep the tint off it
+        colors = np.maximum(colors, 1).astype(np.uint8)
+        colors[~reachable] = 0
+        heat = pygame.Surface((self.map.width, self.map.height))
+        pygame.surfarray.blit_array(heat, colors)
+        heat.set_colorkey((0, 0, 0))
+        heat.set_alpha(_HEAT_ALPHA)
+        self.map_surface.blit(
+            pygame.transform.scale(heat, (self.screen_width, self.screen_height)),
+            (0, 0),
+        )
 
     def update_map(self) -> None:
-        # self.map_surface.fill(Game.BG_COLOR)
-        self.fill_floor()
-        for y, row in enumerate(self.map.map):
-            for x, tile in enumerate(row):
-                if tile is None:
-                    continue
-                assert hasattr(tile, "surf")
-                assert hasattr(tile, "rect")
-                if tile.tile_under is not None:
-                    self.map_surface.blit(tile.tile_under.surf, tile.tile_under.rect)
-                self.map_surface.blit(tile.surf, tile.rect)
+        self.map_surface.blit(self.background.surface, (0, 0))
+        if self.is_show_heat:
+            self.draw_heat()
+        for tile in self.map.get_tiles(Player) + self.map.get_tiles(Enemy):
+            self.map_surface.blit(tile.surf, tile.rect)
         if not self.is_show_path:
             return
         enemies = self.map.get_tiles(Enemy)
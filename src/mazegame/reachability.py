@@ -0,0 +1,178 @@
+from typing import Iterator, Type
+
+import numpy as np
+
+from .array_map import ArrayMap, TileKind
+from .map import Block, ColoredBlock, Door, Enemy, Exit, Map, Player, Spike, Tile
+
+_WALLS = (Block, ColoredBlock, Spike)
+_WALL_KINDS = [TileKind.BLOCK, TileKind.COLORED_BLOCK, TileKind.SPIKE]
+
+
+def _is_walkable(tile: Tile | None, is_doors_open: bool) -> bool:
+    # Players and enemies move away, doors that start open are removed by the engine
+    while tile is not None and (isinstance(tile, (Player, Enemy)) or tile._auto_remove):
+        tile = tile.tile_under
+    if isinstance(tile, Door):
+        return is_doors_open
+    return not isinstance(tile, _WALLS)
+
+
+def get_walkable(map: Map, *, is_doors_open: bool = False) -> np.ndarray:
+    """
+    Cells a player can walk through without dying: everything but blocks, spikes and closed doors
+
+    :param map: Map to look at, players and enemies are ignored
+    :param is_doors_open: Count every door as open, defaults to False
+    :return: (height, width) boolean array
+    """
+    if isinstance(map, ArrayMap):
+        walls = _WALL_KINDS if is_doors_open else _WALL_KINDS + [TileKind.DOOR]
+        return ~np.isin(map.kinds, walls)
+    return np.array(
+        [[_is_walkable(tile, is_doors_open) for tile in row] for row in map.map],
+        dtype=bool,
+    ).reshape(map.height, map.width)
+
+
+def get_mask(map: Map, cls: Type[Tile]) -> np.ndarray:
+    """
+    :return: (height, width) boolean array of the cells with a tile of a class
+    """
+    mask = np.zeros((map.height, map.width), dtype=bool)
+    positions = map.get_positions(cls)
+    if positions:
+        xs, ys = zip(*positions)
+        mask[ys, xs] = True
+    return mask
+
+
+def _pack(mask: np.ndarray) -> np.ndarray:
+    """
+    Pack each row into 64 bit words, bit i of word j + 1 is column 64 * j + i.
+    There's an empty word around every row and an empty row above and below, so neighbours never go out of bounds.
+    """
+    height, width = mask.shape
+    packed = np.zeros((height + 2, (-(-width // 64) + 2) * 8), dtype=np.uint8)
+    packed[1:-1, 8 : 8 + -(-width // 8)] = np.packbits(mask, axis=1, bitorder="little")
+    return packed.view("<u8")
+
+
+def _unpack(packed: np.ndarray, width: int) -> np.ndarray:
+    return np.unpackbits(
+        packed[1:-1, 1:-1].view(np.uint8), axis=1, count=width, bitorder="little"
+    ).view(bool)
+
+
+def _iter_layers(
+    walk: np.ndarray, visited: np.ndarray
+) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Breadth-first search that expands the whole frontier at once, 64 cells per word.
+    Only the words of the frontier are looked at, so a step costs the size of the frontier, not of the map.
+
+    :param walk: Packed walkable cells
+    :param visited: Packed cells to start from, every cell reached is added to it
+    :return: Generator of (flat word indexes, bits of the words) of each layer:
+        the cells to start from, then the cells one step further each time
+    """
+    row_words = walk.shape[1]
+    walk = walk.reshape(-1)
+    visited = visited.reshape(-1)
+    # Scratch space to merge the bits spread into each word, and find the words that were touched
+    merged = np.zeros_like(walk)
+    owners = np.zeros(walk.size, dtype=np.intp)
+    indexes = np.flatnonzero(visited)
+    bits = visited[indexes]
+    while indexes.size:
+        yield indexes, bits
+        # Bits that cross a word boundary carry into the word next to it
+        spread = (
+            (indexes, bits | bits << 1 | bits >> 1),
+            (indexes - 1, bits << 63),
+            (indexes + 1, bits >> 63),
+            (indexes - row_words, bits),
+            (indexes + row_words, bits),
+        )
+        for spread_indexes, spread_bits in spread:
+            # Indexes are unique within each group, so fancy indexing merges them
+            merged[spread_indexes] |= spread_bits
+        candidates = np.concatenate([spread_indexes for spread_indexes, _ in spread])
+        positions = np.arange(candidates.size)
+        owners[candidates] = positions
+        indexes = candidates[owners[candidates] == positions]
+        bits = merged[indexes] & walk[indexes] & ~visited[indexes]
+        merged[indexes] = 0
+        is_new = bits != 0
+        indexes = indexes[is_new]
+        bits = bits[is_new]
+        visited[indexes] |= bits
+
+
+def get_reachable(walkable: np.ndarray, sources: np.ndarray) -> np.ndarray:
+    """
+    :param walkable: (height, width) boolean array from `get_walkable`
+    :param sources: (height, width) boolean array of the cells to start from
+    :return: (height, width) boolean array of the walkable cells that can be reached from any source
+    """
+    visited = _pack(sources & walkable)
+    for _ in _iter_layers(_pack(walkable), visited):
+        pass
+    return _unpack(visited, walkable.shape[1])
+
+
+def get_distances(walkable: np.ndarray, sources: np.ndarray) -> np.ndarray:
+    """
+    Number of moves from every cell to the nearest source
+
+    :param walkable: (height, width) boolean array from `get_walkable`
+    :param sources: (height, width) boolean array of the cells to measure from
+    :return: (height, width) int32 array, -1 where no source can be reached
+    """
+    visited = _pack(sources & walkable)
+    # Distances are written bit by bit, one packed plane per bit
+    planes: list[np.ndarray] = []
+    for step, (indexes, bits) in enumerate(_iter_layers(_pack(walkable), visited)):
+        while step >> len(planes):
+            planes.append(np.zeros_like(visited))
+        for bit, plane in enumerate(planes):
+            if step >> bit & 1:
+                plane.reshape(-1)[indexes] |= bits
+    width = walkable.shape[1]
+    distances = np.zeros(walkable.shape, dtype=np.int32)
+    for bit, plane in enumerate(planes):
+        distances |= _unpack(plane, width).astype(np.int32) << bit
+    distances[~_unpack(visited, width)] = -1
+    return distances
+
+
+def get_exit_distances(map: Map, *, is_doors_open: bool = False) -> np.ndarray:
+    """
+    :param is_doors_open: Count every door as open, defaults to False
+    :return: (height, width) int32 array of moves to the nearest exit, -1 where it can't be reached
+    """
+    return get_distances(
+        get_walkable(map, is_doors_open=is_doors_open), get_mask(map, Exit)
+    )
+
+
+def validate_map(map: Map) -> list[str]:
+    """
+    Look for mistakes that make a map impossible whatever the script does
+
+    :return: Problems found, empty if there's none
+    """
+    players = get_mask(map, Player)
+    exits = get_mask(map, Exit)
+    problems: list[str] = []
+    if not players.any():
+        problems.append("The map has no player.")
+    if not exits.any():
+        problems.append("The map has no exit.")
+    if problems:
+        return problems
+    # Keys and locks can open any door eventually, so only walls and spikes can cut the exit off
+    reachable = get_reachable(get_walkable(map, is_doors_open=True), players)
+    if not (reachable & exits).any():
+        problems.append("No player can reach an exit, even with every door open.")
+    return problems
@@ -0,0 +1,123 @@
+from dataclasses import asdict, dataclass
+import hashlib
+import json
+import os
+from pathlib import Path
+import time
+
+CACHE_VERSION = 2
+"""Bump when the rules change so old results are never returned"""
+
+
+def get_run_key(
+    script_source: bytes, map_fingerprint: bytes, seed: int, *settings: object
+) -> str:
+    """
+    Hash of everything a headless run depends on
+
+    :param script_source: Source of the script file, files it imports are not part of the key
+    :param map_fingerprint: `Map.fingerprint` of the map variant
+    :param seed: Seed of the run
+    :param settings: Anything else that changes the outcome (function name, max ticks, etc.)
+    :return: Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(hashlib.blake2b(script_source).digest())
+    digest.update(map_fingerprint)
+    digest.update(repr((CACHE_VERSION, seed, settings)).encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedResult:
+    outcome: str
+    reason: str
+    tick_count: int
+    par: int | None = None
+
+
+class ResultCache:
+    """
+    Outcomes of past runs by `get_run_key`, one small JSON file each.
+    Entries unused for `max_age` seconds are evicted, then the least recently used ones
+    until the files take at most `max_bytes`. Several processes can share one directory.
+    """
+
+    DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+    DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
+    def __init__(
+        self,
+        directory: Path,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+    ) -> None:
+        """
+        :param directory: Directory of the entries, created on the first write
+        :param max_bytes: Size cap of every entry together, defaults to DEFAULT_MAX_BYTES
+        :param max_age: Seconds an entry is kept since it was last used, defaults to DEFAULT_MAX_AGE
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+
+    def _get_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> CachedResult | None:
+        """
+        :return: Cached result, or None if it isn't cached or is too old
+        """
+        path = self._get_path(key)
+        try:
+            if time.time() - path.stat().st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                return None
+            result = CachedResult(**json.loads(path.read_text()))
+            # Entries are evicted by last use
+            os.utime(path)
+        except (OSError, ValueError, TypeError):
+            return None
+        return result
+
+    def put(self, key: str, result: CachedResult) -> None:
+        """
+        Write a result, silently giving up if the directory isn't writable
+        """
+        path = self._get_path(key)
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_path.write_text(json.dumps(asdict(result)))
+            os.replace(temp_path, path)
+        except OSError:
+            temp_path.unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        """
+        Remove entries that are too old, then the least recently used ones until the cache fits in `max_bytes`
+
+        :return: Number of entries removed
+        """
+        entries: list[tuple[float, int, Path]] = []
+        try:
+            for path in self.directory.glob("*.json"):
+                stat = path.stat()
+                entries.append((stat.st_mtime, stat.st_size, path))
+        except OSError:
+            return 0
+        entries.sort()
+        now = time.time()
+        total_bytes = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if now - mtime <= self.max_age and total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+            removed += 1
+        return removed
+
+    def clear(self) -> None:
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
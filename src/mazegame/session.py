@@ -0,0 +1,61 @@
+from contextlib import contextmanager
+import os
+from typing import Iterator
+
+from .fonts import fonts
+
+_session_depth = 0
+
+
+def is_session_active() -> bool:
+    """
+    :return: Whether a `pygame_session` keeps pygame initialised
+    """
+    return _session_depth > 0
+
+
+@contextmanager
+def pygame_session(video_driver: str | None = "dummy") -> Iterator[None]:
+    """
+    Initialise pygame once for many games in a row, e.g. a test module or a batch of runs.
+    Inside it, `Game.teardown` only resets what a game left behind instead of quitting pygame.
+    Sessions can be nested, only the outermost one initialises and quits.
+
+    :param video_driver: SDL video driver for the session, defaults to a headless one, None to keep the environment's
+    """
+    global _session_depth
+    import pygame
+
+    previous_driver = os.environ.get("SDL_VIDEODRIVER")
+    is_outermost = _session_depth == 0
+    if is_outermost:
+        if video_driver is not None:
+            os.environ["SDL_VIDEODRIVER"] = video_driver
+        pygame.display.init()
+        pygame.font.init()
+    _session_depth += 1
+    try:
+        yield
+    finally:
+        _session_depth -= 1
+        if is_outermost:
+            fonts.clear()
+            pygame.quit()
+            if video_driver is not None:
+                if previous_driver is None:
+                    del os.environ["SDL_VIDEODRIVER"]
+                else:
+                    os.environ["SDL_VIDEODRIVER"] = previous_driver
+
+
+def quit_pygame() -> None:
+    """
+    Quit pygame after a game, unless a `pygame_session` keeps it for the next one
+    """
+    import pygame
+
+    if is_session_active():
+        pygame.event.clear()
+        return
+    fonts.clear()
+    pygame.quit()
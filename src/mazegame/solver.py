@@ -0,0 +1,365 @@
+from array import array
+from collections import deque
+import hashlib
+import threading
+
+from .color import Color
+from .direction import Direction
+from .map import (
+    Block,
+    ColoredBlock,
+    ColoredFloor,
+    Door,
+    DoorFrame,
+    Enemy,
+    Exit,
+    HasColor,
+    Key,
+    Lock,
+    Map,
+    Player,
+    Spike,
+    Tile,
+    TouchableTile,
+)
+
+DEFAULT_MAX_STATES = 1_000_000
+_pars: dict[tuple[bytes, int | None], int | None] = {}
+"""Par of every map solved by this process by (`Map.fingerprint`, max states)"""
+_MOVES = [Direction.HALT, Direction.LEFT, Direction.RIGHT, Direction.UP, Direction.DOWN]
+_KNOWN_TILES: tuple[type[Tile], ...] = (
+    Block,
+    ColoredBlock,
+    ColoredFloor,
+    Door,
+    DoorFrame,
+    Enemy,
+    Exit,
+    Key,
+    Lock,
+    Player,
+    Spike,
+)
+_TOUCHABLE = {cls.__name__ for cls in _KNOWN_TILES if issubclass(cls, TouchableTile)}
+
+Token = tuple[str, Color | int | None]
+"""(class name, color), or ("Enemy", index of the enemy) as enemies move on their own"""
+Chain = tuple[Token, ...]
+"""Tiles of a cell from top to bottom, like following `Tile.tile_under`"""
+
+_VICTORY = 1
+_GAME_OVER = 2
+
+
+class _State:
+    """
+    Everything that changes during a run, mutated in place by `_Solver.step`
+    """
+
+    __slots__ = ("cells", "players", "enemy_positions", "enemy_indexes", "status")
+
+    def __init__(
+        self,
+        cells: array,
+        players: list[tuple[int, int]],
+        enemy_positions: list[tuple[int, int]],
+        enemy_indexes: list[int],
+    ) -> None:
+        self.cells = cells
+        """Chain id of every cell, row by row"""
+        self.players = players
+        """Player positions as `Control.player_positions` sees them"""
+        self.enemy_positions = enemy_positions
+        self.enemy_indexes = enemy_indexes
+        self.status = 0
+
+    def copy(self) -> "_State":
+        return _State(
+            array(self.cells.typecode, self.cells),
+            list(self.players),
+            list(self.enemy_positions),
+            list(self.enemy_indexes),
+        )
+
+    def get_key(self) -> bytes:
+        """
+        Digest of the state for the transposition table
+        """
+        digest = hashlib.blake2b(self.cells.tobytes(), digest_size=16)
+        digest.update(
+            repr((self.players, self.enemy_positions, self.enemy_indexes)).encode()
+        )
+        return digest.digest()
+
+
+class Solver:
+    """
+    Breadth-first search over whole game states (every cell's tiles, player and enemy positions, enemy path indexes),
+    stepping them with the same rules as `Engine.tick`: players move in `Control` order, then enemies in map order,
+    through `Engine.try_move_tile`, `Key`/`Lock` door swaps and every `interacted_with`.
+    """
+
+    def __init__(self, map: Map) -> None:
+        """
+        :param map: Map before the first tick, it's only read
+        :raises ValueError: An enemy moves at random, or the map has a tile the solver doesn't know
+        """
+        self.width = map.width
+        self.height = map.height
+        self.fingerprint = map.fingerprint()
+        enemies = map.get_tiles(Enemy)
+        enemy_numbers = {id(enemy): i for i, enemy in enumerate(enemies)}
+        self.enemy_paths: list[list[tuple[int, int]]] = []
+        for enemy in enemies:
+            if 0 < enemy.chance_to_move < 1:
+                raise ValueError(
+                    f"{enemy} moves at random, the solver only handles enemies that always or never move."
+                )
+            path = enemy.path if enemy.chance_to_move >= 1 else []
+            self.enemy_paths.append([direction.value for direction in path])
+        self.chains: list[Chain] = []
+        self.chain_ids: dict[Chain, int] = {}
+        self.door_cells: dict[Color, list[int]] = {}
+        # `Tile.pos` is only set once a game starts
+        enemy_positions = [(0, 0)] * len(enemies)
+        cells = array("I")
+        for y in range(self.height):
+            for x in range(self.width):
+                tile = map.get_tile(x, y)
+                if tile is not None and tile._auto_remove:
+                    # Removed by the engine before the first tick
+                    tile = tile.tile_under
+                chain: list[Token] = []
+                while tile is not None:
+                    if type(tile) not in _KNOWN_TILES:
+                        raise ValueError(
+                            f"The solver doesn't know the rules of {type(tile).__name__}."
+                        )
+                    if isinstance(tile, Enemy):
+                        enemy_positions[enemy_numbers[id(tile)]] = (x, y)
+                        chain.append(("Enemy", enemy_numbers[id(tile)]))
+                    else:
+                        chain.append(
+                            (
+                                type(tile).__name__,
+                                (
+                                    tile.get_color()
+                                    if isinstance(tile, HasColor)
+                                    else None
+                                ),
+                            )
+                        )
+                    if len(chain) <= 2 and isinstance(tile, (Door, DoorFrame)):
+                        self.door_cells.setdefault(tile.color, []).append(
+                            y * self.width + x
+                        )
+                    tile = tile.tile_under
+                cells.append(self._get_chain_id(tuple(chain)))
+        self.start = _State(
+            cells,
+            map.get_positions(Player),
+            enemy_positions,
+            [enemy.index for enemy in enemies],
+        )
+
+    def _get_chain_id(self, chain: Chain) -> int:
+        chain_id = self.chain_ids.get(chain)
+        if chain_id is None:
+            chain_id = self.chain_ids[chain] = len(self.chains)
+            self.chains.append(chain)
+        return chain_id
+
+    def _get(self, state: _State, index: int) -> Chain:
+        return self.chains[state.cells[index]]
+
+    def _set(self, state: _State, index: int, chain: Chain) -> None:
+        state.cells[index] = self._get_chain_id(chain)
+
+    def _try_move_tile(self, state: _State, x: int, y: int, dx: int, dy: int) -> bool:
+        """
+        `Engine.try_move_tile` on a state
+        """
+        target_x = x + dx
+        target_y = y + dy
+        if not (0 <= target_x < self.width and 0 <= target_y < self.height):
+            return False
+        target_index = target_y * self.width + target_x
+        target_chain = self._get(state, target_index)
+        if target_chain and target_chain[0][0] not in _TOUCHABLE:
+            return False
+        index = y * self.width + x
+        chain = self._get(state, index)
+        if not chain:
+            return False
+        tile = chain[0]
+        if tile[0] == "Enemy":
+            state.enemy_positions[tile[1]] = (target_x, target_y)  # type: ignore
+        self._set(state, target_index, (tile,) + target_chain)
+        self._set(state, index, chain[1:])
+        if target_chain:
+            self._interact(state, target_chain[0], tile, target_index)
+        return True
+
+    def _interact(self, state: _State, target: Token, tile: Token, index: int) -> None:
+        """
+        `interacted_with` of the target tile when a tile moves onto it
+        """
+        name, color = target
+        if tile[0] == "Player":
+            match name:
+                case "Key" | "Lock":
+                    self._set(state, index, (tile,))
+                    self._swap_doors(state, color, is_open=name == "Key")  # type: ignore
+                case "Spike" | "Enemy":
+                    state.status = _GAME_OVER
+                case "Exit":
+                    state.status = _VICTORY
+        elif tile[0] == "Enemy" and name == "Player":
+            state.status = _GAME_OVER
+
+    def _swap_doors(self, state: _State, color: Color, is_open: bool) -> None:
+        """
+        `Map.open_doors` and `Map.close_doors` on a state
+        """
+        door: Token = ("Door", color)
+        frame: Token = ("DoorFrame", color)
+        for index in self.door_cells.get(color, ()):
+            chain = self._get(state, index)
+            if not chain:
+                continue
+            if is_open:
+                if chain[0] == door:
+                    self._set(state, index, chain[1:])
+            elif chain[0] == frame:
+                self._set(state, index, (door,) + chain)
+            elif len(chain) > 1 and chain[1] == frame:
+                self._set(state, index, (chain[0], door) + chain[1:])
+
+    def step(self, state: _State, direction: Direction) -> _State:
+        """
+        Play one tick on a copy of a state
+        """
+        state = state.copy()
+        if direction != Direction.HALT:
+            dx, dy = direction.value
+            players: list[tuple[int, int]] = []
+            for x, y in state.players:
+                if self._try_move_tile(state, x, y, dx, dy):
+                    players.append((x + dx, y + dy))
+                else:
+                    players.append((x, y))
+            state.players = players
+        for i, path in enumerate(self.enemy_paths):
+            if not path:
+                continue
+            dx, dy = path[state.enemy_indexes[i]]
+            if dx or dy:
+                self._try_move_tile(state, *state.enemy_positions[i], dx, dy)
+            state.enemy_indexes[i] = (state.enemy_indexes[i] + 1) % len(path)
+        return state
+
+    def solve(
+        self,
+        max_states: int | None = DEFAULT_MAX_STATES,
+        stop_event: threading.Event | None = None,
+    ) -> list[Direction] | None:
+        """
+        :param max_states: Give up after visiting this many states, None for no limit
+        :param stop_event: Give up once it's set, defaults to searching until the end
+        :return: Shortest list of moves that wins, or None if the map can't be won (within `max_states`)
+        """
+        start_key = self.start.get_key()
+        parents: dict[bytes, tuple[bytes, Direction] | None] = {start_key: None}
+        frontier: deque[tuple[bytes, _State]] = deque([(start_key, self.start)])
+        while frontier:
+            if stop_event is not None and stop_event.is_set():
+                return None
+            key, state = frontier.popleft()
+            for direction in _MOVES:
+                next_state = self.step(state, direction)
+                if next_state.status == _GAME_OVER:
+                    continue
+                if next_state.status == _VICTORY:
+                    return self._get_moves(parents, key) + [direction]
+                next_key = next_state.get_key()
+                if next_key in parents:
+                    continue
+                parents[next_key] = (key, direction)
+                if max_states is not None and len(parents) > max_states:
+                    return None
+                frontier.append((next_key, next_state))
+        return None
+
+    def get_par(
+        self,
+        max_states: int | None = DEFAULT_MAX_STATES,
+        stop_event: threading.Event | None = None,
+    ) -> int | None:
+        """
+        Length of `solve`, solved once per map layout and `max_states` in a process
+
+        :param max_states: Give up after visiting this many states, None for no limit
+        :param stop_event: Give up once it's set, the result isn't remembered then
+        :return: Fewest ticks to win the map, None if it can't be won (within `max_states`)
+        """
+        key = (self.fingerprint, max_states)
+        if key not in _pars:
+            moves = self.solve(max_states, stop_event)
+            if stop_event is not None and stop_event.is_set():
+                return None
+            _pars[key] = None if moves is None else len(moves)
+        return _pars[key]
+
+    @staticmethod
+    def _get_moves(
+        parents: dict[bytes, tuple[bytes, Direction] | None], key: bytes
+    ) -> list[Direction]:
+        moves: list[Direction] = []
+        parent = parents[key]
+        while parent is not None:
+            key, direction = parent
+            moves.append(direction)
+            parent = parents[key]
+        moves.reverse()
+        return moves
+
+
+def solve(
+    map: Map, *, max_states: int | None = DEFAULT_MAX_STATES
+) -> list[Direction] | None:
+    """
+    Find the fewest moves that win a map
+
+    :param map: Map before the first tick, it's only read
+    :param max_states: Give up after visiting this many states, None for no limit
+    :raises ValueError: An enemy moves at random
+    :return: Moves of the players, one per tick, or None if the map can't be won
+    """
+    return Solver(map).solve(max_states)
+
+
+def get_par(map: Map, max_states: int | None = DEFAULT_MAX_STATES) -> int | None:
+    """
+    :param max_states: Give up after visiting this many states, None for no limit
+    :return: Fewest ticks to win a map, None if it can't be won or has enemies that move at random
+    """
+    try:
+        moves = solve(map, max_states=max_states)
+    except ValueError:
+        return None
+    return None if moves is None else len(moves)
+
+
+def get_map_par(map: Map, max_states: int | None = DEFAULT_MAX_STATES) -> int | None:
+    """
+    `get_par`, solved once per map layout and `max_states` in a process, shared with `Solver.get_par`
+    """
+    key = (map.fingerprint(), max_states)
+    if key not in _pars:
+        try:
+            solver = Solver(map)
+        except ValueError:
+            _pars[key] = None
+        else:
+            solver.get_par(max_states)
+    return _pars[key]
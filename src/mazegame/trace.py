@@ -0,0 +1,250 @@
+from bisect import bisect_right
+from dataclasses import dataclass, field
+import gzip
+import json
+from pathlib import Path
+
+from .color import Color
+from .map import (
+    Block,
+    ColoredBlock,
+    ColoredFloor,
+    Door,
+    Enemy,
+    Exit,
+    HasColor,
+    Key,
+    Lock,
+    Map,
+    Player,
+    Spike,
+    Tile,
+)
+
+DEFAULT_KEYFRAME_INTERVAL = 64
+FORMAT = "mazegame-trace"
+VERSION = 1
+
+LayerState = tuple
+"""(class name, color name or None), plus whether it's a boss for an enemy"""
+CellState = tuple[LayerState, ...]
+"""Layers of a cell, from the tile on top to the one at the bottom"""
+
+_COLORED_TILES: dict[str, type[Tile]] = {
+    cls.__name__: cls for cls in (ColoredFloor, ColoredBlock, Door, Key, Lock)
+}
+_PLAIN_TILES: dict[str, type[Tile]] = {
+    cls.__name__: cls for cls in (Block, Exit, Spike, Player)
+}
+
+
+def encode_cell(tile: Tile | None) -> CellState | None:
+    """
+    :return: What a cell looks like, None for floor
+    """
+    if tile is None:
+        return None
+    layers: list[LayerState] = []
+    _tile: Tile | None = tile
+    while _tile is not None:
+        layer: LayerState = (
+            type(_tile).__name__,
+            _tile.get_color().name if isinstance(_tile, HasColor) else None,
+        )
+        if isinstance(_tile, Enemy):
+            layer += (_tile.boss,)
+        layers.append(layer)
+        _tile = _tile.tile_under
+    return tuple(layers)
+
+
+def _decode_layer(layer: LayerState, tile_under: Tile | None) -> Tile:
+    name, color_name = layer[:2]
+    if name == "DoorFrame":
+        return Door(Color[color_name]).tile_under  # type: ignore
+    if name == "Enemy":
+        tile: Tile = Enemy([], boss=layer[2])
+    elif name in _COLORED_TILES:
+        tile = _COLORED_TILES[name](Color[color_name])  # type: ignore
+    elif name in _PLAIN_TILES:
+        tile = _PLAIN_TILES[name]()
+    else:
+        raise ValueError(f"Unknown tile {name!r} in trace.")
+    # A door comes with its own frame under it
+    if not isinstance(tile, Door):
+        tile.tile_under = tile_under
+    return tile
+
+
+def decode_cell(cell: CellState | None) -> Tile | None:
+    """
+    Build tiles that look like an encoded cell. Enemies have no path, the trace only records what's on screen.
+
+    :return: Tile, or None for floor
+    """
+    if cell is None:
+        return None
+    tile: Tile | None = None
+    for layer in reversed(cell):
+        tile = _decode_layer(layer, tile)
+    return tile
+
+
+def encode_map(map: Map) -> dict[tuple[int, int], CellState]:
+    """
+    :return: Every cell that isn't floor by position
+    """
+    return {
+        pos: cell
+        for pos, tile in map.iter_cells()
+        if (cell := encode_cell(tile)) is not None
+    }
+
+
+@dataclass
+class Trace:
+    """
+    What the map looked like through a run: the whole map every `keyframe_interval` ticks,
+    and the cells each tick changed in between.
+    """
+
+    width: int
+    height: int
+    keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL
+    keyframe_ticks: list[int] = field(default_factory=list)
+    """Tick of each keyframe, in order"""
+    keyframes: list[dict[tuple[int, int], CellState]] = field(default_factory=list)
+    deltas: list[list[tuple[tuple[int, int], CellState | None]]] = field(
+        default_factory=list
+    )
+    """Cells changed by each tick, `deltas[i]` leads from tick i to tick i + 1"""
+
+    def __len__(self) -> int:
+        """
+        :return: Number of ticks recorded
+        """
+        return len(self.deltas)
+
+    def seek(self, tick: int) -> dict[tuple[int, int], CellState]:
+        """
+        Rebuild the map of a tick from the last keyframe before it
+
+        :param tick: Tick to look at, 0 for before the first tick
+        :raises IndexError: The tick wasn't recorded
+        :return: Every cell that isn't floor by position
+        """
+        if not self.keyframe_ticks or not 0 <= tick <= len(self):
+            raise IndexError(f"Tick {tick} is not in the trace.")
+        index = bisect_right(self.keyframe_ticks, tick) - 1
+        cells = dict(self.keyframes[index])
+        for delta in self.deltas[self.keyframe_ticks[index] : tick]:
+            for pos, cell in delta:
+                if cell is None:
+                    cells.pop(pos, None)
+                else:
+                    cells[pos] = cell
+        return cells
+
+    def get_map(self, tick: int) -> Map:
+        """
+        :param tick: Tick to look at, 0 for before the first tick
+        :return: New map that looks like the map of the tick
+        """
+        cells = self.seek(tick)
+        return Map(
+            [
+                [decode_cell(cells.get((x, y))) for x in range(self.width)]
+                for y in range(self.height)
+            ]
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "format": FORMAT,
+            "version": VERSION,
+            "width": self.width,
+            "height": self.height,
+            "keyframe_interval": self.keyframe_interval,
+            "keyframe_ticks": self.keyframe_ticks,
+            "keyframes": [
+                [[x, y, cell] for (x, y), cell in keyframe.items()]
+                for keyframe in self.keyframes
+            ],
+            "deltas": [
+                [[x, y, cell] for (x, y), cell in delta] for delta in self.deltas
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Trace":
+        """
+        :raises ValueError: It isn't a trace, or one from another version
+        """
+        if data.get("format") != FORMAT:
+            raise ValueError("Not a trace.")
+        if data.get("version") != VERSION:
+            raise ValueError(f"Unsupported trace version {data.get('version')}.")
+
+        def to_cell(cell: list | None) -> CellState | None:
+            return None if cell is None else tuple(tuple(layer) for layer in cell)
+
+        return cls(
+            data["width"],
+            data["height"],
+            data["keyframe_interval"],
+            data["keyframe_ticks"],
+            [
+                {(x, y): to_cell(cell) for x, y, cell in keyframe}  # type: ignore
+                for keyframe in data["keyframes"]
+            ],
+            [
+                [((x, y), to_cell(cell)) for x, y, cell in delta]
+                for delta in data["deltas"]
+            ],
+        )
+
+    def save(self, path: Path) -> None:
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            json.dump(self.to_json(), file, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: Path) -> "Trace":
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            return cls.from_json(json.load(file))
+
+
+class TraceRecorder:
+    """
+    Write a map's changes into a trace, one tick at a time
+    """
+
+    def __init__(
+        self, map: Map, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL
+    ) -> None:
+        """
+        :param map: Map to record, its current state is the first keyframe
+        :param keyframe_interval: Ticks between keyframes
+        """
+        if keyframe_interval < 1:
+            raise ValueError("Keyframe interval must be at least 1.")
+        self.map = map
+        self.trace = Trace(map.width, map.height, keyframe_interval)
+        self.changed_cells = map.track_changes()
+        self.trace.keyframe_ticks.append(0)
+        self.trace.keyframes.append(encode_map(map))
+
+    def record_tick(self) -> None:
+        """
+        Record the cells changed since the previous tick, and a keyframe if one is due
+        """
+        self.trace.deltas.append(
+            [
+                (pos, encode_cell(self.map.get_tile(*pos)))
+                for pos in sorted(self.changed_cells)
+            ]
+        )
+        self.changed_cells.clear()
+        tick = len(self.trace)
+        if tick % self.trace.keyframe_interval == 0:
+            self.trace.keyframe_ticks.append(tick)
+            self.trace.keyframes.append(encode_map(self.map))
@@ -0,0 +1,101 @@
+"""
+Scrub through a recorded trace.
+
+Usage: python -m mazegame.trace_viewer run.trace [--tick N]
+"""
+
+import argparse
+from pathlib import Path
+
+import pygame
+
+from .clock import VirtualClock
+from .game import Game
+from .map import Enemy, Player
+from .trace import CellState, Trace, decode_cell
+
+
+class TraceViewer:
+    """
+    Show any tick of a trace with the game's renderer.
+    Left/Right step one tick, Page Up/Page Down one keyframe interval, Home/End go to the first/last tick.
+    """
+
+    def __init__(self, trace: Trace) -> None:
+        self.trace = trace
+        self.tick = 0
+        self.cells: dict[tuple[int, int], CellState] = trace.seek(0)
+        # The game is only used to draw, it never ticks
+        self.game = Game(trace.get_map(0), VirtualClock())
+
+    def seek(self, tick: int) -> list[pygame.Rect] | None:
+        """
+        Show a tick, only the cells that differ from the shown tick are rebuilt and redrawn
+
+        :param tick: Tick to show, clamped to the trace
+        :return: Screen areas that were redrawn, or None if it's the whole screen
+        """
+        self.tick = min(max(tick, 0), len(self.trace))
+        cells = self.trace.seek(self.tick)
+        game = self.game
+        for pos in self.cells.keys() | cells.keys():
+            cell = cells.get(pos)
+            if self.cells.get(pos) == cell:
+                continue
+            tile = decode_cell(cell)
+            if tile is not None:
+                game._init_tile(tile, pos)
+            game.map.set_tile(*pos, tile)
+        self.cells = cells
+        game.players = game.map.get_tiles(Player)
+        game.enemies = game.map.get_tiles(Enemy)
+        pygame.display.set_caption(
+            f"{Game.TITLE} (trace, tick {self.tick}/{len(self.trace)})"
+        )
+        return game._update_gameplay()
+
+    def run(self, tick: int = 0) -> None:
+        """
+        Show the trace until the window is closed
+
+        :param tick: Tick to show first
+        """
+        pygame.display.update(self.seek(tick))
+        while True:
+            # Nothing moves until a key is pressed, sleep until something happens
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                self.game.teardown()
+                return
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.game.is_full_redraw = True
+                pygame.display.update(self.seek(self.tick))
+            elif event.type == pygame.KEYDOWN:
+                match event.key:
+                    case pygame.K_RIGHT:
+                        tick = self.tick + 1
+                    case pygame.K_LEFT:
+                        tick = self.tick - 1
+                    case pygame.K_PAGEDOWN:
+                        tick = self.tick + self.trace.keyframe_interval
+                    case pygame.K_PAGEUP:
+                        tick = self.tick - self.trace.keyframe_interval
+                    case pygame.K_HOME:
+                        tick = 0
+                    case pygame.K_END:
+                        tick = len(self.trace)
+                    case _:
+                        continue
+                pygame.display.update(self.seek(tick))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scrub through a recorded trace.")
+    parser.add_argument("trace", type=Path, help="Trace saved with `Trace.save`")
+    parser.add_argument("--tick", type=int, default=0, help="Tick to show first")
+    args = parser.parse_args()
+    TraceViewer(Trace.load(args.trace)).run(args.tick)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,16 @@ from . import (
     test_door,
     test_enemy,
     test_maps,
+    test_headless,
+    test_grader,
+    test_dirty_render,
+    test_preview,
+    test_clock,
+    test_move_log,
+    test_seed,
+    test_trace,
+    test_solver,
+    test_exit_distance,
 )
 
 ALL: tuple[__ModuleType, ...] = (
@@ -15,4 +25,14 @@ ALL: tuple[__ModuleType, ...] = (
     test_door,
     test_enemy,
     test_maps,
+    test_headless,
+    test_grader,
+    test_dirty_render,
+    test_preview,
+    test_clock,
+    test_move_log,
+    test_seed,
+    test_trace,
+    test_solver,
+    test_exit_distance,
 )
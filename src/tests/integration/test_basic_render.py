@@ -20,6 +20,11 @@ from mazegame.map import (
     Spike,
 )
 from mazegame.api.run import _test_run
+from mazegame.session import pygame_session
+
+
+def setUpModule() -> None:
+    unittest.enterModuleContext(pygame_session())
 
 
 def empty_script():
@@ -0,0 +1,81 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+
+import unittest
+from unittest import mock
+import pygame
+from mazegame import *
+from mazegame.api.game_obj import set_game
+from mazegame.api.run import _start_script, _test_run
+from mazegame.clock import VirtualClock
+from mazegame.game import Game, GameState
+from mazegame.map import Exit, Map, Player, Spike
+from mazegame.session import pygame_session
+
+
+def setUpModule() -> None:
+    unittest.enterModuleContext(pygame_session())
+
+
+def script():
+    for _ in range(30):
+        move(HALT)
+    move(RIGHT)
+
+
+class TestClock(unittest.TestCase):
+
+    def test_virtual_clock(self) -> None:
+        clock = VirtualClock(5)
+        self.assertEqual(clock.tick(120), 5)
+        self.assertEqual(clock.tick(), 5)
+        self.assertEqual(clock.time_ms, 10)
+
+    def test_test_run_never_sleeps(self) -> None:
+        with mock.patch.object(pygame.time, "Clock", side_effect=AssertionError):
+            game = _test_run(script, Map([[Player(), Exit()]]), exit_on_tick=31)
+        self.assertEqual(game.state, GameState.VICTORY)
+        self.assertEqual(game.tick_count, 31)
+
+    def test_several_ticks_per_frame(self) -> None:
+        game = Game(Map([[Player(), Exit()]]), VirtualClock(10))
+        game.MSPT = 1  # type: ignore
+        game._exit_on_tick = 25
+        set_game(game)
+        _start_script(script)
+        try:
+            self.assertFalse(game.update())
+            self.assertEqual(game.tick_count, 0)
+            self.assertFalse(game.update())
+            self.assertEqual(game.tick_count, 10)
+            self.assertFalse(game.update())
+            self.assertEqual(game.tick_count, 20)
+            self.assertTrue(game.update())
+            self.assertEqual(game.tick_count, 25)
+            self.assertEqual(game.state, GameState.GAMEPLAY)
+        finally:
+            game.teardown()
+
+    def test_game_over_transition(self) -> None:
+        def die():
+            move(RIGHT)
+
+        # Frames as slow as precomputing the blur on a slow machine
+        game = Game(Map([[Player(), Spike()]]), VirtualClock(400))
+        game.MSPT = 1  # type: ignore
+        set_game(game)
+        _start_script(die)
+        try:
+            while game.state == GameState.GAMEPLAY:
+                self.assertFalse(game.update())
+            # The frame that precomputed the blur isn't part of the transition
+            self.assertEqual(game.tick_delta_ms, 0)
+            self.assertFalse(game.update())
+            self.assertEqual(game.tick_delta_ms, 400)
+        finally:
+            game.teardown()
+
+
+if __name__ == "__main__":
+    unittest.main()
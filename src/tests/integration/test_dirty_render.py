@@ -0,0 +1,101 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+
+import unittest
+import pygame
+from mazegame import *
+from mazegame.color import Color
+from mazegame.direction import Direction
+from mazegame.background import Background
+from mazegame.game import Game
+from mazegame.map import (
+    Block,
+    Door,
+    Enemy,
+    Exit,
+    Key,
+    Lock,
+    Map,
+    Player,
+)
+from mazegame.api.game_obj import set_game
+from mazegame.api.run import _start_script
+from mazegame.session import pygame_session
+
+
+def setUpModule() -> None:
+    unittest.enterModuleContext(pygame_session())
+
+
+def get_map() -> Map:
+    return Map(
+        [
+            [Player(), Key(Color.RED), Door(Color.RED), Lock(Color.RED), Exit()],
+            [Block(), Door(Color.RED), None, None, Enemy([Direction.LEFT] * 3)],
+        ]
+    )
+
+
+def script():
+    for direction in [RIGHT, RIGHT, HALT, RIGHT, HALT]:
+        yield direction
+
+
+def render_frames(
+    is_dirty_rect: bool, *, is_check_background: bool = False
+) -> tuple[list[bytes], list[int | None]]:
+    """
+    Render frames at a fixed frame time
+
+    :return: Every frame's pixels and the number of redrawn areas (None for the whole screen)
+    """
+    game = Game(get_map())
+    game.DIRTY_RECT_RENDER = is_dirty_rect
+    set_game(game)
+    _start_script(script)
+    frames: list[bytes] = []
+    rect_counts: list[int | None] = []
+    try:
+        for _ in range(30):
+            rects = game._update_gameplay()
+            frames.append(pygame.image.tobytes(game.display_surface, "RGB"))
+            rect_counts.append(None if rects is None else len(rects))
+            game.tick_delta_ms += game.MSPT / 4 + 1
+            if is_check_background:
+                background = Background(game.map, game.tile_size, game.floor_surface)
+                assert pygame.image.tobytes(
+                    background.surface, "RGB"
+                ) == pygame.image.tobytes(game.background.surface, "RGB")
+    finally:
+        game.teardown()
+    return frames, rect_counts
+
+
+class TestDirtyRender(unittest.TestCase):
+
+    def test_same_frames_as_full_render(self) -> None:
+        full_frames, _ = render_frames(False)
+        dirty_frames, rect_counts = render_frames(True)
+        self.assertEqual(len(full_frames), len(dirty_frames))
+        for i, (full_frame, dirty_frame) in enumerate(zip(full_frames, dirty_frames)):
+            self.assertEqual(full_frame, dirty_frame, f"Frame {i} is different.")
+        self.assertIsNone(rect_counts[0])
+        self.assertLess(max(count or 0 for count in rect_counts), 10)
+
+    def test_background_follows_map(self) -> None:
+        render_frames(True, is_check_background=True)
+
+    def test_idle_frame_redraws_nothing(self) -> None:
+        game = Game(Map([[Player(), None, Exit()]]))
+        try:
+            self.assertIsNone(game._update_gameplay())
+            self.assertEqual(game._update_gameplay(), [])
+            game.is_full_redraw = True
+            self.assertIsNone(game._update_gameplay())
+        finally:
+            game.teardown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import sys
+
+
+sys.path.append("./src")  # noqa
+
+import unittest
+from mazegame import *
+from mazegame.api.game_obj import get_game
+from mazegame.color import Color
+from mazegame.direction import Direction
+from mazegame.engine import GameState
+from mazegame.map import Block, Door, Enemy, Exit, Key, Lock, Map, Player, Spike
+
+
+def get_map() -> Map:
+    return Map(
+        [
+            [Player(), None, None, Block(), Exit()],
+            [Block(), Block(), None, Block(), Door(Color.RED)],
+            [Key(Color.RED), None, None, None, None],
+        ]
+    )
+
+
+class TestExitDistance(unittest.TestCase):
+
+    def test_distance_to_exit(self) -> None:
+        distances: list[tuple[int | None, ...]] = []
+
+        def script():
+            for direction in [RIGHT, RIGHT, DOWN, DOWN, LEFT, LEFT, RIGHT]:
+                distances.append(
+                    tuple(distance_to_exit(d) for d in (HALT, LEFT, RIGHT, DOWN))
+                )
+                move(direction)
+            distances.append((distance_to_exit(),))
+
+        game = simulate(script, get_map())
+        # The door keeps the exit out of reach until the key opens it
+        self.assertEqual(
+            distances,
+            [(None, None, None, None)] * 6 + [(6, None, 5, None), (5,)],
+        )
+        self.assertEqual(game.state, GameState.GAMEPLAY)
+
+    def test_distance_follows_doors(self) -> None:
+        distances: list[int | None] = []
+
+        def script():
+            distances.append(distance_to_exit())
+            move(RIGHT)
+            distances.append(distance_to_exit())
+            move(RIGHT)
+            distances.append(distance_to_exit())
+
+        map = Map(
+            [[Player(), Key(Color.RED), Lock(Color.RED), Door(Color.RED), Exit()]]
+        )
+        simulate(script, map)
+        # Closed, opened by the key, closed again by the lock
+        self.assertEqual(distances, [None, 3, None])
+
+    def test_walk_to_exit(self) -> None:
+        def script():
+            walk_to_exit()
+
+        map = Map(
+            [
+                [Player(), None, Block(), None, None],
+                [None, None, Block(), None, Spike()],
+                [None, None, None, None, Exit()],
+            ]
+        )
+        game = simulate(script, map)
+        self.assertEqual(game.state, GameState.VICTORY)
+        self.assertEqual(game.tick_count, 6)
+
+    def test_walk_stops_when_stuck(self) -> None:
+        after_walk: list[tuple[int, int | None]] = []
+
+        def script():
+            walk_to_exit()
+            after_walk.append((get_game().tick_count, distance_to_exit()))
+            move(LEFT)
+
+        map = Map(
+            [
+                [
+                    Player(),
+                    None,
+                    None,
+                    Lock(Color.RED),
+                    Door(Color.RED, open=True),
+                    None,
+                    Exit(),
+                ]
+            ]
+        )
+        game = simulate(script, map)
+        # The script only gets a turn again once the lock closed the door, not after every move
+        self.assertEqual(after_walk, [(4, None)])
+        self.assertEqual(game.move_log.get(3)[0], Direction.LEFT)
+        self.assertEqual(game.players[0].pos, (2, 0))
+
+    def test_walk_to_exit_with_enemy(self) -> None:
+        def script():
+            walk_to_exit()
+
+        map = Map([[Player(), None, Enemy([]), Exit()]])
+        game = simulate(script, map)
+        self.assertEqual(game.state, GameState.GAME_OVER)
+
+    def test_walk_to_exit_generator(self) -> None:
+        def script():
+            walk_to_exit()
+            yield RIGHT
+
+        with self.assertRaises(ValueError):
+            simulate(script, get_map())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,195 @@
+import sys
+
+
+sys.path.append("./src")  # noqa
+
+import csv
+from pathlib import Path
+import tempfile
+import textwrap
+import threading
+import unittest
+from unittest import mock
+from mazegame.grader import grade, grade_all, write_results
+from mazegame.result_cache import ResultCache
+
+SCRIPTS = {
+    "solved": """
+        from mazegame import *
+
+
+        def script():
+            for _ in range(4):
+                move(UP)
+
+
+        run(script, TUTORIAL1)
+        """,
+    "generator": """
+        from mazegame import *
+
+
+        def script():
+            while get_tile(UP) != EXIT:
+                yield UP
+            yield UP
+        """,
+    "unfinished": """
+        from mazegame import *
+
+
+        def script():
+            move(UP)
+        """,
+    "crash": """
+        from mazegame import *
+
+
+        def script():
+            move(UP)
+            raise ValueError("oops")
+        """,
+    "stuck": """
+        from mazegame import *
+
+
+        def script():
+            while get_tile(UP) != ENEMY:
+                pass
+        """,
+}
+
+
+class TestGrader(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name)
+        for name, source in SCRIPTS.items():
+            (self.dir / f"{name}.py").write_text(textwrap.dedent(source))
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_grade(self) -> None:
+        result = grade(self.dir / "solved.py", "TUTORIAL1", 0)
+        self.assertEqual(result.outcome, "victory")
+        self.assertEqual(result.tick_count, 4)
+        self.assertEqual(result.par, 4)
+        result = grade(self.dir / "generator.py", "TUTORIAL1", 0)
+        self.assertEqual(result.outcome, "victory")
+        self.assertEqual(result.tick_count, 4)
+        result = grade(self.dir / "unfinished.py", "TUTORIAL1", 0)
+        self.assertEqual(result.outcome, "incomplete")
+        result = grade(self.dir / "crash.py", "TUTORIAL1", 0)
+        self.assertEqual(result.outcome, "error")
+        self.assertEqual(result.reason, "ValueError: oops")
+
+    def test_grade_timeout(self) -> None:
+        threads = set(threading.enumerate())
+        result = grade(self.dir / "stuck.py", "TUTORIAL1", 0, turn_timeout=0.1)
+        self.assertEqual(result.outcome, "timeout")
+        # Its next look at the map ends the script, it doesn't keep polling
+        for thread in set(threading.enumerate()) - threads:
+            thread.join(1)
+            self.assertFalse(thread.is_alive())
+
+    def test_grade_cache(self) -> None:
+        cache = ResultCache(self.dir / "cache")
+        result = grade(self.dir / "solved.py", "TUTORIAL1", 0, cache=cache)
+        self.assertEqual(result.outcome, "victory")
+        # Same source under another name, nothing is run
+        (self.dir / "resubmitted.py").write_text((self.dir / "solved.py").read_text())
+        with (
+            mock.patch("mazegame.grader.simulate") as simulate,
+            mock.patch("mazegame.grader.get_map_par") as get_map_par,
+        ):
+            cached = grade(self.dir / "resubmitted.py", "TUTORIAL1", 0, cache=cache)
+        simulate.assert_not_called()
+        get_map_par.assert_not_called()
+        self.assertEqual(cached.script, str(self.dir / "resubmitted.py"))
+        self.assertEqual(
+            (cached.outcome, cached.tick_count, cached.par), ("victory", 4, 4)
+        )
+        with mock.patch("mazegame.grader.simulate", side_effect=ValueError) as simulate:
+            grade(self.dir / "solved.py", "TUTORIAL1", 0, seed=1, cache=cache)
+            grade(self.dir / "solved.py", "TUTORIAL1", 0, max_ticks=2, cache=cache)
+            grade(self.dir / "generator.py", "TUTORIAL1", 0, cache=cache)
+        self.assertEqual(simulate.call_count, 3)
+        # Errors may come from the machine rather than the script
+        grade(self.dir / "crash.py", "TUTORIAL1", 0, cache=cache)
+        self.assertEqual(len(list(cache.directory.glob("*.json"))), 1)
+
+    def test_grade_all(self) -> None:
+        script_paths = [self.dir / "solved.py", self.dir / "unfinished.py"]
+        results = grade_all(script_paths, ["TUTORIAL1", "NIGHTMARE1"], workers=2)
+        self.assertEqual(len(results), 4)
+        output = self.dir / "results.csv"
+        write_results(results, output)
+        with open(output, newline="") as file:
+            rows = list(csv.DictReader(file))
+        self.assertEqual(
+            [(Path(row["script"]).stem, row["map"], row["outcome"]) for row in rows],
+            [
+                ("solved", "NIGHTMARE1", "incomplete"),
+                ("solved", "TUTORIAL1", "victory"),
+                ("unfinished", "NIGHTMARE1", "incomplete"),
+                ("unfinished", "TUTORIAL1", "incomplete"),
+            ],
+        )
+
+    def test_grade_all_timeout(self) -> None:
+        (self.dir / "a_spinning.py").write_text(textwrap.dedent("""
+            import threading
+
+
+            def script():
+                threading.current_thread().name = "spinning"
+                while True:
+                    pass
+            """))
+        (self.dir / "b_probe.py").write_text(textwrap.dedent("""
+            import threading
+
+
+            def script():
+                names = [thread.name for thread in threading.enumerate()]
+                raise RuntimeError(f"spinning: {'spinning' in names}")
+            """))
+        script_paths = [self.dir / "a_spinning.py", self.dir / "b_probe.py"]
+        results = grade_all(script_paths, ["TUTORIAL1"], workers=1, turn_timeout=0.1)
+        self.assertEqual(
+            [(result.outcome, result.reason) for result in results],
+            [
+                ("timeout", mock.ANY),
+                # The timed out script didn't follow it into the next run
+                ("error", "RuntimeError: spinning: False"),
+            ],
+        )
+
+    def test_grade_all_run_timeout(self) -> None:
+        # Generator scripts run on the worker's own thread, out of reach of the turn timeout
+        (self.dir / "a_stuck_generator.py").write_text(textwrap.dedent("""
+            from mazegame import *
+
+
+            def script():
+                while get_tile(UP) != ENEMY:
+                    pass
+                yield UP
+            """))
+        script_paths = [self.dir / "a_stuck_generator.py", self.dir / "solved.py"]
+        results = grade_all(
+            script_paths, ["TUTORIAL1"], workers=1, turn_timeout=0.1, run_timeout=0.5
+        )
+        self.assertEqual(
+            [(result.outcome, result.reason) for result in results],
+            [
+                ("timeout", "The run took longer than 0.5 seconds."),
+                ("victory", ""),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
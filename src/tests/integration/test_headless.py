@@ -0,0 +1,182 @@
+import sys
+
+
+sys.path.append("./src")  # noqa
+
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from mazegame import *
+from mazegame.direction import Direction
+from mazegame.engine import Engine, GameState
+from mazegame.game import Game
+from mazegame.color import Color
+from mazegame.map import (
+    Door,
+    DoorFrame,
+    Enemy,
+    Exit,
+    Key,
+    Map,
+    Player,
+    Spike,
+)
+from mazegame.api.run import _test_run, simulate
+from mazegame.session import pygame_session
+
+
+def setUpModule() -> None:
+    unittest.enterModuleContext(pygame_session())
+
+
+def empty_script():
+    pass
+
+
+class TestHeadless(unittest.TestCase):
+
+    def test_win(self) -> None:
+        def script():
+            move(RIGHT)
+            move(RIGHT)
+
+        game = simulate(script, Map([[Player(), None, Exit()]]))
+        self.assertNotIsInstance(game, Game)
+        self.assertEqual(game.state, GameState.VICTORY)
+        self.assertEqual(game.tick_count, 2)
+
+    def test_run_into_spike(self) -> None:
+        def script():
+            move(RIGHT)
+
+        game = simulate(script, Map([[Player(), Spike()]]))
+        self.assertEqual(game.state, GameState.GAME_OVER)
+        self.assertEqual(game.game_over_reason, "You ran into a spike.")
+
+    def test_script_end(self) -> None:
+        def script():
+            move(RIGHT)
+
+        game = simulate(script, Map([[Player(), None, Exit()]]))
+        self.assertEqual(game.state, GameState.GAMEPLAY)
+        self.assertIsInstance(game.map.map[0][1], Player)
+
+    def test_enemy_run_into_player(self) -> None:
+        map = Map([[Player(), Enemy(path=[Direction.LEFT])]])
+        game = simulate(empty_script, map)
+        self.assertEqual(game.state, GameState.GAME_OVER)
+        self.assertEqual(game.tick_count, 1)
+
+    def test_max_ticks(self) -> None:
+        def script():
+            while True:
+                move(HALT)
+
+        game = simulate(script, Map([[Player(), None, Exit()]]), max_ticks=50)
+        self.assertEqual(game.state, GameState.GAMEPLAY)
+        self.assertEqual(game.tick_count, 50)
+
+    def test_move_after_end(self) -> None:
+        threads: list[threading.Thread] = []
+
+        def script():
+            threads.append(threading.current_thread())
+            while True:
+                move(HALT)
+
+        simulate(script, Map([[Player(), None, Exit()]]), max_ticks=5)
+        # Moving once the game is over ends the script instead of returning
+        threads[0].join(1)
+        self.assertFalse(threads[0].is_alive())
+
+    def test_parallel_games(self) -> None:
+        def run_corridor(length: int) -> Engine:
+            def script():
+                for _ in range(length):
+                    move(RIGHT)
+
+            return simulate(script, Map([[Player()] + [None] * (length - 1) + [Exit()]]))
+
+        lengths = list(range(1, 33))
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            games = list(pool.map(run_corridor, lengths))
+        for length, game in zip(lengths, games):
+            self.assertEqual(game.state, GameState.VICTORY)
+            self.assertEqual(game.tick_count, length)
+
+    def test_generator_script(self) -> None:
+        def script():
+            yield RIGHT
+            if get_tile(RIGHT) == EXIT:
+                yield RIGHT
+
+        game = simulate(script, Map([[Player(), None, Exit()]]))
+        self.assertEqual(game.state, GameState.VICTORY)
+        self.assertEqual(game.tick_count, 2)
+
+    def test_generator_script_end(self) -> None:
+        def script():
+            yield RIGHT
+
+        game = simulate(script, Map([[Player(), None, None, Exit()]]))
+        self.assertEqual(game.state, GameState.GAMEPLAY)
+        self.assertEqual(game.tick_count, 2)
+        self.assertIsInstance(game.map.map[0][1], Player)
+
+    def test_generator_script_rendered(self) -> None:
+        def script():
+            yield RIGHT
+            yield HALT
+
+        game = _test_run(script, Map([[Player(), None, Exit()]]), exit_on_tick=2)
+        self.assertEqual(game.state, GameState.GAMEPLAY)
+        self.assertIsInstance(game.map.map[0][1], Player)
+
+    def test_generator_script_error(self) -> None:
+        def script():
+            yield RIGHT
+            raise RuntimeError("script error")
+
+        with self.assertRaises(RuntimeError):
+            simulate(script, Map([[Player(), None, Exit()]]))
+
+    def test_same_end_state_as_game(self) -> None:
+        def get_map() -> Map:
+            return Map(
+                [
+                    [
+                        Door(Color.BLUE),
+                        Door(Color.RED),
+                        Door(Color.RED, open=True),
+                        Player(),
+                        Key(Color.RED),
+                    ],
+                    [
+                        Enemy(path=[Direction.RIGHT, Direction.LEFT]),
+                        None,
+                        None,
+                        None,
+                        None,
+                    ],
+                ]
+            )
+
+        def script():
+            move(RIGHT)
+            move(HALT)
+            move(HALT)
+
+        game = _test_run(script, get_map(), exit_on_tick=3)
+        engine = simulate(script, get_map(), max_ticks=3)
+        self.assertEqual(engine.state, game.state)
+        self.assertEqual(engine.tick_count, game.tick_count)
+        for engine_row, game_row in zip(engine.map.map, game.map.map):
+            self.assertEqual(
+                [type(tile) for tile in engine_row], [type(tile) for tile in game_row]
+            )
+        self.assertIsInstance(engine.map.map[0][1], DoorFrame)
+        self.assertIsInstance(engine.map.map[1][1], Enemy)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,16 +1,25 @@
 import sys
-from typing import cast
+from typing import Callable, cast
 
 
 sys.path.append("./src")  # noqa
 
 import os
 import unittest
-import inspect
 from mazegame import *
 from mazegame.map import CustomMapType  # noqa
 from mazegame.api.run import _test_run
 from mazegame.api import maps as _maps
+from mazegame.reachability import validate_map
+from mazegame.session import pygame_session
+
+
+def setUpModule() -> None:
+    unittest.enterModuleContext(pygame_session())
+
+
+_INVALID_MAPS = {"NIGHTMARE2"}
+"""Maps that can only be won by bending the rules"""
 
 
 def empty_script():
@@ -18,14 +27,35 @@ def empty_script():
 
 
 class TestMaps(unittest.TestCase):
-    def test_all_maps(self):
-        all_maps = inspect.getmembers(_maps, inspect.isfunction)
-        for map_name, map in all_maps:
-            try:
-                map = cast(CustomMapType, map)
-                _test_run(empty_script, map()[0], exit_on_tick=1)
-            except:
-                self.fail(f"{map_name} failed to start.")
+
+    def test_maps_are_valid(self) -> None:
+        for map_name in _maps.__all__:
+            if map_name in _INVALID_MAPS:
+                continue
+            for variant, map in enumerate(getattr(_maps, map_name)()[0]):
+                self.assertEqual(validate_map(map), [], f"{map_name} {variant + 1}")
+
+
+def make_variant_test(map_name: str, variant: int) -> Callable[[TestMaps], None]:
+    """
+    :return: Test that starts one variant of a map on a fresh copy of it
+    """
+
+    def test(self: TestMaps) -> None:
+        map = cast(CustomMapType, getattr(_maps, map_name))
+        _test_run(empty_script, map()[0][variant], exit_on_tick=1)
+
+    return test
+
+
+# One test case per (map factory, variant) so every variant is covered and they can run in parallel
+for map_name in _maps.__all__:
+    for variant in range(len(getattr(_maps, map_name)()[0])):
+        setattr(
+            TestMaps,
+            f"test_{map_name.lower()}_{variant + 1}",
+            make_variant_test(map_name, variant),
+        )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+import sys
+
+
+sys.path.append("./src")  # noqa
+
+import random
+import unittest
+from mazegame import *
+from mazegame.color import Color
+from mazegame.direction import Direction
+from mazegame.engine import GameState
+from mazegame.map import Door, Enemy, Exit, Key, Map, Player
+from mazegame.move_log import MoveLog
+
+
+def get_map() -> Map:
+    return Map(
+        [
+            [Player(), None, Key(Color.RED), None, Door(Color.RED), None, Exit()],
+            [
+                Enemy([Direction.RIGHT] * 3 + [Direction.LEFT] * 3, 0.5),
+                None,
+                None,
+                None,
+                Enemy([Direction.UP, Direction.DOWN], 0.3),
+                Enemy([Direction.HALT]),
+                None,
+            ],
+        ]
+    )
+
+
+def script():
+    for direction in [HALT, RIGHT, HALT, RIGHT, RIGHT, LEFT, RIGHT, RIGHT, RIGHT]:
+        yield direction
+
+
+class TestMoveLog(unittest.TestCase):
+
+    def test_round_trip(self) -> None:
+        log = MoveLog(bytes(range(16)), 42, 9)
+        ticks = [
+            (Direction.UP, [True] * 9),
+            (Direction.HALT, [False] * 9),
+            (Direction.LEFT, [i % 3 == 0 for i in range(9)]),
+        ]
+        for direction, draws in ticks:
+            log.append(direction.value, draws)
+        self.assertEqual(log.tick_size, 3)
+        self.assertEqual(len(log.ticks), 9)
+        loaded = MoveLog.from_bytes(log.to_bytes())
+        self.assertEqual(loaded, log)
+        self.assertEqual([loaded.get(tick) for tick in range(len(loaded))], ticks)
+        self.assertIsNone(
+            MoveLog.from_bytes(MoveLog(bytes(16), None, 0).to_bytes()).seed
+        )
+        with self.assertRaises(ValueError):
+            MoveLog.from_bytes(b"MZML")
+        with self.assertRaises(ValueError):
+            MoveLog.from_bytes(log.to_bytes()[:-1])
+
+    def test_replay_matches_run(self) -> None:
+        for seed in range(10):
+            random.seed(seed)
+            game = simulate(script, get_map())
+            log = MoveLog.from_bytes(game.move_log.to_bytes())
+            self.assertEqual(len(log), game.tick_count)
+            self.assertEqual(log.tick_size, 2)
+            random.seed(seed + 100)
+            replayed = replay(log, get_map())
+            self.assertEqual(replayed.state, game.state)
+            self.assertEqual(replayed.tick_count, game.tick_count)
+            self.assertEqual(replayed.game_over_reason, game.game_over_reason)
+            self.assertEqual(replayed.move_log.ticks, log.ticks)
+            self.assertEqual(replayed.map.fingerprint(), game.map.fingerprint())
+
+    def test_fingerprint(self) -> None:
+        self.assertEqual(get_map().fingerprint(), get_map().fingerprint())
+        other_map = get_map()
+        other_map.set_tile(2, 0, Key(Color.BLUE))
+        self.assertNotEqual(other_map.fingerprint(), get_map().fingerprint())
+        with self.assertRaises(ValueError):
+            replay(simulate(script, get_map()).move_log, other_map)
+
+    def test_deterministic_enemies_are_not_logged(self) -> None:
+        game = simulate(script, Map([[Player(), None, Enemy([Direction.LEFT])]]))
+        self.assertEqual(game.state, GameState.GAME_OVER)
+        self.assertEqual(game.move_log.enemy_count, 0)
+        self.assertEqual(len(game.move_log.ticks), game.tick_count)
+
+
+if __name__ == "__main__":
+    unittest.main()
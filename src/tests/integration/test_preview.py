@@ -0,0 +1,78 @@
+import sys  # noqa
+
+sys.path.append("./src")  # noqa
+
+import unittest
+from unittest import mock
+import pygame
+from mazegame.api.maps import NORMAL1
+from mazegame.preview import Preview
+from mazegame.session import pygame_session
+
+
+def setUpModule() -> None:
+    unittest.enterModuleContext(pygame_session())
+
+
+class TestPreview(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.maps, self.map_desc = NORMAL1()
+        self.preview = Preview(self.maps, self.map_desc)
+
+    def tearDown(self) -> None:
+        self.preview.teardown()
+
+    def test_prerender_every_variant(self) -> None:
+        self.preview.prerender()
+        self.assertEqual(
+            set(self.preview.frames),
+            {(i, is_show) for i in range(len(self.maps)) for is_show in (False, True)},
+        )
+        for i in range(len(self.maps)):
+            self.assertNotEqual(
+                pygame.image.tobytes(self.preview.frames[i, False], "RGB"),
+                pygame.image.tobytes(self.preview.frames[i, True], "RGB"),
+            )
+
+    def test_navigation_only_blits(self) -> None:
+        for key in (pygame.K_RIGHT, pygame.K_SPACE, pygame.K_LEFT, pygame.K_a):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        shown: list[tuple[int, bool]] = []
+        show_frame = self.preview.show_frame
+
+        def record_frame() -> None:
+            shown.append((self.preview.map_index, self.preview.is_show_path))
+            show_frame()
+
+        with mock.patch.object(self.preview, "show_frame", record_frame):
+            with mock.patch.object(
+                self.preview, "init_map", wraps=self.preview.init_map
+            ) as init_map:
+                self.preview.run()
+        self.assertEqual(init_map.call_count, len(self.maps))
+        self.assertEqual(
+            shown,
+            [
+                (0, True),
+                (1 % len(self.maps), True),
+                (1 % len(self.maps), False),
+                (0, False),
+            ],
+        )
+
+    def test_heat_overlay(self) -> None:
+        self.preview.prerender()
+        self.preview.is_show_heat = True
+        frame = self.preview.get_frame()
+        self.assertEqual(list(self.preview.heat_frames), [(0, True)])
+        self.assertIs(self.preview.get_frame(), frame)
+        self.assertNotEqual(
+            pygame.image.tobytes(frame, "RGB"),
+            pygame.image.tobytes(self.preview.frames[0, True], "RGB"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys
+
+
+sys.path.append("./src")  # noqa
+
+import random
+import unittest
+from typing import cast
+from unittest import mock
+from mazegame import *
+from mazegame.api import maps as _maps
+from mazegame.color import Color
+from mazegame.direction import Direction
+from mazegame.engine import GameState
+from mazegame.map import CustomMapType, Enemy, Map, Player, SeededMapType
+
+
+def get_map() -> Map:
+    return Map(
+        [
+            [Player(), None, None, None, None],
+            [Enemy([Direction.UP, Direction.DOWN], 0.3), None, None, None, None],
+        ]
+    )
+
+
+def script():
+    for _ in range(20):
+        yield HALT
+
+
+def get_fingerprints(map_name: str, seed: int) -> list[bytes]:
+    map_factory = cast(SeededMapType, getattr(_maps, map_name))
+    return [map.fingerprint() for map in map_factory(seed)[0]]
+
+
+class TestSeed(unittest.TestCase):
+
+    def test_map_factories(self) -> None:
+        for map_name in _maps.__all__:
+            self.assertEqual(
+                get_fingerprints(map_name, 1), get_fingerprints(map_name, 1), map_name
+            )
+        self.assertTrue(
+            any(
+                get_fingerprints("PRACTICE5", 1) != get_fingerprints("PRACTICE5", seed)
+                for seed in range(2, 10)
+            )
+        )
+
+    def test_unique_colors(self) -> None:
+        self.assertEqual(
+            Color.get_unique_colors(4, rng=random.Random(3)),
+            Color.get_unique_colors(4, rng=random.Random(3)),
+        )
+
+    def test_same_seed_same_run(self) -> None:
+        runs = [simulate(script, get_map(), seed=seed) for seed in (7, 7, 8)]
+        self.assertEqual(runs[0].move_log.to_bytes(), runs[1].move_log.to_bytes())
+        self.assertEqual(runs[0].game_over_tips, runs[1].game_over_tips)
+        self.assertEqual(runs[0].move_log.seed, 7)
+        self.assertNotEqual(runs[0].move_log.ticks, runs[2].move_log.ticks)
+
+    def test_replay_matches_tips(self) -> None:
+        for seed in range(10):
+            game = simulate(script, get_map(), seed=seed)
+            replayed = replay(game.move_log, get_map())
+            self.assertEqual(replayed.state, game.state)
+            self.assertEqual(replayed.game_over_tips, game.game_over_tips)
+            if game.state == GameState.GAME_OVER:
+                return
+        self.fail("The enemy never caught the player.")
+
+    def test_run_seeds_map(self) -> None:
+        def get_run_map(map_factory: SeededMapType | CustomMapType) -> Map:
+            with mock.patch("mazegame.game.Game") as game:
+                game.return_value.control.is_dead = False
+                run(script, map_factory, seed=7)
+            return game.call_args.args[0]
+
+        fingerprint = get_run_map(HARD2).fingerprint()
+        self.assertEqual(get_run_map(HARD2).fingerprint(), fingerprint)
+        self.assertIn(fingerprint, get_fingerprints("HARD2", 7))
+        # A script's own factory doesn't have to take a seed
+        map = get_map()
+        self.assertIs(get_run_map(lambda: ([map], "")), map)
+
+    def test_variant_pick(self) -> None:
+        maps = [Map([[Player()] + [None] * i]) for i in range(5)]
+        self.assertIs(
+            simulate(script, maps, seed=3, max_ticks=1).map,
+            simulate(script, maps, seed=3, max_ticks=1).map,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
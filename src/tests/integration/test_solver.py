@@ -0,0 +1,210 @@
+import sys
+
+
+sys.path.append("./src")  # noqa
+
+import random
+import threading
+import unittest
+from typing import cast
+from unittest import mock
+from mazegame import *
+from mazegame.api.run import _test_run
+from mazegame.api import maps as _maps
+from mazegame.api.game_obj import get_game
+from mazegame.color import Color
+from mazegame.direction import Direction
+from mazegame.engine import Engine, GameState
+from mazegame.game import Game
+from mazegame.grader import get_map_names
+from mazegame.map import Block, Door, Enemy, Exit, Key, Lock, Map, Player, SeededMapType
+from mazegame.solver import Solver, get_map_par, get_par, solve
+from mazegame.session import pygame_session
+from mazegame.trace import CellState, encode_map
+
+
+def setUpModule() -> None:
+    unittest.enterModuleContext(pygame_session())
+
+
+DETERMINISTIC_MAPS = ["NORMAL1", "NORMAL4", "PRACTICE1", "PRACTICE3", "TUTORIAL4"]
+
+
+def get_factory(name: str) -> SeededMapType:
+    return cast(SeededMapType, getattr(_maps, name))
+
+
+def get_cells(solver: Solver, cells) -> dict[tuple[int, int], CellState]:
+    """
+    Tiles of every cell of a solver state, like `encode_map` without telling enemies apart
+    """
+    return {
+        (i % solver.width, i // solver.width): tuple(
+            (name, color.name if isinstance(color, Color) else None)
+            for name, color in solver.chains[chain_id]
+        )
+        for i, chain_id in enumerate(cells)
+        if solver.chains[chain_id]
+    }
+
+
+def get_engine_cells(engine: Engine) -> dict[tuple[int, int], CellState]:
+    return {
+        pos: tuple(layer[:2] for layer in cell)
+        for pos, cell in encode_map(engine.map).items()
+    }
+
+
+def play(moves: list[Direction], map: Map) -> Engine:
+    def script():
+        yield from moves
+
+    return simulate(script, map, seed=0)
+
+
+class TestSolver(unittest.TestCase):
+
+    def test_solutions_win_every_map(self) -> None:
+        for name in get_map_names():
+            for variant in range(len(get_factory(name)(0)[0])):
+                with self.subTest(map=name, variant=variant):
+                    map = get_factory(name)(0)[0][variant]
+                    try:
+                        moves = solve(map)
+                    except ValueError:
+                        self.assertTrue(
+                            any(
+                                0 < enemy.chance_to_move < 1
+                                for enemy in map.get_tiles(Enemy)
+                            )
+                        )
+                        continue
+                    if moves is None:
+                        continue
+                    game = play(moves, get_factory(name)(0)[0][variant])
+                    self.assertEqual(game.state, GameState.VICTORY)
+                    self.assertEqual(game.tick_count, len(moves))
+
+    def test_shortest(self) -> None:
+        # The key is behind the player, and the enemy blocks the short way for a while
+        map = Map(
+            [
+                [Key(Color.RED), None, Player(), None, Door(Color.RED), Exit()],
+                [Block(), Block(), None, Block(), Block(), Block()],
+            ]
+        )
+        self.assertEqual(get_par(map), 7)
+        self.assertEqual(solve(map), [LEFT, LEFT, RIGHT, RIGHT, RIGHT, RIGHT, RIGHT])
+        map = Map(
+            [
+                [Player(), None, None, Exit()],
+                [None, Enemy([UP, DOWN, HALT]), None, None],
+            ]
+        )
+        moves = solve(map)
+        assert moves is not None
+        # Stepping past the enemy's cell is only safe right after it went back down
+        self.assertEqual(len(moves), 5)
+        self.assertEqual(moves[2:], [RIGHT, RIGHT, RIGHT])
+        self.assertEqual(play(moves, map).state, GameState.VICTORY)
+
+    def test_unwinnable(self) -> None:
+        self.assertIsNone(solve(Map([[Player(), Block(), Exit()]])))
+        # The lock shuts the door on the way to the exit
+        map = Map(
+            [[Player(), Key(Color.RED), Lock(Color.RED), Door(Color.RED), Exit()]]
+        )
+        self.assertIsNone(solve(map))
+        self.assertIsNone(get_par(map))
+        self.assertIsNone(solve(Map([[Player(), None, Exit()]]), max_states=1))
+
+    def test_random_enemies(self) -> None:
+        map = Map([[Player(), Enemy([LEFT, RIGHT], 0.5), Exit()]])
+        with self.assertRaises(ValueError):
+            solve(map)
+        self.assertIsNone(get_par(map))
+        # Enemies that never move are fine
+        self.assertEqual(
+            solve(Map([[Player(), None, Exit()], [None, Enemy([UP], 0), None]])),
+            [RIGHT, RIGHT],
+        )
+
+    def test_victory_par(self) -> None:
+        def script():
+            yield from [HALT, UP, UP, UP, UP]
+
+        # Only searched when it's shown, tests and replays don't pay for it
+        game = _test_run(script, TUTORIAL1()[0][0], exit_on_tick=5)
+        self.assertEqual(game.state, GameState.VICTORY)
+        self.assertIsNone(game._par_thread)
+        game = _test_run(script, TUTORIAL1()[0][0], exit_on_tick=5, is_par_shown=True)
+        self.assertIsNotNone(game._par_thread)
+        # The game is over, a search still going is cancelled
+        self.assertTrue(game._par_stop_event.is_set())
+        # Solved once per layout, the grader and the next game share it
+        self.assertEqual(get_map_par(TUTORIAL1()[0][0], Game.PAR_MAX_STATES), 4)
+        with mock.patch.object(Solver, "solve") as solve_map:
+            game = _test_run(
+                script, TUTORIAL1()[0][0], exit_on_tick=5, is_par_shown=True
+            )
+            assert game._par_thread is not None
+            game._par_thread.join()
+        solve_map.assert_not_called()
+        self.assertEqual(game.par, 4)
+        game = _test_run(
+            script, TUTORIAL3()[0][0], exit_on_tick=1, seed=0, is_par_shown=True
+        )
+        self.assertIsNone(game._par_thread)
+        self.assertIsNone(game.par)
+
+    def test_stop_search(self) -> None:
+        stop_event = threading.Event()
+        stop_event.set()
+        solver = Solver(TUTORIAL2()[0][0])
+        self.assertIsNone(solver.solve(stop_event=stop_event))
+        # A search that was stopped isn't remembered as unwinnable
+        self.assertIsNone(solver.get_par(123, stop_event))
+        self.assertEqual(solver.get_par(123), 2)
+
+    def test_steps_match_engine(self) -> None:
+        rng = random.Random(0)
+        for name in DETERMINISTIC_MAPS:
+            for _ in range(5):
+                moves = [rng.choice([HALT, LEFT, RIGHT, UP, DOWN]) for _ in range(30)]
+                solver = Solver(get_factory(name)(0)[0][0])
+                seen: list[tuple] = []
+
+                def script():
+                    for direction in moves:
+                        engine = get_game()
+                        seen.append(
+                            (
+                                get_engine_cells(engine),
+                                list(engine.control.player_positions),
+                                [enemy.pos for enemy in engine.enemies],
+                            )
+                        )
+                        yield direction
+
+                game = simulate(script, get_factory(name)(0)[0][0], seed=0)
+                state = solver.start
+                for tick, (cells, players, enemies) in enumerate(seen):
+                    with self.subTest(map=name, tick=tick):
+                        self.assertEqual(get_cells(solver, state.cells), cells)
+                        self.assertEqual(state.players, players)
+                        self.assertEqual(state.enemy_positions, enemies)
+                    state = solver.step(state, moves[tick])
+                    if state.status:
+                        break
+                self.assertEqual(
+                    {
+                        0: GameState.GAMEPLAY,
+                        1: GameState.VICTORY,
+                        2: GameState.GAME_OVER,
+                    }[state.status],
+                    game.state,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
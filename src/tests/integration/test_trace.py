@@ -0,0 +1,169 @@
+import sys
+
+
+sys.path.append("./src")  # noqa
+
+import tempfile
+import unittest
+from pathlib import Path
+import pygame
+from mazegame import *
+from mazegame.api.game_obj import get_game
+from mazegame.array_map import ArrayMap
+from mazegame.color import Color
+from mazegame.direction import Direction
+from mazegame.engine import Engine
+from mazegame.map import Door, Enemy, Exit, Key, Lock, Map, Player
+from mazegame.session import pygame_session
+from mazegame.trace import CellState, Trace, decode_cell, encode_cell, encode_map
+from mazegame.trace_viewer import TraceViewer
+
+
+def get_map() -> Map:
+    return Map(
+        [
+            [Player(), Key(Color.RED), Lock(Color.RED), None, None, Exit()],
+            [None, Player(), Door(Color.RED), None, None, None],
+            [
+                Enemy([Direction.RIGHT] * 4 + [Direction.LEFT] * 4, 0.5),
+                None,
+                None,
+                None,
+                None,
+                Enemy([Direction.UP, Direction.DOWN], boss=True),
+            ],
+        ]
+    )
+
+
+def get_states(seed: int) -> tuple[Engine, list[dict[tuple[int, int], CellState]]]:
+    """
+    :return: Engine at the end of a traced run, and the map of every tick
+    """
+    states: list[dict[tuple[int, int], CellState]] = []
+
+    def script():
+        for direction in [RIGHT, RIGHT, HALT, LEFT, DOWN, RIGHT, UP] + [HALT] * 20:
+            states.append(encode_map(get_game().map))
+            yield direction
+        states.append(encode_map(get_game().map))
+
+    game = simulate(script, get_map(), seed=seed, keyframe_interval=4)
+    # The script ends during the last tick, the enemies still moved
+    states.append(encode_map(game.map))
+    return game, states
+
+
+def get_trace(engine: Engine) -> Trace:
+    assert engine.trace is not None
+    return engine.trace
+
+
+class TestTrace(unittest.TestCase):
+
+    def test_seek_matches_run(self) -> None:
+        for seed in range(5):
+            game, states = get_states(seed)
+            trace = get_trace(game)
+            self.assertEqual(len(trace), len(states) - 1)
+            self.assertEqual(trace.keyframe_ticks, list(range(0, len(trace) + 1, 4)))
+            for tick, state in enumerate(states):
+                self.assertEqual(trace.seek(tick), state, f"tick {tick}")
+                self.assertEqual(encode_map(trace.get_map(tick)), state)
+
+    def test_deltas_only_list_changed_cells(self) -> None:
+        game, states = get_states(0)
+        trace = get_trace(game)
+        for tick, delta in enumerate(trace.deltas):
+            changed = {
+                pos
+                for pos in states[tick].keys() | states[tick + 1].keys()
+                if states[tick].get(pos) != states[tick + 1].get(pos)
+            }
+            self.assertLessEqual(changed, {pos for pos, _ in delta})
+            # Only the tiles that moved and the door swaps, not the whole map
+            self.assertLessEqual(len(delta), 6)
+
+    def test_cell_round_trip(self) -> None:
+        for _, tile in get_map().iter_tiles():
+            self.assertEqual(
+                encode_cell(decode_cell(encode_cell(tile))), encode_cell(tile)
+            )
+        player = Player()
+        player.tile_under = Door(Color.RED).tile_under
+        cell = encode_cell(player)
+        self.assertEqual(cell, (("Player", None), ("DoorFrame", "RED")))
+        self.assertEqual(encode_cell(decode_cell(cell)), cell)
+        self.assertIsNone(decode_cell(None))
+
+    def test_save_load(self) -> None:
+        trace = get_trace(get_states(1)[0])
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "run.trace"
+            trace.save(path)
+            self.assertEqual(Trace.load(path), trace)
+        with self.assertRaises(ValueError):
+            Trace.from_json({"format": "something else"})
+        with self.assertRaises(IndexError):
+            trace.seek(len(trace) + 1)
+
+    def test_replay_trace(self) -> None:
+        game, _ = get_states(2)
+        self.assertIsNone(simulate(lambda: None, get_map(), seed=2).trace)
+        replayed = replay(game.move_log, get_map(), keyframe_interval=4)
+        self.assertEqual(get_trace(replayed), get_trace(game))
+
+    def test_array_map(self) -> None:
+        def script():
+            for direction in [RIGHT, RIGHT, HALT, LEFT, DOWN, RIGHT, UP]:
+                yield direction
+
+        game = simulate(script, get_map(), seed=4, keyframe_interval=2)
+        array_game = simulate(
+            script, ArrayMap.from_map(get_map()), seed=4, keyframe_interval=2
+        )
+        self.assertEqual(get_trace(array_game), get_trace(game))
+
+
+class TestTraceViewer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.enterClassContext(pygame_session())
+        game, cls.states = get_states(3)
+        cls.trace = get_trace(game)
+
+    def setUp(self) -> None:
+        self.viewer = TraceViewer(self.trace)
+
+    def tearDown(self) -> None:
+        self.viewer.game.teardown()
+
+    def test_seek(self) -> None:
+        game = self.viewer.game
+        for tick in [len(self.trace), 0, 5, 6, 2, 13, 12, len(self.trace) + 10, -3]:
+            self.viewer.seek(tick)
+            tick = min(max(tick, 0), len(self.trace))
+            self.assertEqual(self.viewer.tick, tick)
+            self.assertEqual(encode_map(game.map), self.states[tick])
+            frame = pygame.image.tobytes(game.display_surface, "RGB")
+            game.is_full_redraw = True
+            game._update_gameplay()
+            self.assertEqual(
+                frame, pygame.image.tobytes(game.display_surface, "RGB"), f"tick {tick}"
+            )
+        self.assertEqual(len(game.players), 2)
+        self.assertEqual(game.tick_count, 0)
+
+    def test_run_keys(self) -> None:
+        for key in (pygame.K_END, pygame.K_PAGEUP, pygame.K_LEFT, pygame.K_a):
+            pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key))
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        self.viewer.run()
+        tick = len(self.trace) - self.trace.keyframe_interval - 1
+        self.assertEqual(self.viewer.tick, tick)
+        self.assertEqual(encode_map(self.viewer.game.map), self.states[tick])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+from mazegame.session import pygame_session
+
+_SEPARATOR = "=" * 70
+_THIN_SEPARATOR = "-" * 70
+
+
+@dataclass
+class TestOutcome:
+    test_id: str
+    failures: list[tuple[str, str]]
+    """(Description, traceback) of every failure"""
+    errors: list[tuple[str, str]]
+    """(Description, traceback) of every error, including module and class fixtures"""
+    skipped: int
+    tests_run: int
+
+
+def iter_test_ids(suite: unittest.TestSuite) -> list[str]:
+    """
+    :return: Id of every test case in a suite, in order
+    """
+    test_ids: list[str] = []
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            test_ids.extend(iter_test_ids(test))
+        else:
+            test_ids.append(test.id())
+    return test_ids
+
+
+def _init_worker(cache_dir: str) -> None:
+    """
+    Initialise pygame once for every test the worker runs, it quits with the worker
+
+    :param cache_dir: Sprite cache shared by the workers, instead of the user's
+    """
+    os.environ["MAZEGAME_CACHE_DIR"] = cache_dir
+    pygame_session().__enter__()
+
+
+def run_test(test_id: str) -> TestOutcome:
+    """
+    Run one test case with its module and class fixtures
+    """
+    result = unittest.TestResult()
+    unittest.defaultTestLoader.loadTestsFromName(test_id).run(result)
+    return TestOutcome(
+        test_id,
+        [(str(test), traceback) for test, traceback in result.failures]
+        + [(str(test), "Unexpected success") for test in result.unexpectedSuccesses],
+        [(str(test), traceback) for test, traceback in result.errors],
+        len(result.skipped),
+        result.testsRun,
+    )
+
+
+def run_parallel(suite: unittest.TestSuite, workers: int | None = None) -> bool:
+    """
+    Run every test case of a suite on its own, spread over a process pool
+
+    :param workers: Number of worker processes, defaults to one per core
+    :return: Whether every test passed
+    """
+    start = time.perf_counter()
+    outcomes: list[TestOutcome] = []
+    with tempfile.TemporaryDirectory() as cache_dir, ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        mp_context=multiprocessing.get_context("forkserver"),
+        initializer=_init_worker,
+        initargs=(cache_dir,),
+    ) as pool:
+        futures = [pool.submit(run_test, test_id) for test_id in iter_test_ids(suite)]
+        for future in as_completed(futures):
+            outcome = future.result()
+            outcomes.append(outcome)
+            if outcome.errors:
+                status = "E"
+            elif outcome.failures:
+                status = "F"
+            elif outcome.skipped:
+                status = "s"
+            else:
+                status = "."
+            sys.stderr.write(status)
+            sys.stderr.flush()
+    sys.stderr.write("\n")
+
+    failures = [failure for outcome in outcomes for failure in outcome.failures]
+    errors = [error for outcome in outcomes for error in outcome.errors]
+    for label, problems in (("ERROR", errors), ("FAIL", failures)):
+        for description, traceback in problems:
+            sys.stderr.write(
+                f"{_SEPARATOR}\n{label}: {description}\n{_THIN_SEPARATOR}\n{traceback}\n"
+            )
+    tests_run = sum(outcome.tests_run for outcome in outcomes)
+    sys.stderr.write(
+        f"{_THIN_SEPARATOR}\n"
+        f"Ran {tests_run} tests in {time.perf_counter() - start:.3f}s "
+        f"on {workers or os.cpu_count()} workers\n\n"
+    )
+    if failures or errors:
+        sys.stderr.write(f"FAILED (failures={len(failures)}, errors={len(errors)})\n")
+        return False
+    skipped = sum(outcome.skipped for outcome in outcomes)
+    sys.stderr.write(f"OK (skipped={skipped})\n" if skipped else "OK\n")
+    return True
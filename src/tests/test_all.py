@@ -1,4 +1,18 @@
+import sys
+
+sys.path.append("./src")  # noqa
+
+from argparse import ArgumentParser
+import os
+import tempfile
 import unittest
+
+# Keep the sprites the tests draw out of the user's cache, it's read when mazegame.map is imported
+_cache_dir = tempfile.TemporaryDirectory()
+os.environ["MAZEGAME_CACHE_DIR"] = _cache_dir.name
+
+from mazegame.session import pygame_session
+from parallel import run_parallel
 import unit
 import integration
 
@@ -13,7 +27,18 @@ def load_tests(
 
 
 def test_all():
-    unittest.main()
+    """
+    Run the suite: `python src/tests/test_all.py`, or `-j [WORKERS]` to spread the test cases over processes
+    """
+    parser = ArgumentParser(add_help=False)
+    parser.add_argument("-j", "--jobs", type=int, nargs="?", const=0, default=None)
+    args, argv = parser.parse_known_args()
+    if args.jobs is not None:
+        suite = load_tests(unittest.defaultTestLoader, unittest.TestSuite(), None)
+        sys.exit(0 if run_parallel(suite, args.jobs or None) else 1)
+    # One pygame session for the whole suite, the modules' own sessions nest in it
+    with pygame_session():
+        unittest.main(argv=sys.argv[:1] + argv)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,28 @@
 from types import ModuleType as __ModuleType
-from . import test_map_creation
+from . import (
+    test_map_creation,
+    test_array_map,
+    test_map_index,
+    test_blur,
+    test_lazy_import,
+    test_atlas,
+    test_sprite_cache,
+    test_fonts,
+    test_session,
+    test_result_cache,
+    test_reachability,
+)
 
-ALL: tuple[__ModuleType, ...] = (test_map_creation,)
+ALL: tuple[__ModuleType, ...] = (
+    test_map_creation,
+    test_array_map,
+    test_map_index,
+    test_blur,
+    test_lazy_import,
+    test_atlas,
+    test_sprite_cache,
+    test_fonts,
+    test_session,
+    test_result_cache,
+    test_reachability,
+)
@@ -0,0 +1,147 @@
+import sys
+
+sys.path.append("./src")  # noqa
+
+import unittest
+import numpy as np
+from mazegame import *
+from mazegame.array_map import ArrayMap, TileKind, color_to_code
+from mazegame.color import Color
+from mazegame.direction import Direction
+from mazegame.engine import GameState
+from mazegame.map import (
+    Block,
+    Door,
+    DoorFrame,
+    Enemy,
+    Exit,
+    Key,
+    Lock,
+    Map,
+    Player,
+)
+from mazegame.api.run import simulate
+
+
+def get_door_map() -> Map:
+    return Map(
+        [
+            [Player(), Key(Color.RED), None, Lock(Color.RED), None],
+            [Block(), Door(Color.RED), Block(), Door(Color.BLUE), Exit()],
+        ]
+    )
+
+
+def door_script():
+    move(RIGHT)
+    move(RIGHT)
+    move(RIGHT)
+
+
+class TestArrayMap(unittest.TestCase):
+
+    def test_from_map(self) -> None:
+        map = get_door_map()
+        array_map = ArrayMap.from_map(get_door_map())
+        self.assertEqual((array_map.width, array_map.height), (5, 2))
+        self.assertEqual(array_map.kinds[1, 1], TileKind.DOOR)
+        self.assertEqual(array_map.colors[1, 1], color_to_code(Color.RED))
+        self.assertEqual(list(array_map.entities), [(0, 0)])
+        for y in range(map.height):
+            for x in range(map.width):
+                self.assertEqual(
+                    type(array_map.get_tile(x, y)), type(map.get_tile(x, y))
+                )
+        self.assertIsNone(array_map.get_tile(-1, 0))
+        self.assertIsNone(array_map.get_tile(5, 0))
+
+    def test_same_end_state_as_map(self) -> None:
+        for max_ticks in range(1, 4):
+            game = simulate(door_script, get_door_map(), max_ticks=max_ticks)
+            engine = simulate(
+                door_script, ArrayMap.from_map(get_door_map()), max_ticks=max_ticks
+            )
+            self.assertEqual(engine.state, game.state)
+            for y in range(game.map.height):
+                for x in range(game.map.width):
+                    self.assertEqual(
+                        type(engine.map.get_tile(x, y)), type(game.map.get_tile(x, y))
+                    )
+        self.assertIsInstance(engine.map.get_tile(1, 1), Door)
+        self.assertIsInstance(engine.map.get_tile(3, 0), Player)
+
+    def test_open_door(self) -> None:
+        engine = simulate(door_script, ArrayMap.from_map(get_door_map()), max_ticks=1)
+        self.assertIsInstance(engine.map.get_tile(1, 1), DoorFrame)
+        self.assertIsInstance(engine.map.get_tile(3, 1), Door)
+
+    def test_enemy(self) -> None:
+        map = ArrayMap.from_map(
+            Map([[Player(), None, None, Enemy(path=[Direction.LEFT])]])
+        )
+
+        def script():
+            move(HALT)
+            move(HALT)
+
+        engine = simulate(script, map, max_ticks=2)
+        self.assertEqual(engine.state, GameState.GAMEPLAY)
+        self.assertEqual(map.get_positions(Enemy), [(1, 0)])
+
+    def test_get_positions(self) -> None:
+        map = ArrayMap.from_map(get_door_map())
+        self.assertEqual(map.get_positions(Door), [(1, 1), (3, 1)])
+        self.assertEqual(
+            [door.color for door in map.get_tiles(Door)], [Color.RED, Color.BLUE]
+        )
+        self.assertEqual(map.get_positions(Player), [(0, 0)])
+        self.assertEqual(map.get_positions(Exit), [(4, 1)])
+
+    def test_large_map(self) -> None:
+        size = 1000
+        kinds = np.full((size, size), TileKind.BLOCK, dtype=np.uint8)
+        kinds[0, :] = TileKind.NONE
+        kinds[0, -1] = TileKind.EXIT
+        map = ArrayMap(kinds, entities={(0, 0): Player()})
+
+        def script():
+            for _ in range(size - 1):
+                yield RIGHT
+
+        engine = simulate(script, map)
+        self.assertEqual(engine.state, GameState.VICTORY)
+        self.assertEqual(engine.tick_count, size - 1)
+
+    def test_fingerprint(self) -> None:
+        def get_map() -> Map:
+            return Map(
+                [
+                    [Player(), Key(Color.RED), Door(Color.RED, open=True), Exit()],
+                    [Block(), Door(Color.BLUE), Enemy([Direction.LEFT]), None],
+                ]
+            )
+
+        self.assertEqual(
+            ArrayMap.from_map(get_map()).fingerprint(),
+            ArrayMap.from_map(get_map()).fingerprint(),
+        )
+        kinds = np.zeros((2, 3), dtype=np.uint8)
+        kinds[0, 2] = TileKind.EXIT
+        with_wall = kinds.copy()
+        with_wall[1, 1] = TileKind.BLOCK
+        self.assertNotEqual(
+            ArrayMap(kinds, entities={(0, 0): Player()}).fingerprint(),
+            ArrayMap(with_wall, entities={(0, 0): Player()}).fingerprint(),
+        )
+        engine = simulate(door_script, ArrayMap(kinds, entities={(0, 0): Player()}))
+        # Hashed once it's asked for, but from the map the run started on
+        self.assertEqual(
+            engine.move_log.fingerprint,
+            ArrayMap(kinds, entities={(0, 0): Player()}).fingerprint(),
+        )
+        with self.assertRaises(ValueError):
+            replay(engine.move_log, ArrayMap(with_wall, entities={(0, 0): Player()}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import sys
+
+sys.path.append("./src")  # noqa
+
+import json
+from pathlib import Path
+import tempfile
+import unittest
+import pygame
+from mazegame.build_atlas import SPRITE_DIR, build_atlas, pack
+from mazegame.images import ATLAS_IMAGE, ATLAS_INDEX, get_assets_dir
+
+
+class TestAtlas(unittest.TestCase):
+
+    def test_pack(self) -> None:
+        sizes = {f"{i}": (10 + i % 3 * 10, 10 + i % 4 * 10) for i in range(20)}
+        index, height = pack(sizes, 64)
+        self.assertEqual(index.keys(), sizes.keys())
+        rects = [pygame.Rect(index[name]) for name in sizes]
+        for i, (rect, size) in enumerate(zip(rects, sizes.values())):
+            self.assertEqual(rect.size, size)
+            self.assertTrue(pygame.Rect(0, 0, 64, height).contains(rect))
+            self.assertEqual(rect.collidelist(rects[:i] + rects[i + 1 :]), -1)
+        with self.assertRaises(ValueError):
+            pack({"wide": (65, 1)}, 64)
+
+    def test_atlas_is_up_to_date(self) -> None:
+        index = json.loads((get_assets_dir() / ATLAS_INDEX).read_text())
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.assertEqual(
+                {
+                    name: list(rect)
+                    for name, rect in build_atlas(SPRITE_DIR, Path(temp_dir)).items()
+                },
+                index,
+            )
+        with (get_assets_dir() / ATLAS_IMAGE).open("rb") as file:
+            atlas = pygame.image.load(file, ATLAS_IMAGE)
+        for path in SPRITE_DIR.glob("*.png"):
+            self.assertEqual(
+                pygame.image.tobytes(atlas.subsurface(index[path.stem]), "RGBA"),
+                pygame.image.tobytes(pygame.image.load(path), "RGBA"),
+                f"{path.stem} is outdated, rebuild with `python -m mazegame.build_atlas`.",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
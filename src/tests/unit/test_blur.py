@@ -0,0 +1,40 @@
+import sys
+
+sys.path.append("./src")  # noqa
+
+import unittest
+import numpy as np
+import pygame
+from mazegame.game import apply_blur, precompute_blur
+
+
+def get_surface() -> pygame.Surface:
+    surface = pygame.Surface((160, 90))
+    surface.fill((40, 40, 40))
+    for i in range(0, 160, 20):
+        surface.fill((200, 100, 50), (i, 0, 10, 90))
+    return surface
+
+
+class TestBlur(unittest.TestCase):
+
+    def test_levels(self) -> None:
+        surface = get_surface()
+        surfaces = precompute_blur(surface, 4, 5)
+        self.assertEqual(len(surfaces), 5)
+        for blurred in surfaces:
+            self.assertEqual(blurred.get_size(), surface.get_size())
+        original = pygame.surfarray.array3d(surface)
+        self.assertTrue(np.array_equal(pygame.surfarray.array3d(surfaces[0]), original))
+        contrasts = [pygame.surfarray.array3d(blurred).std() for blurred in surfaces]
+        self.assertEqual(contrasts, sorted(contrasts, reverse=True))
+
+    def test_close_to_full_resolution_blur(self) -> None:
+        surface = get_surface()
+        expected = pygame.surfarray.array3d(apply_blur(surface, 4)).astype(float)
+        actual = pygame.surfarray.array3d(precompute_blur(surface, 4, 5)[-1])
+        self.assertLess(np.abs(actual - expected).mean(), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
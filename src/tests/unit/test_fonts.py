@@ -0,0 +1,40 @@
+import sys
+
+sys.path.append("./src")  # noqa
+
+import unittest
+from unittest import mock
+import pygame
+from mazegame.fonts import Fonts
+
+
+class TestFonts(unittest.TestCase):
+
+    def test_cached_by_size_and_bold(self) -> None:
+        fonts = Fonts()
+        heading = fonts.get(40, bold=True)
+        self.assertIs(fonts.get(40, bold=True), heading)
+        self.assertTrue(heading.get_bold())
+        self.assertIsNot(fonts.get(40), heading)
+        self.assertFalse(fonts.get(40).get_bold())
+        self.assertEqual(len(fonts.fonts), 2)
+
+    def test_no_system_font_scan(self) -> None:
+        with mock.patch.object(
+            pygame.font, "SysFont", side_effect=AssertionError
+        ), mock.patch.object(
+            pygame.sysfont, "initsysfonts", side_effect=AssertionError
+        ):
+            Fonts().get(20).render("Victory!", True, (255, 255, 255))
+
+    def test_reload_after_quit(self) -> None:
+        fonts = Fonts()
+        fonts.get(20)
+        pygame.font.quit()
+        font = fonts.get(20)
+        self.assertEqual(len(fonts.fonts), 1)
+        self.assertGreater(font.size("Victory!")[0], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
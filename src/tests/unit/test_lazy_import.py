@@ -0,0 +1,87 @@
+import sys
+
+sys.path.append("./src")  # noqa
+
+import subprocess
+import unittest
+
+
+def get_imported(code: str, modules: list[str]) -> list[str]:
+    """
+    Run code in a fresh interpreter
+
+    :return: Which of the modules got imported
+    """
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            f"import sys\nsys.path.append('./src')\n{code}\n"
+            f"print(*(name for name in {modules!r} if name in sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return output.split()
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def test_core_without_pygame(self) -> None:
+        for code in (
+            "import mazegame.core",
+            "import mazegame",
+            "import mazegame.grader",
+        ):
+            self.assertEqual(
+                get_imported(code, ["pygame", "numpy", "scipy"]), [], f"`{code}`"
+            )
+
+    def test_lazy_maps(self) -> None:
+        self.assertEqual(
+            get_imported(
+                "import mazegame\nmazegame.TUTORIAL1",
+                ["mazegame.api.maps.tutorial1", "mazegame.api.maps.tutorial2"],
+            ),
+            ["mazegame.api.maps.tutorial1"],
+        )
+
+    def test_star_import(self) -> None:
+        self.assertEqual(
+            get_imported(
+                "from mazegame import *\nassert callable(NIGHTMARE2) and UP and run",
+                ["mazegame.api.maps.nightmare2", "scipy"],
+            ),
+            ["mazegame.api.maps.nightmare2"],
+        )
+
+    def test_star_import_modules(self) -> None:
+        # Modules are still reachable as before, but only imported on access
+        self.assertEqual(
+            get_imported(
+                "import mazegame\nassert mazegame.const.UP == mazegame.UP",
+                ["mazegame.game", "mazegame.map_maker"],
+            ),
+            [],
+        )
+        self.assertEqual(
+            get_imported(
+                "from mazegame import *\n"
+                "assert map.Map and maps.HARD1 and map_maker\n"
+                "assert const.UP == direction.Direction.UP == Direction.UP",
+                ["mazegame.game", "mazegame.map_maker", "pygame", "numpy"],
+            ),
+            ["mazegame.map_maker"],
+        )
+        self.assertEqual(
+            get_imported(
+                "import mazegame\nassert mazegame.game.Game and mazegame.hard1.HARD1",
+                ["mazegame.game", "mazegame.api.maps.hard1"],
+            ),
+            ["mazegame.game", "mazegame.api.maps.hard1"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import sys
+
+sys.path.append("./src")  # noqa
+
+import unittest
+from mazegame import *
+from mazegame.color import Color
+from mazegame.engine import GameState
+from mazegame.map import (
+    Block,
+    Door,
+    DoorFrame,
+    Exit,
+    HasColor,
+    Key,
+    Lock,
+    Map,
+    Player,
+    Spike,
+    Tile,
+)
+from mazegame.api.run import simulate
+
+
+def get_map() -> Map:
+    return Map(
+        [
+            [Player(), Key(Color.RED), Door(Color.RED), Door(Color.BLUE)],
+            [Block(), Door(Color.RED), Lock(Color.RED), Exit()],
+        ]
+    )
+
+
+def scan(map: Map, cls: type[Tile]) -> list[tuple[int, int]]:
+    return [
+        (x, y)
+        for y, row in enumerate(map.map)
+        for x, tile in enumerate(row)
+        if isinstance(tile, cls)
+    ]
+
+
+class TestMapIndex(unittest.TestCase):
+
+    def test_get_positions(self) -> None:
+        map = get_map()
+        self.assertEqual(map.get_positions(Door), [(2, 0), (3, 0), (1, 1)])
+        self.assertEqual(map.get_positions(Door, Color.RED), [(2, 0), (1, 1)])
+        self.assertEqual(
+            map.get_positions(HasColor, Color.RED), [(1, 0), (2, 0), (1, 1), (2, 1)]
+        )
+        self.assertEqual(
+            [door.color for door in map.get_tiles(Door)],
+            [Color.RED, Color.BLUE, Color.RED],
+        )
+        self.assertEqual(map.get_positions(Spike), [])
+
+    def test_set_tile(self) -> None:
+        map = get_map()
+        map.set_tile(0, 0, None)
+        map.set_tile(3, 1, Player())
+        self.assertEqual(map.get_positions(Player), [(3, 1)])
+        self.assertEqual(map.get_positions(Exit), [])
+
+    def test_index_follows_game(self) -> None:
+        def script():
+            move(RIGHT)
+            move(RIGHT)
+            move(DOWN)
+
+        for max_ticks in range(1, 4):
+            game = simulate(script, get_map(), max_ticks=max_ticks)
+            for cls in (Player, Door, DoorFrame, Key, Lock, Exit):
+                self.assertEqual(game.map.get_positions(cls), scan(game.map, cls))
+        self.assertEqual(game.map.get_positions(Door), [(2, 0), (3, 0), (1, 1)])
+
+    def test_key_on_large_map(self) -> None:
+        size = 500
+        rows: list[list[Tile | None]] = [[None] * size for _ in range(size)]
+        rows[0][0] = Player()
+        rows[0][1] = Key(Color.RED)
+        rows[0][2] = Door(Color.RED)
+        rows[0][3] = Exit()
+        map = Map(rows)
+
+        def script():
+            for _ in range(3):
+                move(RIGHT)
+
+        game = simulate(script, map)
+        self.assertEqual(game.state, GameState.VICTORY)
+
+    def test_recolored_tile(self) -> None:
+        # Solution of NIGHTMARE1, the key is recolored after the map indexed it
+        def script():
+            tile = get_tile(RIGHT)
+            assert isinstance(tile, Key)
+            tile.color = Color.BLUE
+            for _ in range(3):
+                move(RIGHT)
+
+        game = simulate(script, NIGHTMARE1()[0][0])
+        self.assertEqual(game.state, GameState.VICTORY)
+        self.assertEqual(game.tick_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import sys
+
+sys.path.append("./src")  # noqa
+
+import unittest
+from collections import deque
+import numpy as np
+from mazegame.array_map import ArrayMap
+from mazegame.color import Color
+from mazegame.map import Block, ColoredBlock, Door, Enemy, Exit, Key, Map, Player, Spike
+from mazegame.reachability import (
+    get_distances,
+    get_exit_distances,
+    get_reachable,
+    get_walkable,
+    validate_map,
+)
+
+
+def get_distances_plain(walkable: np.ndarray, sources: np.ndarray) -> np.ndarray:
+    height, width = walkable.shape
+    distances = np.full(walkable.shape, -1, dtype=np.int32)
+    queue: deque[tuple[int, int]] = deque()
+    for y, x in zip(*np.nonzero(sources & walkable)):
+        distances[y, x] = 0
+        queue.append((y, x))
+    while queue:
+        y, x = queue.popleft()
+        for next_y, next_x in ((y, x + 1), (y, x - 1), (y + 1, x), (y - 1, x)):
+            if (
+                0 <= next_y < height
+                and 0 <= next_x < width
+                and walkable[next_y, next_x]
+                and distances[next_y, next_x] < 0
+            ):
+                distances[next_y, next_x] = distances[y, x] + 1
+                queue.append((next_y, next_x))
+    return distances
+
+
+def get_map() -> Map:
+    return Map(
+        [
+            [Player(), Key(Color.RED), Door(Color.RED), None, Exit()],
+            [
+                Block(),
+                ColoredBlock(Color.BLUE),
+                Door(Color.BLUE, open=True),
+                Spike(),
+                None,
+            ],
+            [None, None, Enemy([]), None, None],
+        ]
+    )
+
+
+class TestReachability(unittest.TestCase):
+
+    def test_matches_plain_search(self) -> None:
+        rng = np.random.default_rng(0)
+        # Widths around the 64 cells of a packed word
+        for width in (1, 7, 63, 64, 65, 130):
+            for _ in range(5):
+                height = int(rng.integers(1, 40))
+                walkable = rng.random((height, width)) < rng.uniform(0.4, 1)
+                sources = rng.random((height, width)) < 0.02
+                expected = get_distances_plain(walkable, sources)
+                np.testing.assert_array_equal(
+                    get_distances(walkable, sources), expected
+                )
+                np.testing.assert_array_equal(
+                    get_reachable(walkable, sources), expected >= 0
+                )
+
+    def test_walkable(self) -> None:
+        expected = [
+            [True, True, False, True, True],
+            [False, False, True, False, True],
+            [True, True, True, True, True],
+        ]
+        map = get_map()
+        np.testing.assert_array_equal(get_walkable(map), expected)
+        expected[0][2] = True
+        np.testing.assert_array_equal(get_walkable(map, is_doors_open=True), expected)
+        array_map = ArrayMap.from_map(get_map())
+        for is_doors_open in (False, True):
+            np.testing.assert_array_equal(
+                get_walkable(array_map, is_doors_open=is_doors_open),
+                get_walkable(map, is_doors_open=is_doors_open),
+            )
+
+    def test_exit_distances(self) -> None:
+        np.testing.assert_array_equal(
+            get_exit_distances(get_map()),
+            [
+                [-1, -1, -1, 1, 0],
+                [-1, -1, 5, -1, 1],
+                [6, 5, 4, 3, 2],
+            ],
+        )
+
+    def test_validate_map(self) -> None:
+        self.assertEqual(validate_map(get_map()), [])
+        self.assertEqual(
+            validate_map(Map([[None, Block()]])),
+            ["The map has no player.", "The map has no exit."],
+        )
+        self.assertEqual(
+            validate_map(Map([[Player(), Block(), Exit()]])),
+            ["No player can reach an exit, even with every door open."],
+        )
+        # A closed door only needs a key
+        self.assertEqual(validate_map(Map([[Player(), Door(Color.RED), Exit()]])), [])
+
+    def test_map_cache(self) -> None:
+        for map in (get_map(), ArrayMap.from_map(get_map())):
+            distances = map.get_exit_distances()
+            self.assertIs(map.get_exit_distances(), distances)
+            self.assertEqual(distances[0, 1], -1)
+            map.open_doors(Color.RED)
+            self.assertEqual(map.get_exit_distances()[0, 1], 3)
+            map.close_doors(Color.RED)
+            self.assertEqual(map.get_exit_distances()[0, 1], -1)
+
+
+if __name__ == "__main__":
+    unittest.main()
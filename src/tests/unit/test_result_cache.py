@@ -0,0 +1,78 @@
+import sys
+
+sys.path.append("./src")  # noqa
+
+import os
+from pathlib import Path
+import tempfile
+import time
+import unittest
+from mazegame.result_cache import CachedResult, ResultCache, get_run_key
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.dir = Path(self.temp_dir.name) / "results"
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_key(self) -> None:
+        key = get_run_key(b"source", bytes(16), 0, "script", 1000)
+        self.assertEqual(key, get_run_key(b"source", bytes(16), 0, "script", 1000))
+        for other_key in (
+            get_run_key(b"source ", bytes(16), 0, "script", 1000),
+            get_run_key(b"source", bytes(15) + b"\x01", 0, "script", 1000),
+            get_run_key(b"source", bytes(16), 1, "script", 1000),
+            get_run_key(b"source", bytes(16), 0, "script", None),
+        ):
+            self.assertNotEqual(key, other_key)
+
+    def test_get_put(self) -> None:
+        cache = ResultCache(self.dir)
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", CachedResult("victory", "", 12))
+        self.assertEqual(cache.get("a"), CachedResult("victory", "", 12))
+        (self.dir / "b.json").write_text("not json")
+        self.assertIsNone(cache.get("b"))
+        cache.clear()
+        self.assertIsNone(cache.get("a"))
+
+    def test_evict_by_age(self) -> None:
+        cache = ResultCache(self.dir, max_age=60)
+        cache.put("old", CachedResult("victory", "", 1))
+        cache.put("new", CachedResult("victory", "", 2))
+        old_time = time.time() - 120
+        os.utime(self.dir / "old.json", (old_time, old_time))
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNotNone(cache.get("new"))
+        cache.put("old", CachedResult("victory", "", 1))
+        os.utime(self.dir / "old.json", (old_time, old_time))
+        self.assertIsNone(cache.get("old"))
+        self.assertFalse((self.dir / "old.json").exists())
+
+    def test_evict_by_size(self) -> None:
+        cache = ResultCache(self.dir)
+        for i, key in enumerate("abcd"):
+            cache.put(key, CachedResult("game_over", "Enemy ran into you.", i))
+            entry_time = time.time() - 100 + i
+            os.utime(self.dir / f"{key}.json", (entry_time, entry_time))
+        # Using an entry makes it the most recent one
+        self.assertIsNotNone(cache.get("a"))
+        cache.max_bytes = 2 * (self.dir / "a.json").stat().st_size
+        self.assertEqual(cache.evict(), 2)
+        self.assertEqual(
+            sorted(path.stem for path in self.dir.glob("*.json")), ["a", "d"]
+        )
+        self.assertEqual(cache.evict(), 0)
+
+    def test_missing_directory(self) -> None:
+        cache = ResultCache(self.dir)
+        self.assertEqual(cache.evict(), 0)
+        self.assertIsNone(cache.get("a"))
+
+
+if __name__ == "__main__":
+    unittest.main()
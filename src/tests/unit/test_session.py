@@ -0,0 +1,35 @@
+import sys
+
+sys.path.append("./src")  # noqa
+
+import os
+import unittest
+from unittest import mock
+import pygame
+from mazegame.session import is_session_active, pygame_session, quit_pygame
+
+
+class TestSession(unittest.TestCase):
+
+    def test_quit_inside_session_keeps_pygame(self) -> None:
+        with mock.patch.dict(os.environ, {}), pygame_session():
+            self.assertTrue(is_session_active())
+            display_surface = pygame.display.set_mode((10, 10))
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+            quit_pygame()
+            self.assertTrue(pygame.display.get_init())
+            self.assertTrue(pygame.font.get_init())
+            self.assertIs(pygame.display.get_surface(), display_surface)
+            self.assertEqual(pygame.event.get(), [])
+
+    def test_nested_sessions(self) -> None:
+        with mock.patch.dict(os.environ, {}), pygame_session():
+            driver = os.environ["SDL_VIDEODRIVER"]
+            with pygame_session("x11"):
+                self.assertEqual(os.environ["SDL_VIDEODRIVER"], driver)
+            self.assertTrue(is_session_active())
+            self.assertTrue(pygame.display.get_init())
+
+
+if __name__ == "__main__":
+    unittest.main()
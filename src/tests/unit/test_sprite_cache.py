@@ -0,0 +1,131 @@
+import sys
+
+sys.path.append("./src")  # noqa
+
+import os
+from pathlib import Path
+import tempfile
+import unittest
+from unittest import mock
+import pygame
+from mazegame.color import Color
+from mazegame.images import DiskSurfaceCache, Images, ScaledSurfaceCache
+from mazegame.map import Key, Lock, images
+from mazegame.session import pygame_session
+
+
+def setUpModule() -> None:
+    unittest.enterModuleContext(pygame_session())
+
+
+class TestSpriteCache(unittest.TestCase):
+
+    def test_lru_eviction(self) -> None:
+        surface_bytes = 10 * 10 * 4
+        cache = ScaledSurfaceCache(3 * surface_bytes)
+        for name in ("a", "b", "c"):
+            cache.put((name, 10), pygame.Surface((10, 10), pygame.SRCALPHA))
+        self.assertIsNotNone(cache.get(("a", 10)))
+        cache.put(("d", 10), pygame.Surface((10, 10), pygame.SRCALPHA))
+        self.assertIsNone(cache.get(("b", 10)))
+        self.assertIsNotNone(cache.get(("a", 10)))
+        self.assertEqual(list(cache.surfaces), [("c", 10), ("d", 10), ("a", 10)])
+        self.assertEqual(cache.bytes, 3 * surface_bytes)
+
+    def test_keep_oversized_surface(self) -> None:
+        cache = ScaledSurfaceCache(1)
+        cache.put(("big", 10), pygame.Surface((10, 10)))
+        self.assertIsNotNone(cache.get(("big", 10)))
+
+    def test_drawn_sprites_are_shared(self) -> None:
+        surfs = {}
+        key = Key(Color.RED)
+        key.init((0, 0), 48, surfs)
+        other_key = Key(Color.RED)
+        other_key.init((1, 0), 48, {})
+        self.assertIs(key.surf, other_key.surf)
+        lock = Lock(Color.RED)
+        lock.init((0, 0), 48, {})
+        self.assertIsNot(lock.surf, key.surf)
+        self.assertIs(images.scaled_surfaces.get(("Lock_Red", 48)), lock.surf)
+
+
+class TestDiskSpriteCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.environ = mock.patch.dict(
+            os.environ, {"MAZEGAME_CACHE_DIR": self.temp_dir.name}
+        )
+        self.environ.start()
+        pygame.display.set_mode((1, 1))
+
+    def tearDown(self) -> None:
+        self.environ.stop()
+        self.temp_dir.cleanup()
+
+    def test_fresh_process_skips_decoding(self) -> None:
+        surface = Images().get_scaled_surface("Exit", 40)
+        self.assertEqual(len(list(Path(self.temp_dir.name).iterdir())), 1)
+        fresh_images = Images()
+        cached = fresh_images.get_scaled_surface("Exit", 40)
+        self.assertIsNone(fresh_images.atlas)
+        self.assertEqual(
+            pygame.image.tobytes(cached, "RGBA"), pygame.image.tobytes(surface, "RGBA")
+        )
+
+    def test_fresh_process_skips_drawing(self) -> None:
+        key = Key(Color.BLUE)
+        draw = mock.Mock(wraps=key.draw, __code__=Key.draw.__code__)
+        surface = Images().get_scaled_surface("Key_Blue", 40, draw)
+        cached = Images().get_scaled_surface("Key_Blue", 40, draw)
+        draw.assert_called_once_with(40)
+        self.assertEqual(
+            pygame.image.tobytes(cached, "RGBA"), pygame.image.tobytes(surface, "RGBA")
+        )
+
+    def test_keyed_by_content(self) -> None:
+        fresh_images = Images()
+        self.assertNotEqual(
+            fresh_images.get_content_hash(Key(Color.RED).draw),
+            fresh_images.get_content_hash(Lock(Color.RED).draw),
+        )
+        self.assertEqual(
+            fresh_images.get_content_hash(Key(Color.RED).draw),
+            fresh_images.get_content_hash(Key(Color.BLUE).draw),
+        )
+        fresh_images.get_scaled_surface("Exit", 40)
+        fresh_images.get_scaled_surface("Exit", 48)
+        self.assertEqual(len(list(Path(self.temp_dir.name).iterdir())), 2)
+
+    def test_prune_old_content(self) -> None:
+        cache = DiskSurfaceCache(Path(self.temp_dir.name))
+        surface = pygame.Surface((10, 10), pygame.SRCALPHA)
+        cache.save("Exit", 10, "old", surface)
+        cache.save("Exit", 20, "old", pygame.Surface((20, 20), pygame.SRCALPHA))
+        cache.save("Exit", 10, "new", surface)
+        self.assertIsNone(cache.load("Exit", 10, "old"))
+        self.assertIsNotNone(cache.load("Exit", 10, "new"))
+        self.assertIsNotNone(cache.load("Exit", 20, "old"))
+
+    def test_size_cap(self) -> None:
+        surface_bytes = 10 * 10 * 4
+        cache = DiskSurfaceCache(Path(self.temp_dir.name), 3 * surface_bytes)
+        surface = pygame.Surface((10, 10), pygame.SRCALPHA)
+        for mtime, name in enumerate(("a", "b", "c")):
+            cache.save(name, 10, "hash", surface)
+            path = cache._get_path(name, 10, "hash")
+            os.utime(path, (mtime, mtime))
+        self.assertIsNotNone(cache.load("a", 10, "hash"))
+        cache.save("d", 10, "hash", surface)
+        self.assertIsNone(cache.load("b", 10, "hash"))
+        for name in ("a", "c", "d"):
+            self.assertIsNotNone(cache.load(name, 10, "hash"), name)
+
+    def test_disabled(self) -> None:
+        with mock.patch.dict(os.environ, {"MAZEGAME_CACHE_DIR": ""}):
+            self.assertIsNone(Images().disk_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()